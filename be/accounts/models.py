@@ -2,7 +2,7 @@ from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.core.exceptions import ValidationError
 from django.conf import settings
-import os
+from media_files.storage import upload_path
 
 
 def validate_image_size(file):
@@ -14,9 +14,8 @@ def validate_image_size(file):
 
 
 def user_profile_image_path(instance, filename):
-    """프로필 이미지 저장 경로"""
-    ext = os.path.splitext(filename)[1]
-    return f'profiles/{instance.username}{ext}'
+    """프로필 이미지 저장 경로 (profiles/ab/cd/<uuid>.<확장자>)"""
+    return upload_path('profiles', filename)
 
 
 class User(AbstractUser):
@@ -30,6 +29,7 @@ class User(AbstractUser):
         null=True,
         validators=[validate_image_size]
     )
+    profile_image_variants = models.JSONField('프로필 이미지 변형', default=dict, blank=True, editable=False)
     bio = models.TextField('자기소개', max_length=500, blank=True)
 
     # 통계 필드
@@ -2,16 +2,19 @@ from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from media_files.images import ImageVariantsField
 from .models import User
 
 
 class UserSerializer(serializers.ModelSerializer):
     """사용자 기본 Serializer"""
 
+    profile_image_variants = ImageVariantsField()
+
     class Meta:
         model = User
         fields = [
-            'id', 'username', 'email', 'profile_image',
+            'id', 'username', 'email', 'profile_image', 'profile_image_variants',
             'bio', 'courses_count', 'created_at'
         ]
         read_only_fields = ['id', 'courses_count', 'created_at']
@@ -71,10 +74,12 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
 class UserProfileSerializer(serializers.ModelSerializer):
     """프로필 조회 및 수정 Serializer"""
 
+    profile_image_variants = ImageVariantsField()
+
     class Meta:
         model = User
         fields = [
-            'id', 'username', 'email', 'profile_image',
+            'id', 'username', 'email', 'profile_image', 'profile_image_variants',
             'bio', 'courses_count', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'username', 'courses_count', 'created_at', 'updated_at']
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from media_files.images import queue_image_variants
+from media_files.storage import delete_on_commit
+from .models import User
+
+
+@receiver(post_save, sender=User)
+def queue_profile_image_variants(sender, instance, update_fields=None, **kwargs):
+    """프로필 이미지 변경 시 아바타용 변형 이미지 생성 작업 등록"""
+    if update_fields is not None and 'profile_image' not in update_fields:
+        return
+    queue_image_variants(instance, 'profile_image', 'profile_image')
+
+
+@receiver(post_delete, sender=User)
+def delete_profile_image_file(sender, instance, **kwargs):
+    """사용자 삭제 시 커밋 후 프로필 이미지 파일 삭제 (변형 이미지는 gc_media가 정리)"""
+    delete_on_commit(instance.profile_image.name)
@@ -4,6 +4,7 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from drf_spectacular.utils import extend_schema, OpenApiResponse
+from media_files.upload_handlers import ValidatedUploadMixin
 from .models import User
 from .serializers import (
     UserSerializer,
@@ -79,10 +80,12 @@ class CustomTokenRefreshView(TokenRefreshView):
         401: OpenApiResponse(description='인증 실패')
     }
 )
-class ProfileView(generics.RetrieveUpdateAPIView):
+class ProfileView(ValidatedUploadMixin, generics.RetrieveUpdateAPIView):
     """프로필 조회 및 수정 API"""
     serializer_class = UserProfileSerializer
     permission_classes = [IsAuthenticated]
+    upload_file_types = ['image']
+    upload_field_name = 'profile_image'
 
     def get_object(self):
         return self.request.user
@@ -90,6 +93,10 @@ class ProfileView(generics.RetrieveUpdateAPIView):
     def update(self, request, *args, **kwargs):
         """프로필 수정 (PUT/PATCH)"""
         partial = kwargs.pop('partial', False)
+
+        # 프로필 이미지 업로드 중 검증에서 중단된 경우 오류 반환
+        self.check_upload(request)
+
         instance = self.get_object()
         serializer = self.get_serializer(instance, data=request.data, partial=partial)
         serializer.is_valid(raise_exception=True)
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from comments.stats import recompute_comment_stats
+
+
+class Command(BaseCommand):
+    """레슨/강의 댓글 통계 일괄 재계산"""
+
+    help = '댓글 테이블을 기준으로 레슨의 댓글 수/미답변 질문 수와 강의의 댓글 수를 다시 계산합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--course',
+            type=int,
+            action='append',
+            dest='course_ids',
+            help='재계산할 강의 ID (여러 번 지정 가능, 생략 시 전체)',
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            lecture_rows, course_rows = recompute_comment_stats(options['course_ids'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'레슨 {lecture_rows}개, 강의 {course_rows}개의 댓글 통계를 재계산했습니다.'
+        ))
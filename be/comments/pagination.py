@@ -0,0 +1,32 @@
+from courses.pagination import KeysetPagination, OptionalKeysetPagination
+
+
+class CommentKeysetPagination(KeysetPagination):
+    """댓글 커서 페이지네이션
+
+    (created_at, id) 키셋으로 Index(lecture, created_at)를 따라 조회하므로
+    댓글이 많아도 페이지 비용이 일정하고, 새 댓글이 추가되어도 중복/누락이 없습니다.
+    """
+
+    ordering = ['created_at']
+
+
+class CommentPagination(OptionalKeysetPagination):
+    """댓글 목록 페이지네이션
+
+    기본은 기존과 같은 페이지 번호 방식(count 포함)이며,
+    cursor 파라미터가 있으면(빈 값 포함) CommentKeysetPagination으로 동작합니다.
+    """
+
+    keyset_class = CommentKeysetPagination
+
+
+class ReplyPagination(KeysetPagination):
+    """대댓글 커서 페이지네이션 ((created_at, id) 오름차순)"""
+
+    ordering = ['created_at']
+
+    @classmethod
+    def cursor_after(cls, reply):
+        """reply 다음 대댓글부터 조회하는 커서 토큰"""
+        return cls.encode_position([reply.created_at.isoformat(), reply.id])
@@ -1,7 +1,38 @@
 from rest_framework import serializers
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Prefetch, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.urls import reverse
 from .models import Comment
+from .pagination import ReplyPagination
+from .stats import comment_created, lock_comment
 from accounts.serializers import UserSerializer
 
+# 댓글마다 함께 내려주는 대댓글 수 (나머지는 replies_next 링크로 조회)
+INLINE_REPLIES_LIMIT = 5
+
+
+def reply_count_annotation():
+    """대댓글 수 서브쿼리 (GROUP BY 없이 댓글 행마다 계산)"""
+    replies = (
+        Comment.objects
+        .filter(parent=OuterRef('pk'))
+        .order_by()
+        .values('parent')
+        .annotate(count=Count('id'))
+        .values('count')
+    )
+    return Coalesce(Subquery(replies, output_field=IntegerField()), Value(0))
+
+
+def inline_replies_prefetch(limit=INLINE_REPLIES_LIMIT):
+    """댓글별 대댓글 Prefetch (작성자 포함, 다음 페이지 확인을 위해 limit + 1개)"""
+    return Prefetch(
+        'replies',
+        queryset=Comment.objects.select_related('author').order_by('created_at', 'id')[:limit + 1],
+        to_attr='inline_replies'
+    )
+
 
 class CommentSerializer(serializers.ModelSerializer):
     """댓글 Serializer (대댓글 포함)"""
@@ -9,28 +40,55 @@ class CommentSerializer(serializers.ModelSerializer):
     author = UserSerializer(read_only=True)
     replies = serializers.SerializerMethodField()
     reply_count = serializers.SerializerMethodField()
+    replies_next = serializers.SerializerMethodField()
 
     class Meta:
         model = Comment
         fields = [
             'id', 'lecture', 'author', 'parent',
-            'content', 'replies', 'reply_count',
+            'content', 'replies', 'reply_count', 'replies_next',
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'author', 'created_at', 'updated_at']
 
+    def get_inline_replies(self, obj):
+        """inline_replies_prefetch 결과 (prefetch되지 않았으면 직접 조회)"""
+        if not hasattr(obj, 'inline_replies'):
+            obj.inline_replies = list(
+                obj.replies.select_related('author')
+                .order_by('created_at', 'id')[:INLINE_REPLIES_LIMIT + 1]
+            )
+        return obj.inline_replies
+
     def get_replies(self, obj):
-        """대댓글 목록"""
-        if obj.parent is None:  # 최상위 댓글만 대댓글 포함
-            replies = obj.replies.all().order_by('created_at')
+        """대댓글 목록 (최대 INLINE_REPLIES_LIMIT개)"""
+        if obj.parent_id is None:  # 최상위 댓글만 대댓글 포함
+            replies = self.get_inline_replies(obj)[:INLINE_REPLIES_LIMIT]
             return CommentListSerializer(replies, many=True).data
         return []
 
     def get_reply_count(self, obj):
-        """대댓글 수"""
-        if obj.parent is None:
-            return obj.replies.count()
-        return 0
+        """대댓글 수 (reply_count_annotation 결과 사용)"""
+        if obj.parent_id is not None:
+            return 0
+        if not hasattr(obj, 'reply_count'):
+            obj.reply_count = obj.replies.count()
+        return obj.reply_count
+
+    def get_replies_next(self, obj):
+        """나머지 대댓글 조회 URL"""
+        if obj.parent_id is not None:
+            return None
+
+        replies = self.get_inline_replies(obj)
+        if len(replies) <= INLINE_REPLIES_LIMIT:
+            return None
+
+        url = reverse('comments:comment-replies', kwargs={'pk': obj.pk})
+        cursor = ReplyPagination.cursor_after(replies[INLINE_REPLIES_LIMIT - 1])
+        url = f'{url}?{ReplyPagination.cursor_query_param}={cursor}'
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
 
 
 class CommentListSerializer(serializers.ModelSerializer):
@@ -82,7 +140,18 @@ class CommentCreateSerializer(serializers.ModelSerializer):
         """댓글 생성"""
         request = self.context.get('request')
         validated_data['author'] = request.user
-        return super().create(validated_data)
+
+        with transaction.atomic():
+            # 답변은 삽입 전에 부모 행을 잠가 같은 질문의 삭제/다른 답변과 같은 순서로 직렬화
+            parent = validated_data.get('parent')
+            if parent is not None and not lock_comment(parent.pk):
+                raise serializers.ValidationError({'parent': '삭제된 댓글에는 답글을 달 수 없습니다.'})
+            comment = super().create(validated_data)
+
+            # 레슨/강의 댓글 통계 증분 반영
+            comment_created(comment)
+
+        return comment
 
 
 class CommentUpdateSerializer(serializers.ModelSerializer):
@@ -0,0 +1,130 @@
+from django.db import transaction
+from django.db.models import Count, Exists, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from courses.cache import invalidate_courses
+from courses.models import Course
+from lectures.models import Lecture
+from .models import Comment
+
+
+def apply_comment_delta(lecture_id, count_delta=0, unanswered_delta=0):
+    """레슨/강의의 댓글 통계에 증감분을 원자적으로 반영
+
+    레슨의 comments_count, unanswered_count와 강의의 comments_count를
+    F-expression UPDATE로 갱신합니다. 호출하는 쪽의 트랜잭션 안에서 실행되어야 합니다.
+    """
+    course_id = Lecture.objects.values_list('course_id', flat=True).get(pk=lecture_id)
+
+    Lecture.objects.filter(pk=lecture_id).update(
+        comments_count=F('comments_count') + count_delta,
+        unanswered_count=F('unanswered_count') + unanswered_delta,
+    )
+    if count_delta:
+        Course.objects.filter(pk=course_id).update(
+            comments_count=F('comments_count') + count_delta
+        )
+
+    invalidate_courses([course_id])
+
+
+def lock_comment(comment_id):
+    """댓글 행 잠금 (행이 남아 있으면 True)"""
+    return bool(list(Comment.objects.select_for_update().filter(pk=comment_id).values_list('pk', flat=True)))
+
+
+def _has_other_replies(parent_id, exclude_id=None):
+    """부모 댓글 행을 잠근 뒤 다른 대댓글이 있는지 확인
+
+    같은 질문에 동시에 달리는 답변이 부모 행 잠금으로 직렬화되므로
+    '첫 답변/마지막 답변' 판정이 한 번만 일어납니다.
+    """
+    lock_comment(parent_id)
+    replies = Comment.objects.filter(parent_id=parent_id)
+    if exclude_id is not None:
+        replies = replies.exclude(pk=exclude_id)
+    return replies.exists()
+
+
+def comment_created(comment):
+    """댓글 생성 후 통계 반영 (최상위 댓글은 미답변 질문으로 집계)"""
+    if comment.parent_id is None:
+        apply_comment_delta(comment.lecture_id, count_delta=1, unanswered_delta=1)
+        return
+
+    # 첫 답변이면 질문이 답변됨으로 바뀜
+    first_reply = not _has_other_replies(comment.parent_id, exclude_id=comment.pk)
+    apply_comment_delta(
+        comment.lecture_id,
+        count_delta=1,
+        unanswered_delta=-1 if first_reply else 0
+    )
+
+
+def delete_comment(comment):
+    """댓글 삭제 및 통계 반영 (최상위 댓글 삭제 시 함께 삭제되는 대댓글 포함)"""
+    with transaction.atomic():
+        lecture_id = comment.lecture_id
+
+        if comment.parent_id is None:
+            # 답변 작성(comment_created)과 같은 부모 행 잠금을 잡은 뒤 세어, 동시에 달린 답변도 개수에 포함
+            if not lock_comment(comment.pk):
+                return
+            reply_count = Comment.objects.filter(parent_id=comment.pk).count()
+            comment.delete()
+            apply_comment_delta(
+                lecture_id,
+                count_delta=-(1 + reply_count),
+                unanswered_delta=-1 if reply_count == 0 else 0
+            )
+            return
+
+        parent_id = comment.parent_id
+        comment.delete()
+        # 마지막 답변이 삭제되면 질문이 다시 미답변이 됨
+        last_reply = not _has_other_replies(parent_id)
+        apply_comment_delta(
+            lecture_id,
+            count_delta=-1,
+            unanswered_delta=1 if last_reply else 0
+        )
+
+
+def _count_subquery(queryset, group_field):
+    """그룹별 COUNT 서브쿼리"""
+    return Coalesce(
+        Subquery(
+            queryset.order_by().values(group_field).annotate(count=Count('id')).values('count'),
+            output_field=IntegerField()
+        ),
+        Value(0)
+    )
+
+
+def recompute_comment_stats(course_ids=None):
+    """댓글 테이블로부터 레슨/강의 댓글 통계를 일괄 재계산 (테이블당 단일 UPDATE 문)
+
+    (갱신된 레슨 수, 갱신된 강의 수)를 반환합니다.
+    """
+    lectures = Lecture.objects.all()
+    courses = Course.objects.all()
+    if course_ids:
+        lectures = lectures.filter(course_id__in=course_ids)
+        courses = courses.filter(pk__in=course_ids)
+
+    has_replies = Comment.objects.filter(parent=OuterRef('pk'))
+    lecture_rows = lectures.update(
+        comments_count=_count_subquery(
+            Comment.objects.filter(lecture=OuterRef('pk')), 'lecture'
+        ),
+        unanswered_count=_count_subquery(
+            Comment.objects.filter(lecture=OuterRef('pk'), parent=None)
+            .exclude(Exists(has_replies)),
+            'lecture'
+        ),
+    )
+    course_rows = courses.update(
+        comments_count=_count_subquery(
+            Comment.objects.filter(lecture__course=OuterRef('pk')), 'lecture__course'
+        ),
+    )
+    return lecture_rows, course_rows
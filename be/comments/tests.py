@@ -1,3 +1,171 @@
+from urllib.parse import urlsplit
 from django.test import TestCase
+from rest_framework.test import APIClient
+from accounts.models import User
+from courses.models import Course
+from lectures.models import Lecture
+from .models import Comment
+from .stats import delete_comment, recompute_comment_stats
 
-# Create your tests here.
+
+def create_lecture():
+    instructor = User.objects.create_user(username='instructor', email='i@example.com', password='pw12345!x')
+    course = Course.objects.create(instructor=instructor, title='댓글 강의', description='댓글 테스트용 강의', is_published=True)
+    return Lecture.objects.create(course=course, title='레슨 1', content_type='text', content_text='본문', order=1)
+
+
+class CommentListConditionalGetTest(TestCase):
+    """레슨별 댓글 목록 조건부 GET (ETag만 사용)"""
+
+    def setUp(self):
+        self.lecture = create_lecture()
+        self.author = User.objects.create_user(username='student', email='s@example.com', password='pw12345!x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.author)
+        for content in ['첫 질문', '둘째 질문']:
+            self.client.post('/api/comments/', {'lecture': self.lecture.pk, 'content': content})
+        self.latest = Comment.objects.get(content='둘째 질문')
+
+    def get_list(self, **headers):
+        return self.client.get('/api/comments/', {'lecture': self.lecture.pk}, **headers)
+
+    def test_matching_etag_returns_304(self):
+        response = self.get_list()
+        self.assertNotIn('Last-Modified', response)
+        self.assertEqual(self.get_list(HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+    def test_comment_delete_changes_etag(self):
+        """가장 최근 댓글을 지우면 max(updated_at)이 되돌아가도 ETag는 달라짐"""
+        etag = self.get_list()['ETag']
+        self.assertEqual(self.client.delete(f'/api/comments/{self.latest.pk}/').status_code, 204)
+
+        response = self.get_list(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_reply_changes_etag(self):
+        """대댓글이 달리면 목록의 reply_count가 바뀜"""
+        etag = self.get_list()['ETag']
+        self.client.post('/api/comments/', {'lecture': self.lecture.pk, 'parent': self.latest.pk, 'content': '답변'})
+        self.assertEqual(self.get_list(HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_if_modified_since_alone_is_ignored(self):
+        self.get_list()
+        self.client.delete(f'/api/comments/{self.latest.pk}/')
+        response = self.get_list(HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT')
+        self.assertEqual(response.status_code, 200)
+
+
+class CommentPaginationTest(TestCase):
+    """댓글 목록 페이지네이션 (기본 페이지 번호, cursor 지정 시 키셋)"""
+
+    def setUp(self):
+        self.lecture = create_lecture()
+        self.author = User.objects.create_user(username='student', email='s@example.com', password='pw12345!x')
+        self.comments = [self.add_comment(f'질문 {i}') for i in range(5)]
+        self.client = APIClient()
+
+    def add_comment(self, content, parent=None):
+        return Comment.objects.create(lecture=self.lecture, author=self.author, parent=parent, content=content)
+
+    def follow(self, url):
+        parts = urlsplit(url)
+        return self.client.get(f'{parts.path}?{parts.query}').data
+
+    def test_default_keeps_page_number_shape(self):
+        data = self.client.get('/api/comments/', {'lecture': self.lecture.pk}).data
+        self.assertEqual(data['count'], 5)
+        self.assertIsNone(data['next'])
+        self.assertEqual([comment['id'] for comment in data['results']], [comment.pk for comment in self.comments])
+
+    def test_cursor_is_stable_under_inserts(self):
+        """스크롤 도중 추가된 댓글 때문에 중복되거나 빠지는 댓글이 없음"""
+        for ordering, expect_new in [('created_at', True), ('-created_at', False)]:
+            with self.subTest(ordering=ordering):
+                data = self.client.get('/api/comments/', {
+                    'lecture': self.lecture.pk, 'cursor': '', 'page_size': 2, 'ordering': ordering
+                }).data
+                self.assertNotIn('count', data)
+                seen = [comment['id'] for comment in data['results']]
+
+                new = self.add_comment(f'새 질문 ({ordering})')
+                while data['next']:
+                    data = self.follow(data['next'])
+                    seen.extend(comment['id'] for comment in data['results'])
+
+                self.assertEqual(len(seen), len(set(seen)))
+                old = [comment.pk for comment in self.comments]
+                self.assertEqual([pk for pk in seen if pk in old], old if ordering == 'created_at' else old[::-1])
+                self.assertEqual(new.pk in seen, expect_new)
+                self.comments.append(new)
+
+    def test_reply_cursor_is_stable_under_inserts(self):
+        parent = self.comments[0]
+        replies = [self.add_comment(f'답변 {i}', parent) for i in range(3)]
+        data = self.client.get(f'/api/comments/{parent.pk}/replies/', {'page_size': 2}).data
+        seen = [reply['id'] for reply in data['results']]
+
+        new = self.add_comment('새 답변', parent)
+        while data['next']:
+            data = self.follow(data['next'])
+            seen.extend(reply['id'] for reply in data['results'])
+        self.assertEqual(seen, [reply.pk for reply in replies] + [new.pk])
+
+
+class CommentStatsTest(TestCase):
+    """댓글 작성/삭제 시 레슨/강의 댓글 통계"""
+
+    def setUp(self):
+        self.lecture = create_lecture()
+        self.author = User.objects.create_user(username='student', email='s@example.com', password='pw12345!x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.author)
+
+    def post(self, content, parent=None):
+        data = {'lecture': self.lecture.pk, 'content': content}
+        if parent is not None:
+            data['parent'] = parent.pk
+        self.assertEqual(self.client.post('/api/comments/', data).status_code, 201)
+        return Comment.objects.latest('id')
+
+    def stats(self):
+        self.lecture.refresh_from_db()
+        self.lecture.course.refresh_from_db()
+        return self.lecture.comments_count, self.lecture.unanswered_count, self.lecture.course.comments_count
+
+    def assert_stats(self, expected):
+        self.assertEqual(self.stats(), expected)
+        # 댓글 테이블로 다시 계산한 값과도 같음
+        recompute_comment_stats()
+        self.assertEqual(self.stats(), expected)
+
+    def test_question_delete_includes_replies(self):
+        question = self.post('질문')
+        other = self.post('다른 질문')
+        for content in ['답변 1', '답변 2']:
+            self.post(content, question)
+        self.assert_stats((4, 1, 4))
+
+        # 답변이 달리기 전에 읽은 인스턴스로 삭제해도 삭제 시점의 답변 수를 반영
+        self.assertEqual(self.client.delete(f'/api/comments/{question.pk}/').status_code, 204)
+        self.assert_stats((1, 1, 1))
+
+        self.client.delete(f'/api/comments/{other.pk}/')
+        self.assert_stats((0, 0, 0))
+
+    def test_last_reply_delete_reopens_question(self):
+        question = self.post('질문')
+        replies = [self.post(f'답변 {i}', question) for i in range(2)]
+        self.assert_stats((3, 0, 3))
+
+        delete_comment(replies[0])
+        self.assert_stats((2, 0, 2))
+        delete_comment(replies[1])
+        self.assert_stats((1, 1, 1))
+
+    def test_already_deleted_question_is_ignored(self):
+        question = self.post('질문')
+        stale = Comment.objects.get(pk=question.pk)
+        delete_comment(question)
+        delete_comment(stale)
+        self.assert_stats((0, 0, 0))
@@ -1,14 +1,23 @@
 from rest_framework import viewsets, status
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import OrderingFilter
+from django.db.models import Count, Max
 from drf_spectacular.utils import extend_schema, OpenApiParameter
+from courses.cache import normalized_params
+from courses.conditional import conditional_response, make_etag
 from .models import Comment
+from .pagination import CommentPagination, ReplyPagination
+from .stats import delete_comment
 from .serializers import (
     CommentSerializer,
+    CommentListSerializer,
     CommentCreateSerializer,
-    CommentUpdateSerializer
+    CommentUpdateSerializer,
+    inline_replies_prefetch,
+    reply_count_annotation
 )
 
 
@@ -28,8 +37,9 @@ class IsAuthorOrReadOnly(IsAuthenticatedOrReadOnly):
 class CommentViewSet(viewsets.ModelViewSet):
     """댓글 CRUD API"""
 
-    queryset = Comment.objects.select_related('author', 'lecture', 'parent').prefetch_related('replies')
+    queryset = Comment.objects.select_related('author')
     permission_classes = [IsAuthorOrReadOnly]
+    pagination_class = CommentPagination
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_fields = ['lecture', 'author']
     ordering_fields = ['created_at']
@@ -48,19 +58,63 @@ class CommentViewSet(viewsets.ModelViewSet):
         queryset = super().get_queryset()
 
         # parent가 None인 댓글만 (최상위 댓글)
-        return queryset.filter(parent=None)
+        queryset = queryset.filter(parent=None)
+
+        if self.action in ['list', 'retrieve']:
+            # 대댓글 수는 SQL에서 계산하고, 대댓글은 작성자와 함께 댓글당 일부만 한 번에 조회
+            queryset = queryset.annotate(
+                reply_count=reply_count_annotation()
+            ).prefetch_related(inline_replies_prefetch())
+
+        return queryset
 
     @extend_schema(
         summary='댓글 목록 조회',
-        description='레슨별 댓글 목록을 조회합니다. 대댓글도 포함됩니다.',
+        description='레슨별 댓글 목록을 조회합니다. 대댓글은 댓글당 최대 5개까지 포함되며 나머지는 replies_next 링크로 조회합니다.',
         parameters=[
             OpenApiParameter(name='lecture', description='레슨 ID', type=int, required=True),
             OpenApiParameter(name='author', description='작성자 ID', type=int),
             OpenApiParameter(name='ordering', description='정렬 (created_at, -created_at)', type=str),
+            OpenApiParameter(name='page', description='페이지 번호', type=int),
+            OpenApiParameter(name='cursor', description='커서 페이지네이션 (첫 페이지는 빈 값, 이후 next/previous 링크 사용, count 미포함)', type=str),
         ]
     )
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        etag = self.get_list_etag()
+        if etag is None:
+            return super().list(request, *args, **kwargs)
+
+        return conditional_response(
+            request,
+            etag,
+            None,
+            lambda: super(CommentViewSet, self).list(request, *args, **kwargs)
+        )
+
+    def get_list_etag(self):
+        """레슨별 댓글 목록의 ETag
+
+        레슨의 전체 댓글(대댓글 포함)에 대한 max(updated_at), 개수, 작성자 max(updated_at)를
+        집계 쿼리 한 번으로 계산하여 컬렉션 버전으로 사용합니다. 개수는 삭제를 반영합니다.
+        삭제 후에는 max(updated_at)가 이전 값으로 되돌아갈 수 있으므로 Last-Modified는 보내지 않습니다.
+        """
+        lecture_id = self.request.query_params.get('lecture')
+        if not lecture_id:
+            return None
+
+        try:
+            row = Comment.objects.filter(lecture=lecture_id).aggregate(
+                updated_at=Max('updated_at'),
+                count=Count('id'),
+                author_updated_at=Max('author__updated_at')
+            )
+        except (TypeError, ValueError):
+            return None
+
+        return make_etag(
+            'comments', lecture_id, normalized_params(self.request),
+            row['updated_at'], row['count'], row['author_updated_at']
+        )
 
     @extend_schema(
         summary='댓글 상세 조회',
@@ -97,3 +151,25 @@ class CommentViewSet(viewsets.ModelViewSet):
     def destroy(self, request, *args, **kwargs):
         return super().destroy(request, *args, **kwargs)
 
+    def perform_destroy(self, instance):
+        """댓글 삭제 (대댓글 포함) 및 레슨/강의 댓글 통계 반영"""
+        delete_comment(instance)
+
+    @extend_schema(
+        summary='대댓글 목록 조회',
+        description='댓글의 대댓글을 작성 순으로 조회합니다. 커서 페이지네이션(next/previous 링크)을 사용합니다.',
+        parameters=[
+            OpenApiParameter(name='cursor', description='커서 (next/previous 링크의 값)', type=str),
+        ],
+        responses={200: CommentListSerializer(many=True)}
+    )
+    @action(detail=True, methods=['get'])
+    def replies(self, request, pk=None):
+        """대댓글 목록 (커서 페이지네이션)"""
+        parent = self.get_object()
+        queryset = Comment.objects.filter(parent=parent).select_related('author')
+
+        paginator = ReplyPagination()
+        page = paginator.paginate_queryset(queryset, request)
+        serializer = CommentListSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
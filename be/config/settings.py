@@ -143,6 +143,41 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# 업로드 파일은 키 앞부분으로 여러 단계 디렉터리에 분산 저장 (단계당 최대 256개)
+STORAGES = {
+    'default': {'BACKEND': 'media_files.storage.ShardedStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+MEDIA_SHARD_LEVELS = int(os.getenv('MEDIA_SHARD_LEVELS', 2))
+
+# Cache
+# 강의 목록/상세 응답 캐시 백엔드: locmem | file | redis
+# 무효화 버전 키도 이 캐시에 저장되므로, 여러 gunicorn 워커와 후처리 워커(process_media_jobs)가
+# 같은 캐시를 보도록 운영 환경(DEBUG=False)의 기본값은 redis입니다.
+# locmem은 프로세스마다 따로 저장되어 다른 프로세스의 변경이 CATALOG_CACHE_TIMEOUT 동안 반영되지 않으므로 개발용입니다.
+# 캐시 서버에 연결할 수 없으면 요청은 캐시 없이 처리됩니다. (courses.cache.cached_response)
+CATALOG_CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'catalog'),
+    'file': ('django.core.cache.backends.filebased.FileBasedCache', str(BASE_DIR / 'cache' / 'catalog')),
+    'redis': ('django.core.cache.backends.redis.RedisCache', 'redis://127.0.0.1:6379/1'),
+}
+CATALOG_CACHE_BACKEND, CATALOG_CACHE_DEFAULT_LOCATION = CATALOG_CACHE_BACKENDS[
+    os.getenv('CATALOG_CACHE_BACKEND', 'locmem' if DEBUG else 'redis')
+]
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'catalog': {
+        'BACKEND': CATALOG_CACHE_BACKEND,
+        'LOCATION': os.getenv('CATALOG_CACHE_LOCATION', CATALOG_CACHE_DEFAULT_LOCATION),
+    },
+}
+CATALOG_CACHE_ALIAS = 'catalog'
+CATALOG_CACHE_TIMEOUT = int(os.getenv('CATALOG_CACHE_TIMEOUT', 300))  # 초
+
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
@@ -209,6 +244,8 @@ SPECTACULAR_SETTINGS = {
 # CORS Settings
 CORS_ALLOWED_ORIGINS = os.getenv('CORS_ALLOWED_ORIGINS', 'http://localhost:3000').split(',')
 CORS_ALLOW_CREDENTIALS = True
+# 브라우저 스크립트에서 읽는 응답 헤더 (구간 스트리밍/시각 탐색, 분할 업로드)
+CORS_EXPOSE_HEADERS = ['Content-Range', 'Accept-Ranges', 'X-Seek-Time', 'Upload-Offset', 'Upload-Length']
 
 # File Upload Settings
 MAX_IMAGE_SIZE = int(os.getenv('MAX_IMAGE_SIZE', 5)) * 1024 * 1024  # MB to bytes
@@ -219,3 +256,38 @@ MAX_DOCUMENT_SIZE = int(os.getenv('MAX_DOCUMENT_SIZE', 20)) * 1024 * 1024
 ALLOWED_IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.gif', '.webp']
 ALLOWED_VIDEO_EXTENSIONS = ['.mp4', '.webm', '.avi', '.mov']
 ALLOWED_DOCUMENT_EXTENSIONS = ['.pdf', '.doc', '.docx', '.ppt', '.pptx', '.txt']
+
+# Resumable Upload Settings (MEDIA_ROOT 기준 스테이징 디렉터리)
+UPLOAD_STAGING_DIR = os.getenv('UPLOAD_STAGING_DIR', 'uploads')
+
+# Streaming Settings
+STREAM_BLOCK_SIZE = int(os.getenv('STREAM_BLOCK_SIZE', 64)) * 1024  # KB to bytes
+STREAM_MAX_RANGES = int(os.getenv('STREAM_MAX_RANGES', 16))  # 초과 시 Range 무시 (전체 전송)
+
+# 전송 방식: python (직접 전송) / sendfile (WSGI file_wrapper 무복사 전송)
+#           x-accel-redirect (nginx) / x-sendfile (Apache, lighttpd)
+STREAM_DELIVERY_BACKEND = os.getenv('STREAM_DELIVERY_BACKEND', 'python')
+STREAM_ACCEL_REDIRECT_PREFIX = os.getenv('STREAM_ACCEL_REDIRECT_PREFIX', '/protected-media/')
+
+# 스트리밍 대역폭/동시 스트림 제한 (워커 프로세스마다 적용, 0이면 제한 없음)
+# 하나라도 설정하면 sendfile 대신 Python 전송으로 청크마다 속도를 조절합니다.
+STREAM_CONNECTION_RATE = int(os.getenv('STREAM_CONNECTION_RATE', 0)) * 1024  # KB/s to bytes/s
+STREAM_USER_RATE = int(os.getenv('STREAM_USER_RATE', 0)) * 1024
+STREAM_GLOBAL_RATE = int(os.getenv('STREAM_GLOBAL_RATE', 0)) * 1024
+STREAM_MAX_USER_STREAMS = int(os.getenv('STREAM_MAX_USER_STREAMS', 0))
+STREAM_MAX_STREAMS = int(os.getenv('STREAM_MAX_STREAMS', 0))
+
+# 서명된 스트리밍 URL (만료 시각/사용자 ID를 HMAC으로 서명, 비밀 키를 비우면 SECRET_KEY에서 파생)
+STREAM_REQUIRE_SIGNED_URLS = os.getenv('STREAM_REQUIRE_SIGNED_URLS', 'True') == 'True'
+STREAM_URL_SECRET = os.getenv('STREAM_URL_SECRET', '')
+STREAM_URL_TTL = int(os.getenv('STREAM_URL_TTL', 4 * 3600))  # 초
+
+# 스트리밍 메타데이터 캐시 (프로세스 내 LRU, 0이면 비활성화)
+STREAM_METADATA_CACHE_SIZE = int(os.getenv('STREAM_METADATA_CACHE_SIZE', 1024))
+STREAM_METADATA_CACHE_TTL = int(os.getenv('STREAM_METADATA_CACHE_TTL', 300))  # 초
+
+# Media Processing Queue (python manage.py process_media_jobs)
+MEDIA_JOB_MAX_ATTEMPTS = int(os.getenv('MEDIA_JOB_MAX_ATTEMPTS', 3))
+MEDIA_JOB_RETRY_DELAY = int(os.getenv('MEDIA_JOB_RETRY_DELAY', 30))  # 초 (재시도마다 두 배)
+MEDIA_JOB_VISIBILITY_TIMEOUT = int(os.getenv('MEDIA_JOB_VISIBILITY_TIMEOUT', 300))  # 초
+MEDIA_JOB_POLL_INTERVAL = float(os.getenv('MEDIA_JOB_POLL_INTERVAL', 2))  # 초
@@ -10,7 +10,7 @@ class CourseAdmin(admin.ModelAdmin):
     list_display = [
         'title', 'instructor', 'thumbnail_preview',
         'lectures_count', 'total_duration_display',
-        'is_published', 'created_at'
+        'comments_count', 'is_published', 'created_at'
     ]
     list_filter = ['is_published', 'created_at', 'instructor']
     search_fields = ['title', 'description', 'instructor__username']
@@ -19,11 +19,11 @@ class CourseAdmin(admin.ModelAdmin):
     fieldsets = (
         ('기본 정보', {'fields': ('instructor', 'title', 'description', 'thumbnail')}),
         ('상태', {'fields': ('is_published',)}),
-        ('통계', {'fields': ('lectures_count', 'total_duration')}),
+        ('통계', {'fields': ('lectures_count', 'total_duration', 'comments_count')}),
         ('일시', {'fields': ('created_at', 'updated_at')}),
     )
 
-    readonly_fields = ['lectures_count', 'total_duration', 'created_at', 'updated_at']
+    readonly_fields = ['lectures_count', 'total_duration', 'comments_count', 'created_at', 'updated_at']
 
     def thumbnail_preview(self, obj):
         """썸네일 미리보기"""
@@ -0,0 +1,150 @@
+import hashlib
+import logging
+import time
+from urllib.parse import urlencode
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.response import Response
+
+try:
+    from redis.exceptions import RedisError
+except ImportError:  # redis 백엔드를 쓰지 않는 환경
+    CACHE_ERRORS = (OSError,)
+else:
+    CACHE_ERRORS = (RedisError, OSError)
+
+CACHE_PREFIX = 'catalog'
+LIST_VERSION_KEY = f'{CACHE_PREFIX}:list:version'
+STATS_KEYS = {
+    'hits': f'{CACHE_PREFIX}:stats:hits',
+    'misses': f'{CACHE_PREFIX}:stats:misses',
+}
+
+logger = logging.getLogger(__name__)
+
+
+def get_cache():
+    """강의 목록/상세 응답 캐시"""
+    return caches[settings.CATALOG_CACHE_ALIAS]
+
+
+def course_version_key(course_id):
+    return f'{CACHE_PREFIX}:course:{course_id}:version'
+
+
+def get_version(key):
+    """버전 값 조회 (없으면 현재 시각으로 초기화)
+
+    버전 키가 축출되어도 이전 버전 번호가 재사용되지 않도록 시각(ms)으로 시작합니다.
+    """
+    cache = get_cache()
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(key):
+    """버전 증가 (해당 버전으로 저장된 응답은 모두 무효화)"""
+    cache = get_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, int(time.time() * 1000), timeout=None)
+
+
+def invalidate_courses(course_ids):
+    """강의 상세 및 목록 캐시 무효화 (트랜잭션 커밋 후 실행)"""
+    course_ids = list(course_ids)
+
+    def bump():
+        try:
+            bump_version(LIST_VERSION_KEY)
+            for course_id in course_ids:
+                bump_version(course_version_key(course_id))
+        except CACHE_ERRORS:
+            # 이미 커밋된 요청을 실패시키지 않음 (캐시된 응답은 CATALOG_CACHE_TIMEOUT 후 만료)
+            logger.exception('강의 캐시 무효화에 실패했습니다. (course_ids=%s)', course_ids)
+
+    transaction.on_commit(bump)
+
+
+def normalized_params(request):
+    """쿼리 파라미터 정규화 (키/값 정렬)"""
+    params = sorted(
+        (key, value)
+        for key in request.query_params
+        for value in request.query_params.getlist(key)
+    )
+    return urlencode(params)
+
+
+def _digest(request):
+    raw = f'{request.get_host()}{request.path}?{normalized_params(request)}'
+    return hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+
+def list_cache_key(request):
+    return f'{CACHE_PREFIX}:list:{get_version(LIST_VERSION_KEY)}:{_digest(request)}'
+
+
+def detail_cache_key(request, course_id):
+    version = get_version(course_version_key(course_id))
+    return f'{CACHE_PREFIX}:detail:{course_id}:{version}:{_digest(request)}'
+
+
+def is_cacheable(request):
+    """익명 사용자의 GET 요청만 캐시 (공개 강의만 보이므로 사용자별 차이가 없음)"""
+    return request.method == 'GET' and not request.user.is_authenticated
+
+
+def record(stat):
+    cache = get_cache()
+    key = STATS_KEYS[stat]
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+
+
+def get_stats():
+    """캐시 적중/미적중 횟수"""
+    cache = get_cache()
+    return {stat: cache.get(key) or 0 for stat, key in STATS_KEYS.items()}
+
+
+def reset_stats():
+    get_cache().delete_many(list(STATS_KEYS.values()))
+
+
+def cached_response(get_key, render):
+    """캐시된 응답 데이터가 있으면 반환하고, 없으면 render() 결과(200)를 저장
+
+    캐시 키는 get_key()로 만듭니다. (버전 조회도 캐시 서버를 사용)
+    캐시 서버에 연결할 수 없으면 캐시 없이 render() 결과를 그대로 반환합니다.
+    """
+    cache = get_cache()
+    try:
+        key = get_key()
+        data = cache.get(key)
+        record('hits' if data is not None else 'misses')
+    except CACHE_ERRORS:
+        logger.warning('강의 캐시를 사용할 수 없어 캐시 없이 응답합니다.', exc_info=True)
+        return render()
+
+    if data is not None:
+        response = Response(data)
+        response['X-Cache'] = 'HIT'
+        return response
+
+    response = render()
+    if response.status_code == 200:
+        try:
+            cache.set(key, response.data, timeout=settings.CATALOG_CACHE_TIMEOUT)
+        except CACHE_ERRORS:
+            logger.warning('강의 캐시에 응답을 저장하지 못했습니다.', exc_info=True)
+    response['X-Cache'] = 'MISS'
+    return response
@@ -0,0 +1,34 @@
+import hashlib
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def make_etag(*parts):
+    """검증자 값들로 ETag 생성"""
+    raw = '|'.join(str(part) for part in parts)
+    return quote_etag(hashlib.md5(raw.encode('utf-8')).hexdigest())
+
+
+def set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
+
+
+def conditional_response(request, etag, last_modified, render):
+    """조건부 GET 처리
+
+    If-None-Match / If-Modified-Since가 현재 검증자와 일치하면 render()를 호출하지 않고
+    304를 반환합니다. 일치하지 않으면 render() 결과에 ETag / Last-Modified를 붙입니다.
+    last_modified가 None이면 ETag만 사용합니다. (삭제/카운터 갱신이 수정 시각에 나타나지 않는 모델 응답)
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified is not None else None
+    not_modified = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if not_modified is not None:
+        return set_validators(not_modified, etag, last_modified)
+
+    response = render()
+    if response.status_code in (200, 206):
+        set_validators(response, etag, last_modified)
+    return response
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from courses.cache import get_stats, reset_stats
+
+
+class Command(BaseCommand):
+    """강의 응답 캐시 적중률 출력"""
+
+    help = '강의 목록/상세 응답 캐시의 적중(hit)/미적중(miss) 횟수를 출력합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='출력 후 카운터 초기화',
+        )
+
+    def handle(self, *args, **options):
+        stats = get_stats()
+        total = stats['hits'] + stats['misses']
+        ratio = stats['hits'] / total * 100 if total else 0
+
+        self.stdout.write(
+            f"hits: {stats['hits']}, misses: {stats['misses']}, 적중률: {ratio:.1f}%"
+        )
+
+        if options['reset']:
+            reset_stats()
+            self.stdout.write(self.style.SUCCESS('카운터를 초기화했습니다.'))
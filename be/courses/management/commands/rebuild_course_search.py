@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from courses.search import get_search_backend
+
+
+class Command(BaseCommand):
+    """강의 검색 인덱스 재구축"""
+
+    help = '강의 전문 검색 인덱스(FTS5 / tsvector)를 다시 생성합니다.'
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        if backend is None:
+            self.stdout.write(self.style.WARNING(
+                f'{connection.vendor} DB는 검색 인덱스를 지원하지 않습니다.'
+            ))
+            return
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            backend.create_table(cursor)
+            backend.index_courses(cursor)
+
+        self.stdout.write(self.style.SUCCESS('강의 검색 인덱스를 재구축했습니다.'))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from courses.stats import find_drifted_courses, recompute_course_stats
+
+
+class Command(BaseCommand):
+    """강의 통계(lectures_count, total_duration) 일괄 재계산"""
+
+    help = '레슨 테이블을 기준으로 강의의 레슨 수와 총 재생시간을 다시 계산합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--course',
+            type=int,
+            action='append',
+            dest='course_ids',
+            help='재계산할 강의 ID (여러 번 지정 가능, 생략 시 전체)',
+        )
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='수정하지 않고 통계가 어긋난 강의 수만 출력',
+        )
+
+    def handle(self, *args, **options):
+        course_ids = options['course_ids']
+        drifted = find_drifted_courses(course_ids).count()
+
+        if options['check']:
+            self.stdout.write(f'통계가 어긋난 강의: {drifted}개')
+            return
+
+        with transaction.atomic():
+            updated = recompute_course_stats(course_ids)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{updated}개 강의의 통계를 재계산했습니다. (어긋난 강의: {drifted}개)'
+        ))
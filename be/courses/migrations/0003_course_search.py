@@ -0,0 +1,69 @@
+from django.db import migrations
+
+# 마이그레이션 시점의 스키마를 고정하기 위해 앱 모듈(courses.search) 대신 DDL을 그대로 둠
+SEARCH_SQL = {
+    'sqlite': {
+        'create': [
+            "CREATE VIRTUAL TABLE IF NOT EXISTS courses_search USING fts5("
+            "title, instructor, description, tokenize='unicode61 remove_diacritics 2')",
+            "INSERT INTO courses_search(courses_search, rank) VALUES('rank', 'bm25(10.0, 5.0, 1.0)')",
+        ],
+        'index': [
+            'DELETE FROM courses_search',
+            'INSERT INTO courses_search(rowid, title, instructor, description) '
+            'SELECT c.id, c.title, u.username, c.description '
+            'FROM courses c INNER JOIN users u ON u.id = c.instructor_id',
+        ],
+        'drop': ['DROP TABLE IF EXISTS courses_search'],
+    },
+    'postgresql': {
+        'create': [
+            'CREATE TABLE IF NOT EXISTS courses_search ('
+            'course_id bigint PRIMARY KEY REFERENCES courses(id) ON DELETE CASCADE, '
+            'document tsvector NOT NULL)',
+            'CREATE INDEX IF NOT EXISTS courses_search_document_gin '
+            'ON courses_search USING GIN (document)',
+        ],
+        'index': [
+            'DELETE FROM courses_search',
+            'INSERT INTO courses_search(course_id, document) '
+            "SELECT c.id, "
+            "setweight(to_tsvector('simple', c.title), 'A') || "
+            "setweight(to_tsvector('simple', u.username), 'B') || "
+            "setweight(to_tsvector('simple', c.description), 'C') "
+            'FROM courses c INNER JOIN users u ON u.id = c.instructor_id',
+        ],
+        'drop': ['DROP TABLE IF EXISTS courses_search'],
+    },
+}
+
+
+def run_search_sql(schema_editor, *steps):
+    statements = SEARCH_SQL.get(schema_editor.connection.vendor)
+    if statements is None:
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for step in steps:
+            for sql in statements[step]:
+                cursor.execute(sql)
+
+
+def create_search_index(apps, schema_editor):
+    """검색 인덱스 테이블 생성 및 기존 강의 색인"""
+    run_search_sql(schema_editor, 'create', 'index')
+
+
+def drop_search_index(apps, schema_editor):
+    """검색 인덱스 테이블 삭제"""
+    run_search_sql(schema_editor, 'drop')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0002_catalog_index_tiebreaker'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
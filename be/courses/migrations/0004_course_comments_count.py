@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-18 03:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0003_course_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='댓글 수'),
+        ),
+    ]
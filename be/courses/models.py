@@ -1,13 +1,12 @@
 from django.db import models
 from django.conf import settings
 from django.core.exceptions import ValidationError
-import os
+from media_files.storage import upload_path
 
 
 def course_thumbnail_path(instance, filename):
-    """강의 썸네일 저장 경로"""
-    ext = os.path.splitext(filename)[1]
-    return f'courses/{instance.id}/thumbnail{ext}'
+    """강의 썸네일 저장 경로 (courses/thumbnails/ab/cd/<uuid>.<확장자>)"""
+    return upload_path('courses/thumbnails', filename)
 
 
 class Course(models.Model):
@@ -27,6 +26,7 @@ class Course(models.Model):
         blank=True,
         null=True
     )
+    thumbnail_variants = models.JSONField('썸네일 변형 이미지', default=dict, blank=True, editable=False)
 
     # 상태
     is_published = models.BooleanField('공개 여부', default=False)
@@ -34,6 +34,7 @@ class Course(models.Model):
     # 통계
     lectures_count = models.PositiveIntegerField('레슨 수', default=0)
     total_duration = models.PositiveIntegerField('총 재생시간(초)', default=0)
+    comments_count = models.PositiveIntegerField('댓글 수', default=0)
 
     # 타임스탬프
     created_at = models.DateTimeField('생성일', auto_now_add=True)
@@ -46,7 +47,7 @@ class Course(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['instructor', '-created_at']),
-            models.Index(fields=['is_published', '-created_at']),
+            models.Index(fields=['is_published', '-created_at', '-id']),
         ]
 
     def __str__(self):
@@ -0,0 +1,216 @@
+import base64
+import json
+from datetime import date, datetime
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """키셋(커서) 페이지네이션
+
+    OFFSET 대신 마지막 행의 정렬 키 값을 기준으로 다음 페이지를 조회하고
+    COUNT(*) 쿼리를 실행하지 않으므로 몇 번째 페이지든 비용이 같습니다.
+    정렬 키 끝에는 tie_breakers를 덧붙여 동일 값에서도 순서가 안정적으로 유지됩니다.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    max_page_size = 100
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    ordering = ['-created_at']
+    tie_breakers = ['created_at', 'id']
+    invalid_cursor_message = '유효하지 않은 커서입니다.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.key = self.get_key(request, queryset, view)
+
+        cursor = self.decode_cursor(request)
+        self.cursor = cursor
+        reverse = bool(cursor and cursor['r'])
+
+        queryset = queryset.order_by(*self._order_by(reverse))
+        if cursor is not None:
+            queryset = queryset.filter(self._seek_filter(cursor['v'], reverse))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+
+        if reverse:
+            results.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+
+        self.page = results
+        return results
+
+    def get_page_size(self, request):
+        """요청별 페이지 크기"""
+        value = request.query_params.get(self.page_size_query_param)
+        if value:
+            try:
+                size = int(value)
+            except ValueError:
+                size = 0
+            if size > 0:
+                return min(size, self.max_page_size)
+        return self.page_size
+
+    def get_key(self, request, queryset, view):
+        """정렬 키 (필터가 적용한 정렬 + tie-breaker)
+
+        필터 백엔드가 정한 쿼리셋 정렬(검색 관련도 순 등)을 그대로 키로 사용하고,
+        정렬이 없으면 OrderingFilter의 기본 정렬을 사용합니다.
+        """
+        ordering = queryset.query.order_by
+        if not ordering or not all(isinstance(name, str) for name in ordering):
+            ordering = None
+            for backend in getattr(view, 'filter_backends', []):
+                if issubclass(backend, OrderingFilter):
+                    ordering = backend().get_ordering(request, queryset, view)
+                    break
+        ordering = list(ordering or self.ordering)
+
+        fields = [name.lstrip('-') for name in ordering]
+        descending = ordering[-1].startswith('-')
+        for name in self.tie_breakers:
+            if name not in fields:
+                ordering.append(f'-{name}' if descending else name)
+                fields.append(name)
+        return ordering
+
+    def _order_by(self, reverse):
+        """조회 방향에 맞춘 ORDER BY"""
+        if not reverse:
+            return self.key
+        return [
+            name[1:] if name.startswith('-') else f'-{name}'
+            for name in self.key
+        ]
+
+    def _seek_filter(self, values, reverse):
+        """(k1, k2, ...) 이후 행을 가리키는 조건
+
+        k1 > v1 OR (k1 = v1 AND k2 > v2) OR ... 형태로 펼쳐서
+        필드마다 정렬 방향이 달라도 동작하도록 합니다.
+        """
+        condition = Q()
+        equal = Q()
+        for name, value in zip(self.key, values):
+            field = name.lstrip('-')
+            descending = name.startswith('-') != reverse
+            lookup = f'{field}__lt' if descending else f'{field}__gt'
+            condition |= equal & Q(**{lookup: value})
+            equal &= Q(**{field: value})
+        return condition
+
+    def _position(self, obj):
+        """객체의 정렬 키 값"""
+        values = []
+        for name in self.key:
+            value = getattr(obj, name.lstrip('-'))
+            if isinstance(value, (datetime, date)):
+                value = value.isoformat()
+            values.append(value)
+        return values
+
+    def decode_cursor(self, request):
+        """커서 디코딩 (없으면 None)"""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            cursor = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            values, reverse = cursor['v'], bool(cursor['r'])
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(values, list) or len(values) != len(self.key):
+            raise NotFound(self.invalid_cursor_message)
+
+        return {'v': values, 'r': reverse}
+
+    @staticmethod
+    def encode_position(values, reverse=False):
+        """정렬 키 값으로 커서 토큰 생성"""
+        payload = json.dumps({'v': values, 'r': int(reverse)}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+    def encode_cursor(self, values, reverse):
+        """커서를 포함한 URL 생성"""
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, self.encode_position(values, reverse)
+        )
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self._position(self.page[-1]), reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self._position(self.page[0]), reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class OptionalKeysetPagination(PageNumberPagination):
+    """기본은 페이지 번호 방식이며, cursor 파라미터가 있으면(빈 값 포함) keyset_class로 동작하는 페이지네이션
+
+    기존 응답 형태(count, 페이지 번호 next/previous)를 유지하면서 커서 방식을 선택적으로 제공합니다.
+    """
+
+    keyset_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.keyset_class.cursor_query_param in request.query_params:
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class CourseCatalogPagination(OptionalKeysetPagination):
+    """강의 목록 페이지네이션
+
+    기본은 페이지 번호 방식이며, cursor 파라미터가 있으면(빈 값 포함)
+    (정렬 필드, created_at, id) 키셋 방식으로 동작합니다.
+    """
+
+    keyset_class = KeysetPagination
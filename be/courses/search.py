@@ -0,0 +1,245 @@
+import logging
+import re
+from django.db import connection
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import SearchFilter
+from rest_framework.settings import api_settings
+
+SEARCH_TABLE = 'courses_search'
+MAX_SEARCH_TOKENS = 10
+
+logger = logging.getLogger(__name__)
+
+# 검색 인덱스 테이블이 있는 것으로 확인된 DB alias
+_ready_databases = set()
+
+
+def tokenize(text):
+    """검색어를 단어 단위로 분리 (특수문자 제거)"""
+    return re.findall(r'\w+', text)[:MAX_SEARCH_TOKENS]
+
+
+class BaseCourseSearch:
+    """강의 검색 인덱스 공통 동작 (하위 클래스가 DB별 SQL을 정의)"""
+
+    rank_ordering = 'search_rank'
+    create_sql = []
+    drop_sql = []
+    delete_sql = ''
+    insert_sql = ''
+    id_column = ''
+    course_id_column = 'c.id'
+    match_sql = ''
+    rank_sql = ''
+
+    def build_query(self, text):
+        raise NotImplementedError
+
+    def create_table(self, cursor):
+        for sql in self.create_sql:
+            cursor.execute(sql)
+
+    def drop_table(self, cursor):
+        for sql in self.drop_sql:
+            cursor.execute(sql)
+
+    def _where_in(self, column, ids):
+        return f' WHERE {column} IN ({", ".join(["%s"] * len(ids))})'
+
+    def index_courses(self, cursor, course_ids=None):
+        """강의 인덱스 갱신 (course_ids가 없으면 전체 재구축)"""
+        if course_ids is None:
+            cursor.execute(self.delete_sql)
+            cursor.execute(self.insert_sql)
+            return
+
+        course_ids = list(course_ids)
+        if not course_ids:
+            return
+        self.remove_courses(cursor, course_ids)
+        cursor.execute(
+            self.insert_sql + self._where_in(self.course_id_column, course_ids),
+            course_ids
+        )
+
+    def remove_courses(self, cursor, course_ids):
+        """강의 인덱스 삭제"""
+        course_ids = list(course_ids)
+        if course_ids:
+            cursor.execute(
+                self.delete_sql + self._where_in(self.id_column, course_ids),
+                course_ids
+            )
+
+
+class SQLiteCourseSearch(BaseCourseSearch):
+    """SQLite FTS5 기반 강의 검색 인덱스
+
+    제목, 강사명, 설명을 FTS5 가상 테이블에 저장하고 rowid를 강의 ID로 사용합니다.
+    순위는 bm25(제목 10 : 강사명 5 : 설명 1) 가중치로 계산되며 값이 작을수록 관련도가 높습니다.
+    """
+
+    create_sql = [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+        f"title, instructor, description, tokenize='unicode61 remove_diacritics 2')",
+        f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rank) VALUES('rank', 'bm25(10.0, 5.0, 1.0)')",
+    ]
+    drop_sql = [f'DROP TABLE IF EXISTS {SEARCH_TABLE}']
+    delete_sql = f'DELETE FROM {SEARCH_TABLE}'
+    insert_sql = (
+        f'INSERT INTO {SEARCH_TABLE}(rowid, title, instructor, description) '
+        'SELECT c.id, c.title, u.username, c.description '
+        'FROM courses c INNER JOIN users u ON u.id = c.instructor_id'
+    )
+    id_column = 'rowid'
+    match_sql = f'SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s'
+    rank_sql = (
+        f'SELECT rank FROM {SEARCH_TABLE} '
+        f'WHERE {SEARCH_TABLE} MATCH %s AND rowid = courses.id'
+    )
+
+    def build_query(self, text):
+        """FTS5 MATCH 쿼리 (모든 단어 AND, 접두어 일치)"""
+        return ' '.join(f'"{token}"*' for token in tokenize(text))
+
+
+class PostgresCourseSearch(BaseCourseSearch):
+    """PostgreSQL tsvector + GIN 기반 강의 검색 인덱스
+
+    한국어 형태소 분석기가 없으므로 'simple' 설정을 사용하고
+    제목(A), 강사명(B), 설명(C) 가중치로 ts_rank 순위를 계산합니다. 값이 클수록 관련도가 높습니다.
+    """
+
+    rank_ordering = '-search_rank'
+
+    create_sql = [
+        f'CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ('
+        'course_id bigint PRIMARY KEY REFERENCES courses(id) ON DELETE CASCADE, '
+        'document tsvector NOT NULL)',
+        f'CREATE INDEX IF NOT EXISTS {SEARCH_TABLE}_document_gin '
+        f'ON {SEARCH_TABLE} USING GIN (document)',
+    ]
+    drop_sql = [f'DROP TABLE IF EXISTS {SEARCH_TABLE}']
+    delete_sql = f'DELETE FROM {SEARCH_TABLE}'
+    insert_sql = (
+        f'INSERT INTO {SEARCH_TABLE}(course_id, document) '
+        "SELECT c.id, "
+        "setweight(to_tsvector('simple', c.title), 'A') || "
+        "setweight(to_tsvector('simple', u.username), 'B') || "
+        "setweight(to_tsvector('simple', c.description), 'C') "
+        'FROM courses c INNER JOIN users u ON u.id = c.instructor_id'
+    )
+    id_column = 'course_id'
+    match_sql = (
+        f'SELECT course_id FROM {SEARCH_TABLE} '
+        "WHERE document @@ to_tsquery('simple', %s)"
+    )
+    rank_sql = (
+        f"SELECT ts_rank(document, to_tsquery('simple', %s)) FROM {SEARCH_TABLE} "
+        'WHERE course_id = courses.id'
+    )
+
+    def build_query(self, text):
+        """tsquery (모든 단어 AND, 접두어 일치)"""
+        return ' & '.join(f'{token}:*' for token in tokenize(text))
+
+
+SEARCH_BACKENDS = {
+    'sqlite': SQLiteCourseSearch,
+    'postgresql': PostgresCourseSearch,
+}
+
+
+def get_search_backend(conn=None):
+    """DB 종류에 맞는 검색 백엔드 (지원하지 않으면 None)"""
+    backend_class = SEARCH_BACKENDS.get((conn or connection).vendor)
+    return backend_class() if backend_class else None
+
+
+def search_table_exists(conn=None):
+    """검색 인덱스 테이블 존재 여부 (한 번 확인되면 다시 조회하지 않음)"""
+    conn = conn or connection
+    if conn.alias not in _ready_databases and SEARCH_TABLE in conn.introspection.table_names():
+        _ready_databases.add(conn.alias)
+    return conn.alias in _ready_databases
+
+
+def ensure_search_table(conn=None):
+    """검색 인덱스 테이블이 없으면 생성하고 기존 강의 색인
+
+    마이그레이션 없이 만든 DB(테스트의 --nomigrations 등)에도 테이블이 생기도록 post_migrate에서 호출됩니다.
+    """
+    conn = conn or connection
+    _ready_databases.discard(conn.alias)
+    backend = get_search_backend(conn)
+    if backend is None or search_table_exists(conn):
+        return
+    if 'courses' not in conn.introspection.table_names():
+        # courses 앱을 zero로 되돌린 경우
+        return
+    with conn.cursor() as cursor:
+        backend.create_table(cursor)
+        backend.index_courses(cursor)
+    _ready_databases.add(conn.alias)
+
+
+def get_ready_backend():
+    """테이블이 준비된 검색 백엔드 (테이블이 없으면 경고 후 None)"""
+    backend = get_search_backend()
+    if backend is None:
+        return None
+    if not search_table_exists():
+        logger.warning('검색 인덱스 테이블(%s)이 없어 강의 색인을 건너뜁니다. migrate를 실행하세요.', SEARCH_TABLE)
+        return None
+    return backend
+
+
+def index_courses(course_ids=None):
+    """강의 검색 인덱스 갱신"""
+    backend = get_ready_backend()
+    if backend is None:
+        return
+    with connection.cursor() as cursor:
+        backend.index_courses(cursor, course_ids)
+
+
+def remove_courses(course_ids):
+    """강의 검색 인덱스 삭제"""
+    backend = get_ready_backend()
+    if backend is None:
+        return
+    with connection.cursor() as cursor:
+        backend.remove_courses(cursor, course_ids)
+
+
+class CourseSearchFilter(SearchFilter):
+    """전문 검색(Full-text) 기반 강의 검색 필터
+
+    search 파라미터를 검색 인덱스로 조회하고 관련도(search_rank)를 주석으로 붙입니다.
+    ordering 파라미터가 없으면 관련도 순으로 정렬하므로 OrderingFilter 뒤에 두어야 합니다.
+    검색 인덱스를 지원하지 않는 DB이거나 인덱스 테이블이 없으면 기본 SearchFilter(icontains)로 동작합니다.
+    """
+
+    ordering_param = api_settings.ORDERING_PARAM
+
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        backend = get_search_backend()
+        if not search_terms or backend is None or not search_table_exists():
+            return super().filter_queryset(request, queryset, view)
+
+        query = backend.build_query(' '.join(search_terms))
+        if not query:
+            # 특수문자만 입력한 경우 (검색 단어가 없으므로 일치하는 강의도 없음)
+            return queryset.none()
+
+        queryset = queryset.filter(
+            pk__in=RawSQL(backend.match_sql, [query])
+        ).annotate(
+            search_rank=RawSQL(backend.rank_sql, [query])
+        )
+
+        if not request.query_params.get(self.ordering_param):
+            queryset = queryset.order_by(backend.rank_ordering, *queryset.query.order_by)
+
+        return queryset
@@ -1,46 +1,116 @@
 from rest_framework import serializers
+from rest_framework.utils.urls import replace_query_param
+from django.db.models import Prefetch
 from .models import Course
 from accounts.serializers import UserSerializer
+from media_files.images import ImageVariantsField
+from lectures.models import Lecture
+
+# 강의 상세에 포함하는 레슨 수 (나머지는 lectures_next 링크로 조회)
+EMBEDDED_LECTURES_LIMIT = 100
+EMBEDDED_LECTURES_PARAM = 'lectures_after'
+EMBEDDED_LECTURE_FIELDS = [
+    'id', 'course_id', 'title', 'content_type', 'order',
+    'duration', 'comments_count', 'unanswered_count', 'created_at'
+]
+
+
+def embedded_lectures_queryset(after=None):
+    """강의에 포함할 레슨 쿼리셋 (순서대로, 필요한 컬럼만)"""
+    queryset = Lecture.objects.only(*EMBEDDED_LECTURE_FIELDS).order_by('order')
+    if after is not None:
+        queryset = queryset.filter(order__gt=after)
+    return queryset
+
+
+def embedded_lectures_prefetch(after=None, limit=EMBEDDED_LECTURES_LIMIT):
+    """강의별 레슨 Prefetch (다음 페이지 확인을 위해 limit + 1개)"""
+    return Prefetch(
+        'lectures',
+        queryset=embedded_lectures_queryset(after)[:limit + 1],
+        to_attr='embedded_lectures'
+    )
+
+
+def parse_lectures_after(request):
+    """lectures_after 파라미터 (레슨 order 기준 키셋)"""
+    if request is None:
+        return None
+    try:
+        return int(request.query_params[EMBEDDED_LECTURES_PARAM])
+    except (KeyError, ValueError):
+        return None
 
 
 class CourseListSerializer(serializers.ModelSerializer):
     """강의 목록 Serializer (간단한 정보)"""
 
     instructor = UserSerializer(read_only=True)
+    thumbnail_variants = ImageVariantsField()
 
     class Meta:
         model = Course
         fields = [
-            'id', 'title', 'description', 'thumbnail',
+            'id', 'title', 'description', 'thumbnail', 'thumbnail_variants',
             'instructor', 'is_published', 'lectures_count',
-            'total_duration', 'created_at'
+            'total_duration', 'comments_count', 'created_at'
+        ]
+        read_only_fields = [
+            'id', 'lectures_count', 'total_duration',
+            'comments_count', 'created_at'
         ]
-        read_only_fields = ['id', 'lectures_count', 'total_duration', 'created_at']
 
 
 class CourseDetailSerializer(serializers.ModelSerializer):
     """강의 상세 Serializer (레슨 목록 포함)"""
 
     instructor = UserSerializer(read_only=True)
+    thumbnail_variants = ImageVariantsField()
     lectures = serializers.SerializerMethodField()
+    lectures_next = serializers.SerializerMethodField()
 
     class Meta:
         model = Course
         fields = [
-            'id', 'title', 'description', 'thumbnail',
+            'id', 'title', 'description', 'thumbnail', 'thumbnail_variants',
             'instructor', 'is_published', 'lectures_count',
-            'total_duration', 'lectures', 'created_at', 'updated_at'
+            'total_duration', 'comments_count', 'lectures',
+            'lectures_next', 'created_at', 'updated_at'
         ]
         read_only_fields = [
-            'id', 'instructor', 'lectures_count',
-            'total_duration', 'created_at', 'updated_at'
+            'id', 'instructor', 'lectures_count', 'total_duration',
+            'comments_count', 'created_at', 'updated_at'
         ]
 
-    def get_lectures(self, obj):
-        """레슨 목록 (순서대로)"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
         from lectures.serializers import LectureListSerializer
-        lectures = obj.lectures.all().order_by('order')
-        return LectureListSerializer(lectures, many=True).data
+        self.lecture_serializer = LectureListSerializer(many=True)
+
+    def get_embedded_lectures(self, obj):
+        """embedded_lectures_prefetch 결과 (prefetch되지 않았으면 직접 조회)"""
+        if not hasattr(obj, 'embedded_lectures'):
+            after = parse_lectures_after(self.context.get('request'))
+            obj.embedded_lectures = list(
+                embedded_lectures_queryset(after).filter(course=obj)[:EMBEDDED_LECTURES_LIMIT + 1]
+            )
+        return obj.embedded_lectures
+
+    def get_lectures(self, obj):
+        """레슨 목록 (순서대로, 최대 EMBEDDED_LECTURES_LIMIT개)"""
+        lectures = self.get_embedded_lectures(obj)[:EMBEDDED_LECTURES_LIMIT]
+        return self.lecture_serializer.to_representation(lectures)
+
+    def get_lectures_next(self, obj):
+        """다음 레슨 페이지 URL"""
+        lectures = self.get_embedded_lectures(obj)
+        request = self.context.get('request')
+        if len(lectures) <= EMBEDDED_LECTURES_LIMIT or request is None:
+            return None
+        last_order = lectures[EMBEDDED_LECTURES_LIMIT - 1].order
+        return replace_query_param(
+            request.build_absolute_uri(), EMBEDDED_LECTURES_PARAM, last_order
+        )
 
 
 class CourseCreateSerializer(serializers.ModelSerializer):
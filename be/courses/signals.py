@@ -0,0 +1,72 @@
+from django.conf import settings
+from django.db import connections
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from media_files.images import queue_image_variants
+from media_files.storage import delete_on_commit
+from .cache import invalidate_courses
+from .models import Course
+from .search import ensure_search_table, index_courses, remove_courses
+
+SEARCH_INDEXED_FIELDS = {'title', 'description', 'instructor'}
+CACHED_USER_FIELDS = {'username', 'email', 'profile_image', 'profile_image_variants', 'bio', 'courses_count'}
+
+
+def create_search_table(sender, using, **kwargs):
+    """migrate 후 검색 인덱스 테이블이 없으면 생성 (apps.ready에서 연결)"""
+    ensure_search_table(connections[using])
+
+
+@receiver(post_save, sender=Course)
+def index_course_on_save(sender, instance, update_fields=None, **kwargs):
+    """강의 저장 시 검색 인덱스 갱신"""
+    if update_fields is not None and not SEARCH_INDEXED_FIELDS & set(update_fields):
+        return
+    index_courses([instance.pk])
+
+
+@receiver(post_save, sender=Course)
+def queue_thumbnail_variants(sender, instance, update_fields=None, **kwargs):
+    """썸네일 변경 시 카드용 변형 이미지 생성 작업 등록"""
+    if update_fields is not None and 'thumbnail' not in update_fields:
+        return
+    queue_image_variants(instance, 'thumbnail', 'course_thumbnail')
+
+
+@receiver(post_delete, sender=Course)
+def remove_course_on_delete(sender, instance, **kwargs):
+    """강의 삭제 시 검색 인덱스 삭제"""
+    remove_courses([instance.pk])
+
+
+@receiver(post_delete, sender=Course)
+def delete_thumbnail_file(sender, instance, **kwargs):
+    """강의 삭제 시 커밋 후 썸네일 파일 삭제 (변형 이미지는 gc_media가 정리)"""
+    delete_on_commit(instance.thumbnail.name)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def reindex_instructor_courses(sender, instance, created=False, update_fields=None, **kwargs):
+    """사용자명 변경 시 해당 강사의 강의 검색 인덱스 갱신"""
+    if created:
+        return
+    if update_fields is not None and 'username' not in update_fields:
+        return
+    index_courses(instance.courses.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def invalidate_course_cache(sender, instance, **kwargs):
+    """강의 변경 시 목록/상세 캐시 무효화"""
+    invalidate_courses([instance.pk])
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_instructor_cache(sender, instance, created=False, update_fields=None, **kwargs):
+    """강사 정보 변경 시 해당 강사의 강의 캐시 무효화"""
+    if created:
+        return
+    if update_fields is not None and not CACHED_USER_FIELDS & set(update_fields):
+        return
+    invalidate_courses(instance.courses.values_list('pk', flat=True))
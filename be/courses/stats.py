@@ -0,0 +1,95 @@
+from collections import defaultdict
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from lectures.models import Lecture
+from .cache import invalidate_courses
+from .models import Course
+
+
+def apply_lecture_delta(course_id, count_delta=0, duration_delta=0, comments_delta=0):
+    """강의 통계(레슨 수, 총 재생시간, 댓글 수)에 증감분을 원자적으로 반영
+
+    레슨을 다시 읽지 않고 단일 UPDATE 문으로 처리하므로 동시 수정에도 안전합니다.
+    호출하는 쪽의 트랜잭션 안에서 실행되어야 합니다.
+    """
+    if not count_delta and not duration_delta and not comments_delta:
+        return 0
+
+    return Course.objects.filter(pk=course_id).update(
+        lectures_count=F('lectures_count') + count_delta,
+        total_duration=F('total_duration') + duration_delta,
+        comments_count=F('comments_count') + comments_delta,
+    )
+
+
+def sync_media_duration(media_file_id, duration):
+    """미디어 파일을 사용하는 레슨의 재생시간을 갱신하고 강의 총 재생시간에 차이 반영
+
+    갱신된 레슨 수를 반환합니다.
+    """
+    with transaction.atomic():
+        lectures = list(
+            Lecture.objects.select_for_update()
+            .filter(media_file_id=media_file_id).exclude(duration=duration)
+            .values_list('id', 'course_id', 'duration')
+        )
+        if not lectures:
+            return 0
+
+        deltas = defaultdict(int)
+        for _, course_id, old_duration in lectures:
+            deltas[course_id] += duration - old_duration
+
+        Lecture.objects.filter(pk__in=[pk for pk, _, _ in lectures]).update(duration=duration)
+        for course_id, delta in deltas.items():
+            apply_lecture_delta(course_id, duration_delta=delta)
+        invalidate_courses(deltas)
+    return len(lectures)
+
+
+def _lecture_aggregate(expression):
+    """강의별 레슨 집계 서브쿼리"""
+    subquery = (
+        Lecture.objects
+        .filter(course=OuterRef('pk'))
+        .order_by()
+        .values('course')
+        .annotate(value=expression)
+        .values('value')
+    )
+    return Coalesce(Subquery(subquery, output_field=IntegerField()), Value(0))
+
+
+def stats_queryset(course_ids=None):
+    """통계 재계산 대상 강의 쿼리셋"""
+    queryset = Course.objects.all()
+    if course_ids:
+        queryset = queryset.filter(pk__in=course_ids)
+    return queryset
+
+
+def find_drifted_courses(course_ids=None):
+    """저장된 통계와 실제 레슨 집계가 다른 강의 쿼리셋"""
+    return (
+        stats_queryset(course_ids)
+        .annotate(
+            actual_lectures_count=_lecture_aggregate(Count('id')),
+            actual_total_duration=_lecture_aggregate(Sum('duration')),
+        )
+        .exclude(
+            lectures_count=F('actual_lectures_count'),
+            total_duration=F('actual_total_duration'),
+        )
+    )
+
+
+def recompute_course_stats(course_ids=None):
+    """레슨 테이블로부터 강의 통계를 일괄 재계산 (단일 UPDATE 문)
+
+    course_ids가 없으면 전체 강의를 대상으로 합니다. 갱신된 행 수를 반환합니다.
+    """
+    return stats_queryset(course_ids).update(
+        lectures_count=_lecture_aggregate(Count('id')),
+        total_duration=_lecture_aggregate(Sum('duration')),
+    )
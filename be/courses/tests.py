@@ -1,3 +1,421 @@
-from django.test import TestCase
+from unittest import mock, skipUnless
+from urllib.parse import parse_qsl, urlsplit
+import fakeredis
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from accounts.models import User
+from lectures.models import Lecture
+from .cache import invalidate_courses
+from .search import SEARCH_TABLE
+from .models import Course
+from .serializers import EMBEDDED_LECTURES_LIMIT
+from .pagination import KeysetPagination
 
-# Create your tests here.
+# Redis 대신 사용하는 로컬 대역 (같은 주소의 연결끼리 데이터를 공유)
+REDIS_STAND_IN = {
+    'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+    'LOCATION': 'redis://catalog-test:6379/1',
+    'OPTIONS': {'connection_class': fakeredis.FakeRedisConnection},
+}
+
+
+def create_instructor(username='instructor'):
+    return User.objects.create_user(username=username, email=f'{username}@example.com', password='pw12345!x')
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'catalog': REDIS_STAND_IN,
+})
+class CatalogRedisCacheTest(TestCase):
+    """Redis 호환 백엔드에서 목록/상세 응답 캐시와 버전 무효화"""
+
+    def setUp(self):
+        caches['catalog'].clear()
+        self.client = APIClient()
+        self.course = Course.objects.create(
+            instructor=create_instructor(),
+            title='Redis 캐시',
+            description='캐시 테스트용 강의입니다.',
+            is_published=True
+        )
+
+    def test_list_and_detail_are_cached(self):
+        # 상세는 ETag 계산용 쿼리 한 번만 실행
+        for url, queries in [('/api/courses/', 0), (f'/api/courses/{self.course.pk}/', 1)]:
+            self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+            with self.assertNumQueries(queries):
+                self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+
+    def test_invalidation_from_another_process(self):
+        """다른 프로세스(후처리 워커 등)의 무효화가 공유 캐시를 통해 반영됨"""
+        url = f'/api/courses/{self.course.pk}/'
+        self.client.get(url)
+
+        Course.objects.filter(pk=self.course.pk).update(title='바뀐 제목')
+        worker_cache = RedisCache(REDIS_STAND_IN['LOCATION'], {'OPTIONS': REDIS_STAND_IN['OPTIONS']})
+        with mock.patch('courses.cache.get_cache', return_value=worker_cache):
+            with self.captureOnCommitCallbacks(execute=True):
+                invalidate_courses([self.course.pk])
+
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['title'], '바뀐 제목')
+        self.assertEqual(self.client.get('/api/courses/')['X-Cache'], 'MISS')
+
+
+    def test_detail_key_uses_numeric_id(self):
+        """/courses/01/ 처럼 0이 붙은 주소의 캐시도 강의 버전 증가로 무효화됨"""
+        url = f'/api/courses/0{self.course.pk}/'
+        self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_courses([self.course.pk])
+        self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    # 열려 있지 않은 포트 (연결 거부)
+    'catalog': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://127.0.0.1:1/0'},
+})
+class CatalogCacheUnavailableTest(TestCase):
+    """캐시 서버에 연결할 수 없으면 캐시 없이 응답 (fail open)"""
+
+    def test_requests_succeed_without_cache(self):
+        instructor = create_instructor()
+        course = Course.objects.create(
+            instructor=instructor, title='캐시 장애', description='캐시 서버 없이 응답', is_published=True
+        )
+        client = APIClient()
+        for url in ['/api/courses/', f'/api/courses/{course.pk}/']:
+            with self.assertLogs('courses.cache', 'WARNING'):
+                response = client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('X-Cache', response)
+
+        # 커밋 후 무효화 실패도 요청을 실패시키지 않음
+        client.force_authenticate(instructor)
+        with self.assertLogs('courses.cache', 'ERROR'), self.captureOnCommitCallbacks(execute=True):
+            response = client.patch(f'/api/courses/{course.pk}/', {'title': '바뀐 제목'}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+
+class KeysetPaginationTest(TestCase):
+    """강의 목록 키셋(커서) 페이지네이션"""
+
+    CATALOG_INDEX = 'courses_is_publ_fa30f6_idx'
+
+    def setUp(self):
+        caches['catalog'].clear()
+        self.client = APIClient()
+        self.instructor = create_instructor()
+
+    def get_path(self, url):
+        parts = urlsplit(url)
+        return f'{parts.path}?{parts.query}'
+
+    def walk(self, params):
+        """첫 페이지부터 커서를 따라가며 모든 페이지의 강의 ID 수집"""
+        ids = []
+        data = self.client.get('/api/courses/', {'cursor': '', **params}).data
+        while True:
+            ids.extend(course['id'] for course in data['results'])
+            if not data['next']:
+                return ids
+            data = self.client.get(self.get_path(data['next'])).data
+
+    @skipUnless(connection.vendor == 'sqlite', 'SQLite 실행 계획 기준')
+    def test_keyset_query_uses_catalog_index(self):
+        """대량 데이터에서 다음 페이지 조회가 (is_published, -created_at, -id) 인덱스로 정렬/탐색됨
+
+        요청은 100만 건 기준이지만, 100만 건은 생성에만 3분가량 걸려 2만 건으로 확인합니다.
+        ANALYZE 통계로 플래너가 데이터 분포를 알게 되므로 이 규모에서도 같은 실행 계획
+        (인덱스 사용, TEMP B-TREE 정렬 없음)이 나오며, range(1000000)으로 바꿔도 통과합니다.
+        """
+        instructors = [self.instructor] + User.objects.bulk_create([
+            User(username=f'instructor{i}', email=f'instructor{i}@example.com') for i in range(1, 50)
+        ])
+        Course.objects.bulk_create([
+            Course(
+                instructor=instructors[i % len(instructors)],
+                title=f'강의 {i}',
+                description='대량 데이터 실행 계획 테스트',
+                is_published=i % 10 != 0
+            )
+            for i in range(20000)
+        ], batch_size=5000)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+        first = self.client.get('/api/courses/?cursor=').data
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.get_path(first['next']))
+
+        sql = next(query['sql'] for query in queries if 'FROM "courses"' in query['sql'])
+        self.assertNotIn('COUNT(', sql)
+        self.assertNotIn('OFFSET', sql)
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            plan = ' '.join(row[-1] for row in cursor.fetchall())
+        self.assertIn(self.CATALOG_INDEX, plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_cursor_keeps_search_relevance_order(self):
+        """?search=와 커서를 함께 쓰면 관련도 순서가 유지됨"""
+        titles = ['설명에만 장고', '장고 장고 입문', '장고 웹 개발', '파이썬 기초']
+        for title in titles:
+            Course.objects.create(
+                instructor=self.instructor,
+                title=title,
+                description='장고 강의 설명입니다.' if title == titles[0] else '웹 개발 강의 설명입니다.',
+                is_published=True
+            )
+
+        response = self.client.get('/api/courses/', {'search': '장고'})
+        ranked = [course['id'] for course in response.data['results']]
+        self.assertEqual(len(ranked), 3)
+        # 관련도 순서가 기본 정렬(최신순)과 달라야 검증 의미가 있음
+        self.assertNotEqual(ranked, sorted(ranked, reverse=True))
+        self.assertEqual(self.walk({'search': '장고', 'page_size': 1}), ranked)
+
+    def test_cursor_walks_every_course_once(self):
+        Course.objects.bulk_create([
+            Course(instructor=self.instructor, title=f'강의 {i}', description='커서 테스트', is_published=True)
+            for i in range(7)
+        ])
+        expected = list(Course.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(self.walk({'page_size': 3}), expected)
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get('/api/courses/?cursor=abc').status_code, 404)
+        token = KeysetPagination.encode_position(['2024-01-01T00:00:00'])
+        self.assertEqual(self.client.get(f'/api/courses/?cursor={token}').status_code, 404)
+
+
+class CourseDetailQueryCountTest(TestCase):
+    """강의 상세의 레슨 포함 쿼리 수 (레슨 수와 무관하게 일정)"""
+
+    # ETag 계산, 강의+강사, 레슨 Prefetch
+    EXPECTED_QUERIES = 3
+
+    def setUp(self):
+        self.instructor = create_instructor()
+        self.client = APIClient()
+        # 본인 요청은 응답 캐시를 거치지 않으므로 매번 직렬화됨
+        self.client.force_authenticate(self.instructor)
+
+    def create_course(self, lecture_count):
+        course = Course.objects.create(
+            instructor=self.instructor,
+            title=f'레슨 {lecture_count}개 강의',
+            description='쿼리 수 테스트용 강의입니다.',
+            is_published=True
+        )
+        Lecture.objects.bulk_create([
+            Lecture(course=course, title=f'레슨 {order}', content_type='text', order=order)
+            for order in range(1, lecture_count + 1)
+        ], batch_size=1000)
+        return course
+
+    def assert_detail_queries(self, lecture_count):
+        course = self.create_course(lecture_count)
+        with self.assertNumQueries(self.EXPECTED_QUERIES):
+            response = self.client.get(f'/api/courses/{course.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['lectures']), min(lecture_count, EMBEDDED_LECTURES_LIMIT))
+        return response
+
+    def test_one_lecture(self):
+        response = self.assert_detail_queries(1)
+        self.assertIsNone(response.data['lectures_next'])
+
+    def test_hundred_lectures(self):
+        response = self.assert_detail_queries(100)
+        self.assertIsNone(response.data['lectures_next'])
+
+    def test_five_thousand_lectures(self):
+        response = self.assert_detail_queries(5000)
+        orders = [lecture['order'] for lecture in response.data['lectures']]
+        self.assertEqual(orders, list(range(1, EMBEDDED_LECTURES_LIMIT + 1)))
+
+        # 다음 레슨 페이지도 같은 쿼리 수로 이어서 조회
+        next_url = urlsplit(response.data['lectures_next'])
+        with self.assertNumQueries(self.EXPECTED_QUERIES):
+            response = self.client.get(f'{next_url.path}?{next_url.query}')
+        self.assertEqual(response.data['lectures'][0]['order'], EMBEDDED_LECTURES_LIMIT + 1)
+
+
+class CourseListQueryCountTest(TestCase):
+    """강의 목록 쿼리 수 (커서 모드는 COUNT 없이 페이지 조회 1회, 페이지 위치와 무관)"""
+
+    def setUp(self):
+        self.instructor = create_instructor()
+        self.client = APIClient()
+        # 로그인 요청은 응답 캐시를 거치지 않으므로 매번 DB를 조회
+        self.client.force_authenticate(create_instructor('viewer'))
+        Course.objects.bulk_create([
+            Course(
+                instructor=self.instructor,
+                title=f'강의 {i}',
+                description='쿼리 수 테스트용 강의입니다.',
+                is_published=True,
+                lectures_count=i % 4
+            )
+            for i in range(45)
+        ])
+
+    def get_list(self, params, expected_queries):
+        with self.assertNumQueries(expected_queries) as queries:
+            response = self.client.get('/api/courses/', params)
+        self.assertEqual(response.status_code, 200)
+        return response, [query['sql'] for query in queries]
+
+    def test_page_number_counts_rows(self):
+        response, sqls = self.get_list({'page': 3}, 2)
+        self.assertEqual(response.data['count'], 45)
+        self.assertEqual(len(response.data['results']), 5)
+        self.assertIn('COUNT(', sqls[0])
+        self.assertIn('OFFSET', sqls[1])
+
+    def test_cursor_skips_count(self):
+        expected = list(Course.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        response, sqls = self.get_list({'cursor': ''}, 1)
+        self.assertNotIn('count', response.data)
+        self.assertEqual([course['id'] for course in response.data['results']], expected[:20])
+
+        # 뒤쪽 페이지도 같은 쿼리 수 (OFFSET 없음)
+        for start in (20, 40):
+            response, sqls = self.get_list(dict(parse_qsl(urlsplit(response.data['next']).query)), 1)
+            self.assertNotIn('OFFSET', sqls[0])
+            self.assertNotIn('COUNT(', sqls[0])
+            self.assertEqual([course['id'] for course in response.data['results']], expected[start:start + 20])
+
+    def test_cursor_with_ordering(self):
+        expected = list(
+            Course.objects.order_by('lectures_count', 'created_at', 'id').values_list('id', flat=True)
+        )
+        response, _ = self.get_list({'cursor': '', 'ordering': 'lectures_count'}, 1)
+        ids = [course['id'] for course in response.data['results']]
+        response, _ = self.get_list(dict(parse_qsl(urlsplit(response.data['next']).query)), 1)
+        ids += [course['id'] for course in response.data['results']]
+        self.assertEqual(ids, expected[:40])
+
+
+class CourseConditionalGetTest(TestCase):
+    """강의 상세 조건부 GET (ETag만 사용)"""
+
+    def setUp(self):
+        self.instructor = create_instructor()
+        self.client = APIClient()
+        self.client.force_authenticate(self.instructor)
+        self.course = Course.objects.create(
+            instructor=self.instructor,
+            title='조건부 요청',
+            description='ETag 테스트용 강의입니다.',
+            is_published=True
+        )
+        self.lecture = Lecture.objects.create(
+            course=self.course, title='레슨 1', content_type='text', content_text='본문', order=1
+        )
+        Course.objects.filter(pk=self.course.pk).update(lectures_count=1)
+        self.url = f'/api/courses/{self.course.pk}/'
+
+    def get_etag(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Last-Modified', response)
+        return response['ETag']
+
+    def test_matching_etag_returns_304(self):
+        etag = self.get_etag()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_lecture_delete_changes_etag(self):
+        etag = self.get_etag()
+        self.assertEqual(self.client.delete(f'/api/lectures/{self.lecture.pk}/').status_code, 204)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_counter_change_changes_etag(self):
+        """updated_at을 바꾸지 않는 F() 카운터 갱신(댓글 작성)도 반영"""
+        etag = self.get_etag()
+        response = self.client.post('/api/comments/', {'lecture': self.lecture.pk, 'content': '질문'})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_if_modified_since_alone_is_ignored(self):
+        """Last-Modified를 보내지 않으므로 If-Modified-Since만으로는 304가 되지 않음"""
+        self.get_etag()
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT')
+        self.assertEqual(response.status_code, 200)
+
+
+@skipUnless(connection.vendor == 'sqlite', 'SQLite FTS5 검색 인덱스 기준')
+class CourseSearchTest(TestCase):
+    """강의 전문 검색 인덱스 동기화와 관련도 정렬"""
+
+    def setUp(self):
+        self.instructor = create_instructor()
+        self.client = APIClient()
+        # 로그인 요청은 응답 캐시를 거치지 않음
+        self.client.force_authenticate(self.instructor)
+
+    def create_course(self, title, description='강의 설명입니다.'):
+        return Course.objects.create(
+            instructor=self.instructor, title=title, description=description, is_published=True
+        )
+
+    def search(self, text):
+        response = self.client.get('/api/courses/', {'search': text})
+        self.assertEqual(response.status_code, 200)
+        return [course['id'] for course in response.data['results']]
+
+    def indexed_ids(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT rowid FROM {SEARCH_TABLE} ORDER BY rowid')
+            return [row[0] for row in cursor.fetchall()]
+
+    def test_index_follows_create_update_delete(self):
+        course = self.create_course('장고 입문')
+        self.assertEqual(self.search('장고'), [course.pk])
+
+        course.title = '플라스크 입문'
+        course.save()
+        self.assertEqual(self.search('장고'), [])
+        self.assertEqual(self.search('플라스크'), [course.pk])
+
+        course_id = course.pk
+        course.delete()
+        self.assertNotIn(course_id, self.indexed_ids())
+
+    def test_instructor_rename_reindexes(self):
+        course = self.create_course('데이터베이스')
+        self.instructor.username = 'dbmaster'
+        self.instructor.save()
+        self.assertEqual(self.search('dbmaster'), [course.pk])
+
+    def test_title_match_ranks_first(self):
+        """제목 일치(가중치 10)가 설명 일치(가중치 1)보다 앞에 옴"""
+        in_title = self.create_course('알고리즘 특강')
+        in_description = self.create_course('코딩 테스트', '알고리즘 문제 풀이 강의입니다.')
+        self.create_course('무관한 강의')
+        self.assertEqual(self.search('알고리즘'), [in_title.pk, in_description.pk])
+        # ordering을 지정하면 관련도 대신 해당 정렬 사용
+        response = self.client.get('/api/courses/', {'search': '알고리즘', 'ordering': '-created_at'})
+        self.assertEqual([course['id'] for course in response.data['results']], [in_description.pk, in_title.pk])
+
+    def test_punctuation_only_matches_nothing(self):
+        self.create_course('특수문자 강의')
+        self.assertEqual(self.search('!!!'), [])
+
+    def test_falls_back_without_search_table(self):
+        """인덱스 테이블이 없으면 색인을 건너뛰고 icontains 검색으로 동작"""
+        with mock.patch('courses.search.search_table_exists', return_value=False):
+            course = self.create_course('파이썬 기초')
+            self.assertEqual(self.search('썬 기'), [course.pk])
+        self.assertNotIn(course.pk, self.indexed_ids())
@@ -1,15 +1,24 @@
 from rest_framework import viewsets, status
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
 from rest_framework.response import Response
+from django.db.models import Max, Q, Value
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse
+from accounts.serializers import UserSerializer
+from . import cache as catalog_cache
+from .cache import normalized_params
+from .conditional import conditional_response, make_etag
 from .models import Course
+from .pagination import CourseCatalogPagination
+from .search import CourseSearchFilter
 from .serializers import (
     CourseListSerializer,
     CourseDetailSerializer,
     CourseCreateSerializer,
-    CourseUpdateSerializer
+    CourseUpdateSerializer,
+    embedded_lectures_prefetch,
+    parse_lectures_after
 )
 
 
@@ -29,12 +38,18 @@ class IsInstructorOrReadOnly(IsAuthenticatedOrReadOnly):
 class CourseViewSet(viewsets.ModelViewSet):
     """강의 CRUD API"""
 
-    queryset = Course.objects.select_related('instructor').prefetch_related('lectures')
+    queryset = Course.objects.select_related('instructor')
     permission_classes = [IsInstructorOrReadOnly]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    filterset_fields = ['instructor', 'is_published']
+    pagination_class = CourseCatalogPagination
+    # CourseSearchFilter는 관련도 정렬을 위해 OrderingFilter 뒤에 위치
+    filter_backends = [DjangoFilterBackend, OrderingFilter, CourseSearchFilter]
+    filterset_fields = {
+        'instructor': ['exact'],
+        'is_published': ['exact'],
+        'comments_count': ['gte'],
+    }
     search_fields = ['title', 'description', 'instructor__username']
-    ordering_fields = ['created_at', 'lectures_count', 'total_duration']
+    ordering_fields = ['created_at', 'lectures_count', 'total_duration', 'comments_count']
     ordering = ['-created_at']
 
     def get_serializer_class(self):
@@ -49,41 +64,125 @@ class CourseViewSet(viewsets.ModelViewSet):
             return CourseUpdateSerializer
         return CourseListSerializer
 
+    def get_list_fields(self):
+        """목록 조회 시 SELECT할 컬럼 (CourseListSerializer 출력 필드만)"""
+        course_fields = [
+            name for name in CourseListSerializer.Meta.fields
+            if name != 'instructor'
+        ]
+        instructor_fields = [
+            f'instructor__{name}' for name in UserSerializer.Meta.fields
+        ]
+        return course_fields + instructor_fields
+
+    def get_visibility_filter(self):
+        """공개 강의만 (강사 본인은 자신의 비공개 강의도 볼 수 있음)
+
+        SQLite는 WHERE "is_published" 처럼 불리언 컬럼만 쓴 조건에는 인덱스를 쓰지 않으므로
+        "is_published" = 1 비교로 생성되도록 값을 Value로 감쌉니다.
+        """
+        visible = Q(is_published=Value(True))
+        if self.request.user.is_authenticated:
+            visible |= Q(instructor=self.request.user)
+        return visible
+
     def get_queryset(self):
         """쿼리셋 최적화"""
         queryset = super().get_queryset()
 
-        # 공개 강의만 (강사 본인은 자신의 비공개 강의도 볼 수 있음)
-        if self.request.user.is_authenticated:
-            queryset = queryset.filter(
-                is_published=True
-            ) | queryset.filter(
-                instructor=self.request.user
+        # 단일 조건으로 조회하므로 중복 행이 생기지 않아 DISTINCT가 필요 없음
+        queryset = queryset.filter(self.get_visibility_filter())
+
+        if self.action == 'list':
+            # 목록은 레슨을 사용하지 않으므로 필요한 컬럼만 조회
+            queryset = queryset.only(*self.get_list_fields())
+        elif self.action == 'retrieve':
+            queryset = queryset.prefetch_related(
+                embedded_lectures_prefetch(after=parse_lectures_after(self.request))
             )
-        else:
-            queryset = queryset.filter(is_published=True)
 
-        return queryset.distinct()
+        return queryset
 
     @extend_schema(
         summary='강의 목록 조회',
-        description='공개된 강의 목록을 조회합니다. 검색, 필터링, 정렬이 가능합니다.',
+        description='공개된 강의 목록을 조회합니다. 검색, 필터링, 정렬이 가능합니다. 검색 시 ordering이 없으면 관련도 순으로 정렬됩니다.',
         parameters=[
-            OpenApiParameter(name='search', description='검색어 (제목, 설명, 강사명)', type=str),
+            OpenApiParameter(name='search', description='검색어 (제목, 설명, 강사명 / 단어 접두어 일치)', type=str),
             OpenApiParameter(name='instructor', description='강사 ID', type=int),
             OpenApiParameter(name='is_published', description='공개 여부', type=bool),
-            OpenApiParameter(name='ordering', description='정렬 (-created_at, lectures_count 등)', type=str),
+            OpenApiParameter(name='comments_count__gte', description='최소 댓글 수', type=int),
+            OpenApiParameter(name='ordering', description='정렬 (-created_at, lectures_count, comments_count 등)', type=str),
+            OpenApiParameter(name='cursor', description='커서 페이지네이션 (첫 페이지는 빈 값, 이후 next/previous 링크 사용, count 미포함)', type=str),
         ]
     )
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        if not catalog_cache.is_cacheable(request):
+            return super().list(request, *args, **kwargs)
+
+        return catalog_cache.cached_response(
+            lambda: catalog_cache.list_cache_key(request),
+            lambda: super(CourseViewSet, self).list(request, *args, **kwargs)
+        )
 
     @extend_schema(
         summary='강의 상세 조회',
-        description='강의의 상세 정보와 레슨 목록을 조회합니다.'
+        description='강의의 상세 정보와 레슨 목록을 조회합니다. 레슨은 최대 100개까지 포함되며 나머지는 lectures_next 링크로 조회합니다.',
+        parameters=[
+            OpenApiParameter(name='lectures_after', description='이 순서(order) 이후의 레슨부터 포함', type=int),
+        ]
     )
     def retrieve(self, request, *args, **kwargs):
-        return super().retrieve(request, *args, **kwargs)
+        etag = self.get_detail_etag()
+        if etag is None:
+            return self.render_detail(request, *args, **kwargs)
+
+        return conditional_response(
+            request,
+            etag,
+            None,
+            lambda: self.render_detail(request, *args, **kwargs)
+        )
+
+    def get_detail_etag(self):
+        """강의 상세 응답의 ETag
+
+        직렬화 전에 강의, 강사, 레슨의 updated_at 집계 쿼리 한 번으로 계산합니다.
+        레슨 삭제와 F() 카운터 갱신은 updated_at에 나타나지 않으므로(삭제 후에는 max가 되돌아갈 수도 있음)
+        레슨 수/총 재생시간/댓글 수를 ETag에 포함하고, Last-Modified는 보내지 않습니다.
+        """
+        try:
+            row = (
+                Course.objects
+                .filter(self.get_visibility_filter(), pk=self.kwargs[self.lookup_field])
+                .annotate(lectures_updated_at=Max('lectures__updated_at'))
+                .values(
+                    'id', 'updated_at', 'lectures_count', 'total_duration',
+                    'comments_count', 'instructor__updated_at', 'lectures_updated_at'
+                )
+                .first()
+            )
+        except (TypeError, ValueError):
+            return None
+
+        if row is None:
+            return None
+
+        return make_etag('course', normalized_params(self.request), *row.values())
+
+    def render_detail(self, request, *args, **kwargs):
+        """강의 상세 응답 (익명 요청은 응답 캐시 사용)"""
+        try:
+            # /courses/01/ 과 /courses/1/ 이 같은 키(무효화 대상)를 쓰도록 정수로 정규화
+            course_id = int(kwargs[self.lookup_field])
+        except (TypeError, ValueError):
+            course_id = None
+        if course_id is None or not catalog_cache.is_cacheable(request):
+            return super().retrieve(request, *args, **kwargs)
+
+        return catalog_cache.cached_response(
+            lambda: catalog_cache.detail_cache_key(request, course_id),
+            lambda: super(CourseViewSet, self).retrieve(request, *args, **kwargs)
+        )
 
     @extend_schema(
         summary='강의 생성',
@@ -8,7 +8,8 @@ class LectureAdmin(admin.ModelAdmin):
 
     list_display = [
         'title', 'course', 'content_type',
-        'order', 'duration_display', 'created_at'
+        'order', 'duration_display', 'comments_count',
+        'unanswered_count', 'created_at'
     ]
     list_filter = ['content_type', 'course', 'created_at']
     search_fields = ['title', 'content_text', 'course__title']
@@ -18,10 +19,11 @@ class LectureAdmin(admin.ModelAdmin):
         ('기본 정보', {'fields': ('course', 'title', 'content_type', 'order')}),
         ('콘텐츠', {'fields': ('content_text', 'video_url', 'media_file')}),
         ('메타데이터', {'fields': ('duration',)}),
+        ('통계', {'fields': ('comments_count', 'unanswered_count')}),
         ('일시', {'fields': ('created_at', 'updated_at')}),
     )
 
-    readonly_fields = ['created_at', 'updated_at']
+    readonly_fields = ['comments_count', 'unanswered_count', 'created_at', 'updated_at']
 
     def duration_display(self, obj):
         """재생시간 표시 (분:초)"""
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from lectures.models import Lecture
+from lectures.search import rebuild_index
+
+
+class Command(BaseCommand):
+    """레슨 n-gram 검색 색인 재구축"""
+
+    help = '레슨 제목/본문의 n-gram 검색 색인을 다시 생성합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--course',
+            type=int,
+            action='append',
+            dest='course_ids',
+            help='재구축할 강의 ID (여러 번 지정 가능, 생략 시 전체)',
+        )
+
+    def handle(self, *args, **options):
+        queryset = Lecture.objects.all()
+        if options['course_ids']:
+            queryset = queryset.filter(course_id__in=options['course_ids'])
+
+        total = rebuild_index(queryset)
+        self.stdout.write(self.style.SUCCESS(f'{total}개 레슨의 검색 색인을 재구축했습니다.'))
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.1 on 2026-10-18 03:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0003_course_search'),
+        ('lectures', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LectureNgram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field', models.CharField(choices=[('title', '제목'), ('content', '본문')], max_length=10, verbose_name='필드')),
+                ('gram', models.CharField(max_length=4, verbose_name='n-gram')),
+                ('count', models.PositiveIntegerField(default=1, verbose_name='출현 횟수')),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='courses.course', verbose_name='강의')),
+                ('lecture', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ngrams', to='lectures.lecture', verbose_name='레슨')),
+            ],
+            options={
+                'verbose_name': '레슨 검색 색인',
+                'verbose_name_plural': '레슨 검색 색인 목록',
+                'db_table': 'lecture_ngrams',
+                'indexes': [models.Index(fields=['gram', 'course'], name='lecture_ngr_gram_608a76_idx')],
+                'unique_together': {('lecture', 'field', 'gram')},
+            },
+        ),
+    ]
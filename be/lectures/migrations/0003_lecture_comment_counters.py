@@ -0,0 +1,62 @@
+# Generated by Django 5.0.1 on 2026-10-18 03:11
+
+from django.db import migrations, models
+from django.db.models import Count, Exists, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def _count_subquery(queryset, group_field):
+    return Coalesce(
+        Subquery(
+            queryset.order_by().values(group_field).annotate(count=Count('id')).values('count'),
+            output_field=IntegerField()
+        ),
+        Value(0)
+    )
+
+
+def backfill_comment_counters(apps, schema_editor):
+    """기존 댓글로 레슨/강의 댓글 통계 초기화"""
+    Comment = apps.get_model('comments', 'Comment')
+    Lecture = apps.get_model('lectures', 'Lecture')
+    Course = apps.get_model('courses', 'Course')
+
+    has_replies = Comment.objects.filter(parent=OuterRef('pk'))
+    Lecture.objects.update(
+        comments_count=_count_subquery(
+            Comment.objects.filter(lecture=OuterRef('pk')), 'lecture'
+        ),
+        unanswered_count=_count_subquery(
+            Comment.objects.filter(lecture=OuterRef('pk'), parent=None)
+            .exclude(Exists(has_replies)),
+            'lecture'
+        ),
+    )
+    Course.objects.update(
+        comments_count=_count_subquery(
+            Comment.objects.filter(lecture__course=OuterRef('pk')), 'lecture__course'
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lectures', '0002_lecture_ngram_index'),
+        ('courses', '0004_course_comments_count'),
+        ('comments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lecture',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='댓글 수'),
+        ),
+        migrations.AddField(
+            model_name='lecture',
+            name='unanswered_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='미답변 질문 수'),
+        ),
+        migrations.RunPython(backfill_comment_counters, migrations.RunPython.noop),
+    ]
@@ -41,6 +41,10 @@ class Lecture(models.Model):
     order = models.PositiveIntegerField('순서', default=0)
     duration = models.PositiveIntegerField('재생시간(초)', default=0)
 
+    # 통계
+    comments_count = models.PositiveIntegerField('댓글 수', default=0)
+    unanswered_count = models.PositiveIntegerField('미답변 질문 수', default=0)
+
     # 타임스탬프
     created_at = models.DateTimeField('생성일', auto_now_add=True)
     updated_at = models.DateTimeField('수정일', auto_now=True)
@@ -75,3 +79,44 @@ class Lecture(models.Model):
 
         if self.content_type in ['video', 'file'] and not self.media_file:
             raise ValidationError({'media_file': '미디어 파일은 필수입니다.'})
+
+
+class LectureNgram(models.Model):
+    """레슨 검색용 n-gram 역색인
+
+    제목과 본문을 단어별 문자 bigram으로 나누어 (레슨, 필드, gram)마다 출현 횟수를 저장합니다.
+    띄어쓰기 단위로 조사가 붙는 한국어도 부분 문자열로 검색할 수 있습니다.
+    """
+
+    FIELD_CHOICES = [
+        ('title', '제목'),
+        ('content', '본문'),
+    ]
+
+    lecture = models.ForeignKey(
+        Lecture,
+        on_delete=models.CASCADE,
+        related_name='ngrams',
+        verbose_name='레슨'
+    )
+    course = models.ForeignKey(
+        'courses.Course',
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='강의'
+    )
+    field = models.CharField('필드', max_length=10, choices=FIELD_CHOICES)
+    gram = models.CharField('n-gram', max_length=4)
+    count = models.PositiveIntegerField('출현 횟수', default=1)
+
+    class Meta:
+        db_table = 'lecture_ngrams'
+        verbose_name = '레슨 검색 색인'
+        verbose_name_plural = '레슨 검색 색인 목록'
+        indexes = [
+            models.Index(fields=['gram', 'course']),
+        ]
+        unique_together = [['lecture', 'field', 'gram']]
+
+    def __str__(self):
+        return f'{self.lecture_id} {self.field}:{self.gram}'
@@ -0,0 +1,238 @@
+import re
+from collections import Counter
+from django.db import transaction
+from django.db.models import Case, Count, F, IntegerField, Q, Sum, Value, When
+from django.db.models.functions import Greatest, Lower, StrIndex, Substr
+from rest_framework.filters import SearchFilter
+from .models import Lecture, LectureNgram
+
+NGRAM_SIZE = 2
+TITLE_WEIGHT = 5
+MAX_QUERY_TOKENS = 10
+MAX_CANDIDATES = 1000
+CANDIDATE_BATCH_SIZE = 200
+SNIPPET_BEFORE = 40
+SNIPPET_LENGTH = 160
+
+
+def tokenize(text):
+    """소문자 변환 후 단어 단위로 분리"""
+    return re.findall(r'\w+', (text or '').lower())
+
+
+def word_ngrams(word):
+    """단어의 문자 bigram (두 글자 단어는 그대로, 한 글자 단어는 색인하지 않고 부분 문자열로 확인)"""
+    if len(word) < NGRAM_SIZE:
+        return []
+    if len(word) == NGRAM_SIZE:
+        return [word]
+    return [word[i:i + NGRAM_SIZE] for i in range(len(word) - NGRAM_SIZE + 1)]
+
+
+def text_ngrams(text):
+    """텍스트의 n-gram 출현 횟수"""
+    counter = Counter()
+    for word in tokenize(text):
+        counter.update(word_ngrams(word))
+    return counter
+
+
+def query_ngrams(query):
+    """검색어의 (단어 목록, 중복 제거된 n-gram 목록)"""
+    words = tokenize(query)[:MAX_QUERY_TOKENS]
+    grams = []
+    for word in words:
+        for gram in word_ngrams(word):
+            if gram not in grams:
+                grams.append(gram)
+    return words, grams
+
+
+def lecture_ngrams(lecture):
+    """레슨의 {(필드, gram): 횟수}"""
+    grams = {}
+    for field, text in (('title', lecture.title), ('content', lecture.content_text)):
+        for gram, count in text_ngrams(text).items():
+            grams[(field, gram)] = count
+    return grams
+
+
+def index_lecture(lecture):
+    """레슨 색인 증분 갱신
+
+    저장된 색인과 비교하여 사라진 gram은 삭제하고, 횟수가 바뀐 gram은 수정하고,
+    새 gram만 추가하므로 일부만 수정된 본문은 변경분만 기록됩니다.
+    """
+    new = lecture_ngrams(lecture)
+    existing = {
+        (row.field, row.gram): row
+        for row in LectureNgram.objects.filter(lecture=lecture).only('id', 'field', 'gram', 'count', 'course_id')
+    }
+
+    removed = [row.id for key, row in existing.items() if key not in new]
+    changed = []
+    for key, row in existing.items():
+        if key in new and (row.count != new[key] or row.course_id != lecture.course_id):
+            row.count = new[key]
+            row.course_id = lecture.course_id
+            changed.append(row)
+    added = [
+        LectureNgram(
+            lecture=lecture,
+            course_id=lecture.course_id,
+            field=field,
+            gram=gram,
+            count=count
+        )
+        for (field, gram), count in new.items()
+        if (field, gram) not in existing
+    ]
+
+    with transaction.atomic():
+        if removed:
+            LectureNgram.objects.filter(id__in=removed).delete()
+        if changed:
+            LectureNgram.objects.bulk_update(changed, ['count', 'course'], batch_size=500)
+        if added:
+            LectureNgram.objects.bulk_create(added, batch_size=500)
+
+
+def rebuild_index(queryset=None, batch_size=200):
+    """레슨 색인 전체 재구축"""
+    queryset = queryset if queryset is not None else Lecture.objects.all()
+    total = 0
+    for lecture in queryset.only('id', 'course_id', 'title', 'content_text').iterator(chunk_size=batch_size):
+        with transaction.atomic():
+            LectureNgram.objects.filter(lecture=lecture).delete()
+            LectureNgram.objects.bulk_create([
+                LectureNgram(
+                    lecture=lecture,
+                    course_id=lecture.course_id,
+                    field=field,
+                    gram=gram,
+                    count=count
+                )
+                for (field, gram), count in lecture_ngrams(lecture).items()
+            ], batch_size=500)
+        total += 1
+    return total
+
+
+def candidate_scores(grams, course_id=None, lectures=None):
+    """모든 gram을 포함하는 레슨의 (레슨 ID, 점수) 쿼리셋 (점수 내림차순)
+
+    lectures(레슨 쿼리셋)가 주어지면 그 안의 레슨만 후보로 삼으므로
+    비공개 강의의 레슨이 후보 상한을 차지하지 않습니다.
+    """
+    rows = LectureNgram.objects.filter(gram__in=grams)
+    if course_id is not None:
+        rows = rows.filter(course_id=course_id)
+    if lectures is not None:
+        rows = rows.filter(lecture__in=lectures.values('pk'))
+
+    return (
+        rows.values('lecture')
+        .annotate(
+            matched=Count('gram', distinct=True),
+            score=Sum(Case(
+                When(field='title', then=F('count') * TITLE_WEIGHT),
+                default=F('count'),
+                output_field=IntegerField()
+            ))
+        )
+        .filter(matched=len(grams))
+        .order_by('-score', 'lecture')
+    )
+
+
+def words_filter(words):
+    """bigram 후보를 실제 부분 문자열 포함 여부로 확정하는 조건"""
+    condition = Q()
+    for word in words:
+        condition &= Q(title__icontains=word) | Q(content_text__icontains=word)
+    return condition
+
+
+def search_lectures(query, queryset=None, course_id=None, limit=20):
+    """n-gram 색인으로 레슨 검색
+
+    관련도(제목 가중 출현 횟수) 순으로 정렬된 레슨 목록을 반환하며,
+    각 레슨에는 score와 본문 발췌(snippet)가 붙습니다. 본문 전체는 읽지 않습니다.
+    점수 상위 MAX_CANDIDATES개 후보를 CANDIDATE_BATCH_SIZE개씩 확인하며 limit개가 확정되면 멈춥니다.
+    """
+    words, grams = query_ngrams(query)
+    if not words:
+        return []
+
+    anchor = max(words, key=len)
+    position = StrIndex(Lower('content_text'), Value(anchor))
+    queryset = queryset if queryset is not None else Lecture.objects.all()
+    if course_id is not None:
+        queryset = queryset.filter(course_id=course_id)
+    lectures = (
+        queryset
+        .filter(words_filter(words))
+        .annotate(
+            snippet=Substr(
+                'content_text',
+                Greatest(position - SNIPPET_BEFORE, Value(1)),
+                SNIPPET_LENGTH
+            )
+        )
+        .only('id', 'course_id', 'title', 'content_type', 'order', 'duration')
+    )
+
+    if not grams:
+        # 한 글자 검색어만 있으면 색인을 쓸 수 없으므로 부분 문자열로만 확인
+        results = list(lectures.order_by('pk')[:limit])
+        for lecture in results:
+            lecture.score = 0
+        return results
+
+    # 집계는 한 번만 실행하고, 흔한 단어라도 점수 상위 MAX_CANDIDATES개까지만 확인
+    candidates = list(candidate_scores(grams, course_id, queryset)[:MAX_CANDIDATES])
+    results = []
+    for start in range(0, len(candidates), CANDIDATE_BATCH_SIZE):
+        scores = {
+            row['lecture']: row['score']
+            for row in candidates[start:start + CANDIDATE_BATCH_SIZE]
+        }
+        for lecture in lectures.filter(pk__in=list(scores)):
+            lecture.score = scores[lecture.pk]
+            results.append(lecture)
+        if len(results) >= limit:
+            break
+
+    # 앞 묶음의 후보는 모두 뒤 묶음보다 점수가 높으므로 정렬 후 limit개가 전체 상위 결과
+    return sorted(results, key=lambda lecture: (-lecture.score, lecture.pk))[:limit]
+
+
+class LectureNgramSearchFilter(SearchFilter):
+    """n-gram 색인 기반 레슨 검색 필터
+
+    전체 본문에 icontains를 실행하는 대신 색인으로 후보 레슨을 좁힌 뒤
+    후보에 한해서만 부분 문자열을 확인합니다.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        if not search_terms:
+            return queryset
+
+        words, grams = query_ngrams(' '.join(search_terms))
+        if not words:
+            # 특수문자만 입력한 경우
+            return queryset.none()
+        if not grams:
+            # 한 글자 검색어만 있으면 부분 문자열로만 확인
+            return queryset.filter(words_filter(words))
+
+        # 이미 좁혀진 목록(강의 필터 등)의 레슨만 집계하고, 강의가 정해졌으면 (gram, course) 색인 사용
+        candidates = candidate_scores(grams, self.get_course_id(request), queryset).values('lecture')
+        return queryset.filter(pk__in=candidates).filter(words_filter(words))
+
+    def get_course_id(self, request):
+        try:
+            return int(request.query_params['course'])
+        except (KeyError, ValueError):
+            return None
@@ -1,6 +1,9 @@
 from rest_framework import serializers
+from django.db import transaction
 from .models import Lecture
 from courses.serializers import CourseListSerializer
+from courses.stats import apply_lecture_delta
+from media_files.signing import build_stream_url
 
 
 class LectureListSerializer(serializers.ModelSerializer):
@@ -10,24 +13,39 @@ class LectureListSerializer(serializers.ModelSerializer):
         model = Lecture
         fields = [
             'id', 'course', 'title', 'content_type',
-            'order', 'duration', 'created_at'
+            'order', 'duration', 'comments_count',
+            'unanswered_count', 'created_at'
         ]
-        read_only_fields = ['id', 'created_at']
+        read_only_fields = ['id', 'comments_count', 'unanswered_count', 'created_at']
 
 
 class LectureDetailSerializer(serializers.ModelSerializer):
     """레슨 상세 Serializer"""
 
     course = CourseListSerializer(read_only=True)
+    stream_url = serializers.SerializerMethodField()
 
     class Meta:
         model = Lecture
         fields = [
             'id', 'course', 'title', 'content_type',
-            'content_text', 'video_url', 'media_file',
-            'order', 'duration', 'created_at', 'updated_at'
+            'content_text', 'video_url', 'media_file', 'stream_url',
+            'order', 'duration', 'comments_count', 'unanswered_count',
+            'created_at', 'updated_at'
+        ]
+        read_only_fields = [
+            'id', 'comments_count', 'unanswered_count',
+            'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+
+    def get_stream_url(self, obj):
+        """업로드된 비디오의 서명된 스트리밍 URL (공개 강의 또는 강사 본인에게만 발급)"""
+        request = self.context.get('request')
+        if obj.content_type != 'video' or not obj.media_file_id or request is None:
+            return None
+        if not obj.course.is_published and obj.course.instructor_id != request.user.pk:
+            return None
+        return build_stream_url(request, obj.media_file_id)
 
 
 class LectureCreateSerializer(serializers.ModelSerializer):
@@ -66,19 +84,24 @@ class LectureCreateSerializer(serializers.ModelSerializer):
                 'media_file': '미디어 파일은 필수입니다.'
             })
 
+        # 재생시간을 입력하지 않았으면 비디오에서 읽은 재생시간 사용
+        media_file = attrs.get('media_file')
+        if media_file and media_file.duration and not attrs.get('duration'):
+            attrs['duration'] = round(media_file.duration)
+
         return attrs
 
     def create(self, validated_data):
         """레슨 생성"""
-        lecture = super().create(validated_data)
+        with transaction.atomic():
+            lecture = super().create(validated_data)
 
-        # 강의의 레슨 수 업데이트
-        course = lecture.course
-        course.lectures_count = course.lectures.count()
-        course.total_duration = sum(
-            lec.duration for lec in course.lectures.all()
-        )
-        course.save()
+            # 강의의 레슨 수 / 총 재생시간 증분 반영
+            apply_lecture_delta(
+                lecture.course_id,
+                count_delta=1,
+                duration_delta=lecture.duration
+            )
 
         return lecture
 
@@ -129,17 +152,42 @@ class LectureUpdateSerializer(serializers.ModelSerializer):
                     'media_file': '미디어 파일은 필수입니다.'
                 })
 
+        # 미디어 파일을 바꾸면서 재생시간을 입력하지 않았으면 비디오에서 읽은 재생시간 사용
+        media_file = attrs.get('media_file')
+        if media_file and media_file.duration and 'duration' not in attrs:
+            attrs['duration'] = round(media_file.duration)
+
         return attrs
 
     def update(self, instance, validated_data):
         """레슨 수정"""
-        lecture = super().update(instance, validated_data)
-
-        # 강의의 총 재생시간 업데이트
-        course = lecture.course
-        course.total_duration = sum(
-            lec.duration for lec in course.lectures.all()
-        )
-        course.save()
+        with transaction.atomic():
+            # 동시 수정이 같은 이전 값으로 증분을 계산하지 않도록 잠근 행에서 다시 읽음
+            old_duration = (
+                Lecture.objects.select_for_update()
+                .values_list('duration', flat=True).get(pk=instance.pk)
+            )
+            lecture = super().update(instance, validated_data)
+
+            # 강의의 총 재생시간 증분 반영
+            apply_lecture_delta(
+                lecture.course_id,
+                duration_delta=lecture.duration - old_duration
+            )
 
         return lecture
+
+
+class LectureSearchResultSerializer(serializers.ModelSerializer):
+    """레슨 검색 결과 Serializer (관련도, 본문 발췌 포함)"""
+
+    score = serializers.IntegerField(read_only=True)
+    snippet = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = Lecture
+        fields = [
+            'id', 'course', 'title', 'content_type',
+            'order', 'duration', 'score', 'snippet'
+        ]
+        read_only_fields = fields
@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from courses.cache import invalidate_courses
+from .models import Lecture
+from .search import index_lecture
+
+NGRAM_INDEXED_FIELDS = {'title', 'content_text', 'course'}
+
+
+@receiver(post_save, sender=Lecture)
+def index_lecture_on_save(sender, instance, update_fields=None, **kwargs):
+    """레슨 저장 시 n-gram 색인 갱신"""
+    if update_fields is not None and not NGRAM_INDEXED_FIELDS & set(update_fields):
+        return
+    index_lecture(instance)
+
+
+@receiver(post_save, sender=Lecture)
+@receiver(post_delete, sender=Lecture)
+def invalidate_course_cache(sender, instance, **kwargs):
+    """레슨 변경 시 소속 강의의 캐시 무효화"""
+    invalidate_courses([instance.course_id])
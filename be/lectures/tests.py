@@ -1,3 +1,238 @@
-from django.test import TestCase
+import io
+from unittest import mock
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from accounts.models import User
+from comments.models import Comment
+from courses.models import Course
+from . import search
+from .models import Lecture, LectureNgram
+from .serializers import LectureUpdateSerializer
+from .views import LectureViewSet
 
-# Create your tests here.
+
+class LectureUpdateDurationTest(TestCase):
+    """레슨 수정 시 강의 총 재생시간 증분 반영"""
+
+    def setUp(self):
+        instructor = User.objects.create_user(username='instructor', email='i@example.com', password='pw12345!x')
+        self.course = Course.objects.create(
+            instructor=instructor, title='재생시간', description='총 재생시간 테스트 강의', total_duration=10
+        )
+        self.lecture = Lecture.objects.create(
+            course=self.course, title='레슨 1', content_type='text', content_text='본문', order=1, duration=10
+        )
+
+    def update_duration(self, lecture, duration):
+        serializer = LectureUpdateSerializer(lecture, data={'duration': duration}, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+    def test_stale_instance_uses_current_duration(self):
+        """먼저 끝난 수정을 모르는 인스턴스로 수정해도 총 재생시간이 어긋나지 않음"""
+        first = Lecture.objects.get(pk=self.lecture.pk)
+        second = Lecture.objects.get(pk=self.lecture.pk)
+
+        self.update_duration(first, 20)
+        self.update_duration(second, 30)
+
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.total_duration, 30)
+
+    def test_delete_uses_current_row(self):
+        """삭제 직전에 다른 요청이 바꾼 재생시간/댓글 수를 기준으로 통계 감소"""
+        stale = Lecture.objects.select_related('course').get(pk=self.lecture.pk)
+        Lecture.objects.filter(pk=self.lecture.pk).update(duration=25, comments_count=2)
+        Course.objects.filter(pk=self.course.pk).update(lectures_count=1, total_duration=25, comments_count=2)
+
+        client = APIClient()
+        client.force_authenticate(self.course.instructor)
+        with mock.patch.object(LectureViewSet, 'get_object', return_value=stale):
+            self.assertEqual(client.delete(f'/api/lectures/{self.lecture.pk}/').status_code, 204)
+
+        self.course.refresh_from_db()
+        self.assertEqual(
+            (self.course.lectures_count, self.course.total_duration, self.course.comments_count),
+            (0, 0, 0)
+        )
+
+
+class RecomputeCourseStatsTest(TestCase):
+    """recompute_course_stats: 어긋난 레슨 통계 복구"""
+
+    def setUp(self):
+        instructor = User.objects.create_user(username='instructor', email='i@example.com', password='pw12345!x')
+        self.courses = [
+            Course.objects.create(instructor=instructor, title=f'강의 {i}', description='통계 재계산 테스트')
+            for i in range(2)
+        ]
+        Lecture.objects.bulk_create([
+            Lecture(course=self.courses[0], title=f'레슨 {order}', content_type='text', order=order, duration=order * 10)
+            for order in range(1, 4)
+        ])
+
+    def stats(self):
+        return list(Course.objects.order_by('pk').values_list('lectures_count', 'total_duration'))
+
+    def test_restores_corrupted_counters(self):
+        Course.objects.filter(pk=self.courses[0].pk).update(lectures_count=7, total_duration=5)
+        Course.objects.filter(pk=self.courses[1].pk).update(lectures_count=2, total_duration=0)
+
+        out = io.StringIO()
+        call_command('recompute_course_stats', '--check', stdout=out)
+        self.assertIn('2개', out.getvalue())
+        self.assertEqual(self.stats(), [(7, 5), (2, 0)])
+
+        call_command('recompute_course_stats', stdout=io.StringIO())
+        self.assertEqual(self.stats(), [(3, 60), (0, 0)])
+
+    def test_limited_to_given_course(self):
+        Course.objects.update(lectures_count=9, total_duration=9)
+        call_command('recompute_course_stats', '--course', str(self.courses[1].pk), stdout=io.StringIO())
+        self.assertEqual(self.stats(), [(9, 9), (0, 0)])
+
+
+class LectureConditionalGetTest(TestCase):
+    """레슨 상세 조건부 GET (ETag만 사용)"""
+
+    def setUp(self):
+        instructor = User.objects.create_user(username='instructor', email='i@example.com', password='pw12345!x')
+        self.student = User.objects.create_user(username='student', email='s@example.com', password='pw12345!x')
+        course = Course.objects.create(
+            instructor=instructor, title='조건부 요청', description='ETag 테스트용 강의', is_published=True
+        )
+        self.lecture = Lecture.objects.create(
+            course=course, title='레슨 1', content_type='text', content_text='본문', order=1
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+        self.url = f'/api/lectures/{self.lecture.pk}/'
+
+    def get_etag(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Last-Modified', response)
+        return response['ETag']
+
+    def test_matching_etag_returns_304(self):
+        etag = self.get_etag()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_comment_delete_changes_etag(self):
+        self.client.post('/api/comments/', {'lecture': self.lecture.pk, 'content': '질문'})
+        etag = self.get_etag()
+        comment = Comment.objects.get()
+        self.assertEqual(self.client.delete(f'/api/comments/{comment.pk}/').status_code, 204)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_counter_change_changes_etag(self):
+        """답변이 달리면 레슨 updated_at은 그대로지만 unanswered_count가 바뀜"""
+        self.client.post('/api/comments/', {'lecture': self.lecture.pk, 'content': '질문'})
+        etag = self.get_etag()
+        response = self.client.post(
+            '/api/comments/', {'lecture': self.lecture.pk, 'parent': Comment.objects.get().pk, 'content': '답변'}
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class NgramTokenizerTest(SimpleTestCase):
+    """검색어/본문의 n-gram 분리"""
+
+    def test_word_ngrams(self):
+        self.assertEqual(search.word_ngrams('장고'), ['장고'])
+        self.assertEqual(search.word_ngrams('파이썬'), ['파이', '이썬'])
+        self.assertEqual(search.word_ngrams('a'), [])
+
+    def test_text_ngrams_counts_per_word(self):
+        """단어 경계를 넘는 gram은 만들지 않음"""
+        self.assertEqual(search.text_ngrams('Django 장고, 장고!'), {
+            'dj': 1, 'ja': 1, 'an': 1, 'ng': 1, 'go': 1, '장고': 2
+        })
+
+    def test_query_ngrams(self):
+        words, grams = search.query_ngrams('파이썬 파이 !!')
+        self.assertEqual(words, ['파이썬', '파이'])
+        self.assertEqual(grams, ['파이', '이썬'])
+        self.assertEqual(search.query_ngrams('!!'), ([], []))
+
+
+class LectureNgramSearchTest(TestCase):
+    """레슨 n-gram 색인 동기화와 검색"""
+
+    def setUp(self):
+        instructor = User.objects.create_user(username='instructor', email='i@example.com', password='pw12345!x')
+        self.course = Course.objects.create(
+            instructor=instructor, title='검색 강의', description='n-gram 테스트', is_published=True
+        )
+        self.other_course = Course.objects.create(
+            instructor=instructor, title='다른 강의', description='n-gram 테스트', is_published=True
+        )
+        self.client = APIClient()
+
+    def create_lecture(self, title, content, course=None, order=1):
+        return Lecture.objects.create(
+            course=course or self.course, title=title, content_type='text', content_text=content, order=order
+        )
+
+    def indexed(self, lecture):
+        return set(LectureNgram.objects.filter(lecture=lecture).values_list('field', 'gram', 'count'))
+
+    def search(self, q, **params):
+        response = self.client.get('/api/lectures/search/', {'q': q, **params})
+        self.assertEqual(response.status_code, 200)
+        return [result['id'] for result in response.data['results']]
+
+    def test_index_follows_save_and_delete(self):
+        lecture = self.create_lecture('장고', '모델 모델')
+        self.assertEqual(self.indexed(lecture), {('title', '장고', 1), ('content', '모델', 2)})
+
+        lecture.content_text = '모델 뷰'
+        lecture.save()
+        # 한 글자 단어('뷰')는 색인하지 않음
+        self.assertEqual(self.indexed(lecture), {('title', '장고', 1), ('content', '모델', 1)})
+
+        lecture.course = self.other_course
+        lecture.save(update_fields=['course'])
+        self.assertEqual(set(LectureNgram.objects.filter(lecture=lecture).values_list('course_id', flat=True)), {self.other_course.pk})
+
+        lecture_id = lecture.pk
+        lecture.delete()
+        self.assertFalse(LectureNgram.objects.filter(lecture_id=lecture_id).exists())
+
+    def test_ranking_prefers_title_and_frequency(self):
+        in_content = self.create_lecture('소개', '파이썬 문법을 다룹니다.', order=1)
+        repeated = self.create_lecture('기초', '파이썬 파이썬 파이썬 예제', order=2)
+        in_title = self.create_lecture('파이썬 입문', '변수와 함수', order=3)
+        self.create_lecture('자바', '자바 문법', order=4)
+
+        self.assertEqual(self.search('파이썬'), [in_title.pk, repeated.pk, in_content.pk])
+        # bigram은 모두 있지만 단어는 없는 레슨은 제외 ('파이'+'이썬' 이 떨어져 있음)
+        self.create_lecture('함정', '파이 이썬', order=5)
+        self.assertEqual(len(self.search('파이썬')), 3)
+
+    def test_list_filter_scoped_to_course(self):
+        """강의로 좁힌 목록 검색은 그 강의의 색인만 집계"""
+        mine = self.create_lecture('장고 모델', '본문')
+        self.create_lecture('장고 뷰', '본문', course=self.other_course)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/lectures/', {'course': self.course.pk, 'search': '장고'})
+        self.assertEqual([lecture['id'] for lecture in response.data['results']], [mine.pk])
+
+        sql = next(query['sql'] for query in queries if 'lecture_ngrams' in query['sql'])
+        self.assertIn(f'"course_id" = {self.course.pk}', sql.split('"lecture_ngrams"', 1)[1])
+
+        self.assertEqual(self.client.get('/api/lectures/', {'search': '!!'}).data['results'], [])
+
+    def test_candidates_are_capped(self):
+        """흔한 단어도 점수 상위 MAX_CANDIDATES개 후보까지만 확인"""
+        for order in range(1, 6):
+            self.create_lecture(f'공통 {order}', '공통 단어', order=order)
+
+        with mock.patch.object(search, 'MAX_CANDIDATES', 3), mock.patch.object(search, 'CANDIDATE_BATCH_SIZE', 2):
+            results = search.search_lectures('공통', limit=10)
+        self.assertEqual(len(results), 3)
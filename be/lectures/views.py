@@ -1,15 +1,24 @@
 from rest_framework import viewsets, status
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
+from django.db import transaction
+from django.db.models import Q
+from django.http import Http404
 from drf_spectacular.utils import extend_schema, OpenApiParameter
+from courses.conditional import conditional_response, make_etag
+from courses.stats import apply_lecture_delta
+from media_files.signing import stream_expiry
 from .models import Lecture
+from .search import LectureNgramSearchFilter, search_lectures
 from .serializers import (
     LectureListSerializer,
     LectureDetailSerializer,
     LectureCreateSerializer,
-    LectureUpdateSerializer
+    LectureUpdateSerializer,
+    LectureSearchResultSerializer
 )
 
 
@@ -31,10 +40,15 @@ class LectureViewSet(viewsets.ModelViewSet):
 
     queryset = Lecture.objects.select_related('course', 'media_file')
     permission_classes = [IsCourseInstructorOrReadOnly]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    filterset_fields = ['course', 'content_type']
+    filter_backends = [DjangoFilterBackend, LectureNgramSearchFilter, OrderingFilter]
+    filterset_fields = {
+        'course': ['exact'],
+        'content_type': ['exact'],
+        'comments_count': ['gte'],
+        'unanswered_count': ['gte'],
+    }
     search_fields = ['title', 'content_text']
-    ordering_fields = ['order', 'created_at', 'duration']
+    ordering_fields = ['order', 'created_at', 'duration', 'comments_count', 'unanswered_count']
     ordering = ['course', 'order']
 
     def get_serializer_class(self):
@@ -56,7 +70,9 @@ class LectureViewSet(viewsets.ModelViewSet):
             OpenApiParameter(name='course', description='강의 ID', type=int),
             OpenApiParameter(name='content_type', description='콘텐츠 타입 (text/video/link/file)', type=str),
             OpenApiParameter(name='search', description='검색어 (제목, 내용)', type=str),
-            OpenApiParameter(name='ordering', description='정렬 (order, created_at, duration)', type=str),
+            OpenApiParameter(name='comments_count__gte', description='최소 댓글 수', type=int),
+            OpenApiParameter(name='unanswered_count__gte', description='최소 미답변 질문 수', type=int),
+            OpenApiParameter(name='ordering', description='정렬 (order, created_at, duration, comments_count, unanswered_count)', type=str),
         ]
     )
     def list(self, request, *args, **kwargs):
@@ -67,7 +83,44 @@ class LectureViewSet(viewsets.ModelViewSet):
         description='레슨의 상세 정보를 조회합니다.'
     )
     def retrieve(self, request, *args, **kwargs):
-        return super().retrieve(request, *args, **kwargs)
+        etag = self.get_detail_etag()
+        if etag is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        return conditional_response(
+            request,
+            etag,
+            None,
+            lambda: super(LectureViewSet, self).retrieve(request, *args, **kwargs)
+        )
+
+    def get_detail_etag(self):
+        """레슨 상세 응답의 ETag
+
+        레슨, 소속 강의, 강사의 updated_at을 직렬화 전에 한 번의 쿼리로 조회합니다.
+        댓글/강의 통계는 updated_at 없이 갱신되므로 ETag에 함께 포함하고, Last-Modified는 보내지 않습니다.
+        """
+        try:
+            row = (
+                Lecture.objects
+                .filter(pk=self.kwargs[self.lookup_field])
+                .values(
+                    'id', 'updated_at', 'media_file', 'comments_count', 'unanswered_count',
+                    'course__updated_at', 'course__lectures_count',
+                    'course__total_duration', 'course__comments_count',
+                    'course__instructor__updated_at'
+                )
+                .first()
+            )
+        except (TypeError, ValueError):
+            return None
+
+        if row is None:
+            return None
+
+        # 서명된 stream_url은 만료 구간과 사용자마다 달라지므로 ETag에 포함
+        stream = (stream_expiry(), self.request.user.pk) if row['media_file'] else ()
+        return make_etag('lecture', *row.values(), *stream)
 
     @extend_schema(
         summary='레슨 생성',
@@ -96,16 +149,66 @@ class LectureViewSet(viewsets.ModelViewSet):
     )
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
-        course = instance.course
 
-        # 레슨 삭제
-        self.perform_destroy(instance)
-
-        # 강의의 통계 업데이트
-        course.lectures_count = course.lectures.count()
-        course.total_duration = sum(
-            lec.duration for lec in course.lectures.all()
-        )
-        course.save()
+        with transaction.atomic():
+            # 동시 수정/댓글 작성과 같은 이전 값으로 증분을 계산하지 않도록 잠근 행에서 다시 읽음
+            current = (
+                Lecture.objects.select_for_update()
+                .filter(pk=instance.pk)
+                .values('course_id', 'duration', 'comments_count')
+                .first()
+            )
+            if current is None:
+                raise Http404
+
+            # 레슨 삭제
+            self.perform_destroy(instance)
+
+            # 강의의 통계 증분 반영 (함께 삭제된 댓글 포함)
+            apply_lecture_delta(
+                current['course_id'],
+                count_delta=-1,
+                duration_delta=-current['duration'],
+                comments_delta=-current['comments_count']
+            )
 
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @extend_schema(
+        summary='레슨 검색',
+        description='레슨 제목과 본문을 n-gram 색인으로 검색하여 관련도 순으로 반환합니다. 공개 강의(및 본인 강의)의 레슨만 검색됩니다.',
+        parameters=[
+            OpenApiParameter(name='q', description='검색어', type=str, required=True),
+            OpenApiParameter(name='course', description='강의 ID (생략 시 전체 강의)', type=int),
+            OpenApiParameter(name='limit', description='최대 결과 수 (기본 20, 최대 100)', type=int),
+        ],
+        responses={200: LectureSearchResultSerializer(many=True)}
+    )
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """n-gram 색인 기반 레슨 검색"""
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response(
+                {'error': '검색어(q)를 입력해주세요.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            course_id = int(request.query_params['course']) if request.query_params.get('course') else None
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+        except ValueError:
+            return Response(
+                {'error': 'course와 limit은 정수여야 합니다.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # 공개 강의의 레슨만 (강사 본인은 자신의 비공개 강의 레슨도 검색 가능)
+        visible = Q(course__is_published=True)
+        if request.user.is_authenticated:
+            visible |= Q(course__instructor=request.user)
+        queryset = Lecture.objects.filter(visible)
+
+        lectures = search_lectures(query, queryset, course_id=course_id, limit=limit)
+        serializer = LectureSearchResultSerializer(lectures, many=True)
+        return Response({'query': query, 'results': serializer.data})
@@ -1,6 +1,8 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import MediaFile
+from .blobs import attach_upload, delete_media_file
+from .jobs import retry_jobs
+from .models import MediaBlob, MediaFile, ProcessingJob, UploadSession
 
 
 @admin.register(MediaFile)
@@ -9,23 +11,88 @@ class MediaFileAdmin(admin.ModelAdmin):
 
     list_display = [
         'original_filename', 'file_type', 'file_size_display',
-        'uploaded_by', 'uploaded_at'
+        'processing_status', 'uploaded_by', 'uploaded_at'
     ]
-    list_filter = ['file_type', 'uploaded_at']
+    list_filter = ['file_type', 'processing_status', 'uploaded_at']
     search_fields = ['original_filename', 'uploaded_by__username']
     ordering = ['-uploaded_at']
 
     fieldsets = (
         ('파일 정보', {'fields': ('file', 'file_type', 'original_filename')}),
         ('업로더', {'fields': ('uploaded_by',)}),
-        ('메타데이터', {'fields': ('file_size', 'mime_type')}),
+        ('메타데이터', {'fields': ('file_size', 'mime_type', 'content_hash', 'blob', 'processing_status')}),
+        ('비디오 정보', {'fields': ('duration', 'width', 'height', 'video_codec')}),
         ('일시', {'fields': ('uploaded_at',)}),
     )
 
-    readonly_fields = ['file_size', 'mime_type', 'original_filename', 'uploaded_at']
+    readonly_fields = [
+        'file_size', 'mime_type', 'content_hash', 'blob', 'processing_status',
+        'duration', 'width', 'height', 'video_codec', 'original_filename', 'uploaded_at'
+    ]
+
+    def save_model(self, request, obj, form, change):
+        """업로드된 파일은 blob으로 저장하여 같은 내용은 한 번만 저장하고 참조 수 관리"""
+        if 'file' in form.changed_data and form.cleaned_data.get('file'):
+            attach_upload(obj, form.cleaned_data['file'])
+        else:
+            super().save_model(request, obj, form, change)
+
+    def delete_model(self, request, obj):
+        """같은 내용을 참조하는 파일이 없을 때만 실제 파일 삭제"""
+        delete_media_file(obj)
+
+    def delete_queryset(self, request, queryset):
+        for obj in queryset:
+            delete_media_file(obj)
 
     def file_size_display(self, obj):
         """파일 크기 표시 (MB)"""
         size_mb = obj.file_size / (1024 * 1024)
         return f'{size_mb:.2f} MB'
     file_size_display.short_description = '파일 크기'
+
+
+@admin.register(UploadSession)
+class UploadSessionAdmin(admin.ModelAdmin):
+    """분할 업로드 세션 관리자 페이지"""
+
+    list_display = ['filename', 'uploaded_by', 'progress_display', 'media_file', 'updated_at']
+    search_fields = ['filename', 'uploaded_by__username']
+    ordering = ['-created_at']
+    readonly_fields = ['id', 'offset', 'media_file', 'created_at', 'updated_at']
+
+    def progress_display(self, obj):
+        """업로드 진행률"""
+        ratio = obj.offset / obj.file_size * 100 if obj.file_size else 0
+        return f'{ratio:.1f}%'
+    progress_display.short_description = '진행률'
+
+
+@admin.register(MediaBlob)
+class MediaBlobAdmin(admin.ModelAdmin):
+    """저장 파일(blob) 관리자 페이지"""
+
+    list_display = ['content_hash', 'mime_type', 'size', 'ref_count', 'created_at']
+    search_fields = ['content_hash']
+    ordering = ['-created_at']
+    readonly_fields = ['content_hash', 'file', 'size', 'mime_type', 'ref_count', 'created_at']
+
+
+@admin.register(ProcessingJob)
+class ProcessingJobAdmin(admin.ModelAdmin):
+    """미디어 후처리 작업 관리자 페이지"""
+
+    list_display = ['task', 'media_file', 'status', 'attempts', 'max_attempts', 'run_after', 'updated_at']
+    list_filter = ['status', 'task']
+    search_fields = ['media_file__original_filename']
+    ordering = ['-created_at']
+    readonly_fields = [
+        'media_file', 'task', 'status', 'attempts', 'locked_by', 'locked_until',
+        'last_error', 'created_at', 'updated_at'
+    ]
+    actions = ['retry_failed_jobs']
+
+    @admin.action(description='실패한 작업 다시 시도')
+    def retry_failed_jobs(self, request, queryset):
+        updated = retry_jobs(queryset)
+        self.message_user(request, f'{updated}개 작업을 다시 대기열에 넣었습니다.')
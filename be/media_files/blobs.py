@@ -0,0 +1,217 @@
+import hashlib
+import os
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from .jobs import enqueue_processing
+from .models import MediaBlob, MediaFile, get_file_type, media_blob_path
+from .sniffing import SNIFF_LENGTH, resolve_mime_type
+from .storage import delete_on_commit
+
+HASH_READ_SIZE = 64 * 1024
+
+
+def hash_file(file):
+    """파일 객체의 SHA-256 (처음부터 끝까지 읽은 뒤 위치를 되돌림)"""
+    digest = hashlib.sha256()
+    file.seek(0)
+    for chunk in iter(lambda: file.read(HASH_READ_SIZE), b''):
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def lock_blob(content_hash, size=None):
+    """해시(와 크기)가 일치하는 blob을 잠가서 조회 (없으면 None)"""
+    blobs = MediaBlob.objects.select_for_update().filter(content_hash=content_hash)
+    if size is not None:
+        blobs = blobs.filter(size=size)
+    return blobs.first()
+
+
+def add_reference(blob):
+    MediaBlob.objects.filter(pk=blob.pk).update(ref_count=F('ref_count') + 1)
+
+
+def acquire_blob(content_hash, size, ext, mime_type, save_content):
+    """해시에 해당하는 blob의 참조를 하나 늘려 반환
+
+    blob 행을 잠근 상태에서 파일이 없을 때만 save_content(name)로 내용을 기록하므로 같은 파일은 한 번만 저장됩니다.
+    참조가 0이 된 blob의 정리(collect_blob)도 같은 행 잠금을 잡으므로, 여기서 다시 참조한 파일은 삭제되지 않고
+    정리가 먼저 끝났으면 행이 없어진 것을 보고 새로 기록합니다.
+    호출하는 쪽의 트랜잭션 안에서 실행되어야 합니다.
+    """
+    blob = lock_blob(content_hash)
+    while blob is None:
+        blob, created = MediaBlob.objects.get_or_create(
+            content_hash=content_hash,
+            defaults={'file': media_blob_path(content_hash, ext), 'size': size, 'mime_type': mime_type}
+        )
+        if not created:
+            # 동시에 다른 요청이 만든 행은 잠근 뒤 사용 (그 사이 정리되었으면 다시 생성)
+            blob = lock_blob(content_hash)
+
+    if not default_storage.exists(blob.file.name):
+        save_content(blob.file.name)
+
+    add_reference(blob)
+    return blob
+
+
+def save_blob_content(name, content):
+    """blob 경로에 파일 저장 (동시에 같은 내용이 먼저 저장되었으면 새 사본은 삭제)"""
+    saved = default_storage.save(name, content)
+    if saved != name:
+        default_storage.delete(saved)
+
+
+def release_blob(blob_id):
+    """blob 참조를 하나 줄이고, 마지막 참조였으면 커밋 후 행과 파일 정리
+
+    참조가 0이 된 행은 바로 지우지 않고 남겨 두어, 커밋 후 collect_blob이 행을 잠그고 다시 확인하게 합니다.
+    """
+    blob = MediaBlob.objects.select_for_update().get(pk=blob_id)
+    if blob.ref_count > 0:
+        MediaBlob.objects.filter(pk=blob.pk).update(ref_count=F('ref_count') - 1)
+    if blob.ref_count > 1:
+        return False
+
+    transaction.on_commit(lambda: collect_blob(blob.pk))
+    return True
+
+
+def collect_blob(blob_id):
+    """참조가 없는 blob의 행과 파일 삭제 (그 사이 다시 참조되었으면 유지)
+
+    acquire_blob과 같은 행을 잠근 뒤 ref_count를 다시 확인합니다. 파일은 잠금을 쥔 채 삭제하므로,
+    잠금을 기다리던 acquire_blob은 행과 파일이 모두 없어진 것을 보고 내용을 새로 기록합니다.
+    """
+    with transaction.atomic():
+        blob = MediaBlob.objects.select_for_update().filter(pk=blob_id, ref_count=0).first()
+        if blob is None:
+            return False
+        blob.delete()
+        default_storage.delete(blob.file.name)
+    return True
+
+
+def create_media_file(uploaded_by, blob, filename):
+    """blob을 가리키는 MediaFile 생성 후 후처리 작업 등록"""
+    media = MediaFile.objects.create(
+        uploaded_by=uploaded_by,
+        file=blob.file.name,
+        file_type=get_file_type(filename),
+        file_size=blob.size,
+        mime_type=blob.mime_type,
+        content_hash=blob.content_hash,
+        original_filename=filename,
+        blob=blob
+    )
+    enqueue_processing(media)
+    return media
+
+
+def store_upload(uploaded_by, upload, mime_type='', content_hash=''):
+    """업로드된 파일을 blob으로 저장하고 MediaFile 생성
+
+    같은 해시의 blob이 이미 있으면 업로드된 임시 파일은 저장하지 않고 참조만 추가합니다.
+    """
+    content_hash = content_hash or hash_file(upload)
+    ext = os.path.splitext(upload.name)[1]
+
+    with transaction.atomic():
+        blob = acquire_blob(
+            content_hash, upload.size, ext, mime_type,
+            lambda name: save_blob_content(name, upload)
+        )
+        return create_media_file(uploaded_by, blob, upload.name)
+
+
+def attach_upload(media, upload):
+    """MediaFile 행에 업로드된 파일을 blob 참조로 연결 (관리자 페이지의 파일 추가/교체)
+
+    이전에 참조하던 내용은 삭제할 때와 같이 참조를 해제합니다.
+    """
+    content_hash = hash_file(upload)
+    mime_type = resolve_mime_type(upload.name, upload.read(SNIFF_LENGTH)) or ''
+    upload.seek(0)
+    previous = MediaFile.objects.filter(pk=media.pk).values('blob', 'file').first() if media.pk else None
+
+    with transaction.atomic():
+        blob = acquire_blob(
+            content_hash, upload.size, os.path.splitext(upload.name)[1], mime_type,
+            lambda name: save_blob_content(name, upload)
+        )
+        media.blob = blob
+        media.file = blob.file.name
+        media.file_type = get_file_type(upload.name) or media.file_type
+        media.file_size = blob.size
+        media.mime_type = blob.mime_type
+        media.content_hash = content_hash
+        media.original_filename = upload.name
+        media.save()
+
+        if previous is not None:
+            release_media_content(MediaFile(blob_id=previous['blob'], file=previous['file']))
+        enqueue_processing(media)
+    return media
+
+
+def delete_media_file(media):
+    """MediaFile 삭제 (blob 참조 해제와 파일 삭제는 post_delete 시그널에서 커밋 후 처리)"""
+    with transaction.atomic():
+        media.delete()
+
+
+def release_media_content(media):
+    """삭제된 MediaFile의 내용 정리 (마지막 참조일 때만 blob 파일 삭제)
+
+    사용자 삭제 등 연쇄 삭제에서도 호출되도록 post_delete 시그널에서 실행됩니다.
+    """
+    if media.blob_id is not None:
+        release_blob(media.blob_id)
+    else:
+        # blob 도입 전 파일은 행마다 따로 저장되어 있음
+        delete_on_commit(media.file.name)
+
+
+def adopt_legacy_file(media):
+    """blob 도입 전 파일을 blob으로 옮기고 참조로 전환 (같은 내용이 있으면 사본 삭제)"""
+    old_name = media.file.name
+    with default_storage.open(old_name, 'rb') as file:
+        content_hash = media.content_hash or hash_file(file)
+
+    with transaction.atomic():
+        blob = acquire_blob(
+            content_hash,
+            default_storage.size(old_name),
+            os.path.splitext(old_name)[1],
+            media.mime_type,
+            lambda name: os.replace(default_storage.path(old_name), prepare_path(name))
+        )
+        MediaFile.objects.filter(pk=media.pk).update(
+            blob=blob, file=blob.file.name, content_hash=content_hash
+        )
+
+    if default_storage.exists(old_name):
+        default_storage.delete(old_name)
+    return blob
+
+
+def prepare_path(name):
+    """저장소 경로의 상위 디렉터리를 만들고 절대 경로 반환"""
+    path = default_storage.path(name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def recount_references():
+    """MediaFile 참조 수로 blob의 ref_count 일괄 재계산 (단일 UPDATE 문)"""
+    references = (
+        MediaFile.objects.filter(blob=OuterRef('pk'))
+        .order_by().values('blob').annotate(count=Count('id')).values('count')
+    )
+    return MediaBlob.objects.update(
+        ref_count=Coalesce(Subquery(references, output_field=IntegerField()), Value(0))
+    )
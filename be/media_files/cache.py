@@ -0,0 +1,113 @@
+import os
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from django.conf import settings
+from .models import MediaFile
+
+StreamMetadata = namedtuple(
+    'StreamMetadata',
+    ['path', 'name', 'size', 'mime_type', 'mtime_ns', 'file_type']
+)
+
+
+class LRUCache:
+    """TTL이 있는 프로세스 내 LRU 캐시 (스레드 안전)
+
+    프로세스마다 따로 유지되므로 다른 워커의 무효화는 TTL이 지나야 반영됩니다.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            item = self.entries.get(key)
+            if item is None or item[1] <= time.monotonic():
+                if item is not None:
+                    del self.entries[key]
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self.lock:
+            self.entries[key] = (value, time.monotonic() + self.ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+
+metadata_cache = LRUCache(
+    settings.STREAM_METADATA_CACHE_SIZE,
+    settings.STREAM_METADATA_CACHE_TTL
+)
+
+
+def load_stream_metadata(pk):
+    """DB와 파일 시스템에서 스트리밍 메타데이터 조회 (쿼리 1회, stat 1회)"""
+    media = MediaFile.objects.only('file', 'file_type', 'mime_type').get(pk=pk)
+    path = media.file.path
+    stat = os.stat(path)
+    return StreamMetadata(
+        path=path,
+        name=media.file.name,
+        size=stat.st_size,
+        mime_type=media.mime_type,
+        mtime_ns=stat.st_mtime_ns,
+        file_type=media.file_type
+    )
+
+
+def get_stream_metadata(pk):
+    """캐시된 스트리밍 메타데이터 (없으면 조회 후 저장)
+
+    캐시 적중 시에는 SQL 없이 stat 한 번으로 파일 변경/삭제만 확인하고,
+    파일이 없어졌으면(다른 프로세스에서 옮겨진 경우 등) DB에서 다시 조회합니다.
+    MediaFile.DoesNotExist 또는 파일이 없으면 OSError가 발생합니다.
+    """
+    key = str(pk)
+    metadata = metadata_cache.get(key)
+    if metadata is None:
+        metadata = load_stream_metadata(pk)
+        metadata_cache.set(key, metadata)
+        return metadata
+
+    try:
+        stat = os.stat(metadata.path)
+    except OSError:
+        # 파일이 옮겨졌을 수 있으므로 DB에서 다시 조회
+        metadata_cache.invalidate(key)
+        metadata = load_stream_metadata(pk)
+        metadata_cache.set(key, metadata)
+        return metadata
+
+    if stat.st_size != metadata.size or stat.st_mtime_ns != metadata.mtime_ns:
+        metadata = metadata._replace(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        metadata_cache.set(key, metadata)
+    return metadata
+
+
+def invalidate_stream_metadata(pk):
+    metadata_cache.invalidate(str(pk))
@@ -0,0 +1,102 @@
+from urllib.parse import quote
+from django.conf import settings
+from django.http import HttpResponse
+from .streaming import RANGE_UNIT, get_ranges, range_not_satisfiable, range_response
+
+
+class BaseDelivery:
+    """비디오 전송 방식 공통 동작 (권한/구간 검증 이후 실제 바이트 전송을 담당)
+
+    media는 스트리밍 메타데이터(StreamMetadata: path, name, size 등)입니다.
+    """
+
+    def serve(self, request, media, content_type, etag=None, last_modified=None):
+        raise NotImplementedError
+
+
+class PythonDelivery(BaseDelivery):
+    """Python 워커가 파일을 직접 읽어 전송 (개발 서버/ASGI 기본값)"""
+
+    sendfile = False
+
+    def serve(self, request, media, content_type, etag=None, last_modified=None):
+        return range_response(
+            request, open(media.path, 'rb'), media.size, content_type,
+            etag=etag, last_modified=last_modified, sendfile=self.sendfile
+        )
+
+
+class SendfileDelivery(PythonDelivery):
+    """WSGI 서버의 file_wrapper(os.sendfile)로 무복사 전송
+
+    gunicorn/uWSGI처럼 wsgi.file_wrapper가 sendfile을 지원하는 서버에서 전체/단일 구간 응답이
+    커널에서 소켓으로 바로 복사됩니다. 다중 구간(multipart)은 Python 전송으로 처리합니다.
+    """
+
+    sendfile = True
+
+
+class ProxyDelivery(BaseDelivery):
+    """앞단 프록시에 파일 전송을 위임 (응답 본문 없이 내부 경로 헤더만 반환)
+
+    Range/If-Range 처리는 프록시가 하지만, 만족할 수 없는 구간은 여기서 먼저 416으로 거절합니다.
+    """
+
+    header = ''
+
+    def location(self, media):
+        raise NotImplementedError
+
+    def serve(self, request, media, content_type, etag=None, last_modified=None):
+        if get_ranges(request, media.size, etag, last_modified) == []:
+            return range_not_satisfiable(media.size)
+
+        response = HttpResponse(content_type=content_type)
+        response[self.header] = self.location(media)
+        response['Accept-Ranges'] = RANGE_UNIT
+        return response
+
+
+class XAccelRedirectDelivery(ProxyDelivery):
+    """nginx X-Accel-Redirect (internal location 아래의 MEDIA_ROOT 상대 경로)
+
+    연결별 대역폭 상한(STREAM_CONNECTION_RATE)은 X-Accel-Limit-Rate로 nginx에 전달합니다.
+    """
+
+    header = 'X-Accel-Redirect'
+
+    def location(self, media):
+        return settings.STREAM_ACCEL_REDIRECT_PREFIX + quote(media.name)
+
+    def serve(self, request, media, content_type, etag=None, last_modified=None):
+        response = super().serve(request, media, content_type, etag=etag, last_modified=last_modified)
+        if settings.STREAM_CONNECTION_RATE and self.header in response:
+            response['X-Accel-Limit-Rate'] = str(settings.STREAM_CONNECTION_RATE)
+        return response
+
+
+class XSendfileDelivery(ProxyDelivery):
+    """Apache mod_xsendfile / lighttpd X-Sendfile (파일 절대 경로)"""
+
+    header = 'X-Sendfile'
+
+    def location(self, media):
+        return media.path
+
+
+DELIVERY_BACKENDS = {
+    'python': PythonDelivery,
+    'sendfile': SendfileDelivery,
+    'x-accel-redirect': XAccelRedirectDelivery,
+    'x-sendfile': XSendfileDelivery,
+}
+
+OFFLOAD_HEADERS = [
+    backend.header for backend in DELIVERY_BACKENDS.values()
+    if issubclass(backend, ProxyDelivery)
+]
+
+
+def get_delivery_backend():
+    """설정(STREAM_DELIVERY_BACKEND)에 맞는 전송 방식"""
+    return DELIVERY_BACKENDS[settings.STREAM_DELIVERY_BACKEND]()
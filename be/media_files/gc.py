@@ -0,0 +1,177 @@
+import os
+import queue
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from django.apps import apps
+from django.conf import settings
+from django.db import models
+from django.db.models import Q
+from .images import VARIANT_PREFIX, variant_paths
+from .models import UploadSession
+
+StoredFile = namedtuple('StoredFile', ['name', 'size', 'mtime'])
+
+# 작업 하나가 이어서 훑는 최대 디렉터리 수
+SCAN_BATCH_SIZE = 64
+# 변형 이미지 JSON 재확인 쿼리 하나에 넣는 경로 수
+VARIANT_CHECK_CHUNK = 100
+
+
+def file_fields():
+    """모든 모델의 (모델, FileField, 변형 이미지 JSON 필드 이름 또는 None)"""
+    for model in apps.get_models():
+        names = {field.name for field in model._meta.concrete_fields}
+        for field in model._meta.concrete_fields:
+            if isinstance(field, models.FileField):
+                variants_field = f'{field.name}_variants'
+                yield model, field, variants_field if variants_field in names else None
+
+
+def iter_referenced_names(batch_size):
+    """DB가 참조하는 저장소 경로 (FileField, 변형 이미지, 진행 중인 업로드의 스테이징 파일)
+
+    테이블마다 경로 컬럼만 batch_size 단위로 나눠 읽습니다.
+    """
+    for model, field, variants_field in file_fields():
+        queryset = model._base_manager.exclude(**{field.name: ''}).exclude(**{f'{field.name}__isnull': True})
+        if variants_field is None:
+            yield from queryset.values_list(field.name, flat=True).iterator(chunk_size=batch_size)
+            continue
+        for name, variants in queryset.values_list(field.name, variants_field).iterator(chunk_size=batch_size):
+            yield name
+            yield from variant_paths(variants)
+
+    for session_id in UploadSession.objects.values_list('id', flat=True).iterator(chunk_size=batch_size):
+        path = os.path.relpath(UploadSession(id=session_id).staging_path, settings.MEDIA_ROOT)
+        yield path.replace(os.sep, '/')
+
+
+def filter_unreferenced(names):
+    """names 중 지금 DB가 참조하지 않는 경로 (삭제 직전 재확인용)
+
+    FileField 경로와 '<필드>_variants' JSON에 기록된 변형 이미지 경로를 확인합니다.
+    변형 이미지 경로는 원본 내용으로 정해지므로 스냅샷 이후 다시 참조될 수 있습니다.
+    """
+    remaining = set(names)
+    for model, field, variants_field in file_fields():
+        if not remaining:
+            break
+        remaining -= set(
+            model._base_manager.filter(**{f'{field.name}__in': remaining}).values_list(field.name, flat=True)
+        )
+        if variants_field is not None:
+            remaining -= referenced_variant_names(model, variants_field, remaining)
+    return remaining
+
+
+def referenced_variant_names(model, variants_field, names):
+    """names 중 model의 변형 이미지 JSON이 참조하는 경로
+
+    JSON 텍스트 부분 일치로 행을 좁힌 뒤 기록된 경로와 정확히 비교합니다.
+    """
+    candidates = sorted(name for name in names if name.startswith(f'{VARIANT_PREFIX}/'))
+    found = set()
+    for start in range(0, len(candidates), VARIANT_CHECK_CHUNK):
+        chunk = candidates[start:start + VARIANT_CHECK_CHUNK]
+        condition = Q()
+        for name in chunk:
+            condition |= Q(**{f'{variants_field}__icontains': name})
+        rows = model._base_manager.filter(condition).values_list(variants_field, flat=True)
+        for variants in rows:
+            found.update(set(variant_paths(variants)).intersection(chunk))
+    return found
+
+
+def scan_directory(root, relative):
+    """디렉터리 한 단계의 (파일 목록, 하위 디렉터리 목록)"""
+    files, directories = [], []
+    try:
+        with os.scandir(os.path.join(root, relative)) as entries:
+            for entry in entries:
+                name = f'{relative}/{entry.name}' if relative else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append(name)
+                elif entry.is_file(follow_symlinks=False):
+                    stat = entry.stat(follow_symlinks=False)
+                    files.append(StoredFile(name, stat.st_size, stat.st_mtime))
+    except FileNotFoundError:
+        # 순회 중 다른 프로세스가 삭제함
+        return None
+    return files, directories
+
+
+def scan_directories(root, relatives, limit):
+    """relatives부터 최대 limit개 디렉터리를 이어서 훑고 (파일, 빈 디렉터리, 남은 디렉터리) 반환
+
+    작업 하나가 여러 디렉터리를 처리하므로 디렉터리가 많은 분산 구조에서도 작업 수가 줄어듭니다.
+    """
+    files, empty, stack = [], [], list(relatives)
+    scanned = 0
+    while stack and scanned < limit:
+        relative = stack.pop()
+        result = scan_directory(root, relative)
+        scanned += 1
+        if result is None:
+            continue
+        found, directories = result
+        if relative and not found and not directories:
+            empty.append(relative)
+        files.extend(found)
+        stack.extend(directories)
+    return files, empty, stack
+
+
+def scan_storage(root, workers, empty_directories=None, limit=SCAN_BATCH_SIZE):
+    """root 아래 모든 파일을 순회 (디렉터리 묶음을 스레드 풀에서 병렬로 scandir)
+
+    empty_directories가 주어지면 비어 있는 하위 디렉터리 경로를 추가합니다.
+    """
+    if not os.path.isdir(root):
+        return
+    completed = queue.SimpleQueue()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+
+        def submit(relatives):
+            executor.submit(scan_directories, root, relatives, limit).add_done_callback(completed.put)
+
+        submit([''])
+        outstanding = 1
+        while outstanding:
+            files, empty, remaining = completed.get().result()
+            outstanding -= 1
+            if empty_directories is not None:
+                empty_directories.extend(empty)
+            # 남은 디렉터리는 워커 수만큼 나눠 다시 등록
+            size = max(1, min(limit, -(-len(remaining) // workers)))
+            for start in range(0, len(remaining), size):
+                submit(remaining[start:start + size])
+                outstanding += 1
+            yield from files
+
+
+def find_orphans(root, workers, batch_size, older_than, empty_directories=None):
+    """DB가 참조하지 않고 older_than(epoch 초) 이전에 수정된 파일
+
+    참조 목록을 먼저 읽은 뒤 파일 시스템을 훑으므로, 그 사이 새로 저장된 파일은
+    수정 시각 기준(older_than)으로 제외됩니다.
+    """
+    referenced = set(iter_referenced_names(batch_size))
+    for stored in scan_storage(root, workers, empty_directories):
+        if stored.mtime < older_than and stored.name not in referenced:
+            yield stored
+
+
+def delete_orphans(storage, orphans, executor):
+    """DB 참조를 다시 확인한 뒤 병렬로 삭제하고 (삭제한 파일 수, bytes) 반환"""
+    by_name = {stored.name: stored for stored in orphans}
+    names = filter_unreferenced(by_name)
+
+    def remove(name):
+        try:
+            os.remove(storage.path(name))
+        except FileNotFoundError:
+            return None
+        return by_name[name].size
+
+    sizes = [size for size in executor.map(remove, names) if size is not None]
+    return len(sizes), sum(sizes)
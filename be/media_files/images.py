@@ -0,0 +1,145 @@
+import io
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema_field
+from PIL import Image, ImageOps, UnidentifiedImageError
+from rest_framework import serializers
+from .blobs import hash_file, save_blob_content
+from .jobs import enqueue_task
+from .models import ProcessingJob
+
+# 변형 이미지 저장 디렉터리
+VARIANT_PREFIX = 'derivatives'
+
+# 변형 세트 -> {변형 이름: (너비, 높이)} (_2x는 고해상도(레티나) 화면용)
+IMAGE_VARIANT_SETS = {
+    'course_thumbnail': {'card': (400, 225), 'card_2x': (800, 450)},
+    'profile_image': {'avatar': (64, 64), 'avatar_2x': (128, 128)},
+}
+
+# 형식 -> (Pillow 형식, 저장 옵션)
+IMAGE_VARIANT_FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+
+def variant_path(content_hash, size, ext):
+    """원본 내용과 크기로 정해지는 변형 이미지 경로 (같은 원본이면 다시 만들지 않음)"""
+    width, height = size
+    return default_storage.shard_path(VARIANT_PREFIX, content_hash, f'_{width}x{height}.{ext}')
+
+
+def variant_paths(variants):
+    """'<필드>_variants' 값에 기록된 변형 이미지 저장 경로 목록 (source 제외)"""
+    return [
+        path
+        for variant, paths in (variants or {}).items() if variant != 'source'
+        for path in paths.values()
+    ]
+
+
+def load_source_image(file, max_size):
+    """원본 이미지를 열어 EXIF 방향을 적용하고 RGB/RGBA로 변환
+
+    JPEG은 draft로 필요한 크기 이상인 가장 작은 배율로 디코딩하여 큰 원본의 처리 시간을 줄입니다.
+    """
+    image = Image.open(file)
+    image.draft('RGB', max_size)
+    image = ImageOps.exif_transpose(image)
+    has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+    return image.convert('RGBA' if has_alpha else 'RGB')
+
+
+def render_variant(image, size, ext):
+    """가운데 기준으로 잘라 size에 맞춘 이미지의 인코딩 결과 (JPEG은 투명 영역을 흰색으로 채움)"""
+    image_format, options = IMAGE_VARIANT_FORMATS[ext]
+    resized = ImageOps.fit(image, size, Image.Resampling.LANCZOS)
+    if image_format == 'JPEG' and resized.mode == 'RGBA':
+        background = Image.new('RGB', size, 'white')
+        background.paste(resized, mask=resized.getchannel('A'))
+        resized = background
+
+    buffer = io.BytesIO()
+    resized.save(buffer, image_format, **options)
+    return buffer.getvalue()
+
+
+def generate_variants(name, variant_set):
+    """원본 이미지의 변형 이미지를 저장하고 {변형 이름: {형식: 저장 경로}} 반환
+
+    경로가 원본 해시와 크기로 정해지므로 이미 있는 변형 이미지는 다시 만들지 않습니다.
+    원본이 이미지가 아니면 None을 반환합니다. (다시 시도해도 결과가 같으므로 실패로 처리하지 않음)
+    """
+    with default_storage.open(name, 'rb') as file:
+        content_hash = hash_file(file)
+        variants = {
+            variant: {ext: variant_path(content_hash, size, ext) for ext in IMAGE_VARIANT_FORMATS}
+            for variant, size in IMAGE_VARIANT_SETS[variant_set].items()
+        }
+        missing = [
+            (IMAGE_VARIANT_SETS[variant_set][variant], ext, path)
+            for variant, paths in variants.items()
+            for ext, path in paths.items()
+            if not default_storage.exists(path)
+        ]
+        if missing:
+            largest = max(size for size, _, _ in missing)
+            try:
+                image = load_source_image(file, largest)
+            except UnidentifiedImageError:
+                return None
+            for size, ext, path in missing:
+                save_blob_content(path, ContentFile(render_variant(image, size, ext)))
+    return variants
+
+
+def queue_image_variants(instance, field, variant_set):
+    """이미지 필드가 바뀌었으면 변형 이미지 생성 작업 등록 (이미지를 지웠으면 변형 정보 초기화)
+
+    변형 정보는 '<필드>_variants' JSON 필드에 원본 경로(source)와 함께 저장됩니다.
+    """
+    image = getattr(instance, field)
+    variants_field = f'{field}_variants'
+    variants = getattr(instance, variants_field) or {}
+
+    if not image:
+        if variants:
+            type(instance).objects.filter(pk=instance.pk).update(**{variants_field: {}})
+            setattr(instance, variants_field, {})
+        return None
+
+    if variants.get('source') == image.name:
+        return None
+    if ProcessingJob.objects.filter(
+        task='image_variants', status__in=['pending', 'running'], payload__name=image.name
+    ).exists():
+        return None
+
+    return enqueue_task(
+        'image_variants',
+        model=instance._meta.label,
+        pk=instance.pk,
+        field=field,
+        name=image.name,
+        variant_set=variant_set
+    )
+
+
+@extend_schema_field(OpenApiTypes.OBJECT)
+class ImageVariantsField(serializers.ReadOnlyField):
+    """변형 이미지 URL ({변형 이름: {형식: URL}}, 생성 전이면 빈 객체)"""
+
+    def to_representation(self, value):
+        request = self.context.get('request')
+
+        def url(name):
+            path = default_storage.url(name)
+            return request.build_absolute_uri(path) if request else path
+
+        return {
+            variant: {ext: url(path) for ext, path in paths.items()}
+            for variant, paths in (value or {}).items()
+            if variant != 'source'
+        }
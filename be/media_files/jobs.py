@@ -0,0 +1,187 @@
+import logging
+import time
+import traceback
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import Count, F, Q
+from django.utils import timezone
+from .models import MediaFile, ProcessingJob
+
+logger = logging.getLogger(__name__)
+
+# 작업 이름 -> (처리 함수, 대상 파일 타입)
+PROCESSING_TASKS = {}
+
+
+def register_task(name, file_types=None):
+    """후처리 작업 등록 데코레이터
+
+    file_types가 None이면 모든 파일 타입의 업로드에, 빈 목록이면 어느 업로드에도 자동으로 등록되지 않습니다.
+    (enqueue_task로 직접 등록)
+    """
+    def decorator(func):
+        types = [value for value, _ in MediaFile.FILE_TYPE_CHOICES] if file_types is None else file_types
+        PROCESSING_TASKS[name] = (func, tuple(types))
+        return func
+    return decorator
+
+
+def get_tasks_for(file_type):
+    return [name for name, (_, file_types) in PROCESSING_TASKS.items() if file_type in file_types]
+
+
+def enqueue_processing(media):
+    """파일 타입에 등록된 후처리 작업을 큐에 추가 (호출하는 쪽의 트랜잭션과 함께 커밋)"""
+    tasks = get_tasks_for(media.file_type)
+    if not tasks:
+        return []
+
+    jobs = ProcessingJob.objects.bulk_create([
+        ProcessingJob(media_file=media, task=task, max_attempts=settings.MEDIA_JOB_MAX_ATTEMPTS)
+        for task in tasks
+    ])
+    if media.processing_status != 'pending':
+        MediaFile.objects.filter(pk=media.pk).update(processing_status='pending')
+        media.processing_status = 'pending'
+    return jobs
+
+
+def enqueue_task(task, **payload):
+    """미디어 파일과 무관한 작업을 큐에 추가 (payload는 JSON으로 저장되어 작업 함수의 인자가 됨)"""
+    return ProcessingJob.objects.create(
+        task=task, payload=payload, max_attempts=settings.MEDIA_JOB_MAX_ATTEMPTS
+    )
+
+
+def claimable_jobs(now):
+    """가져갈 수 있는 작업: 실행 시각이 된 대기 작업, 잠금이 만료된(워커가 중단된) 실행 중 작업"""
+    return ProcessingJob.objects.filter(
+        Q(status='pending', run_after__lte=now) |
+        Q(status='running', locked_until__lt=now, attempts__lt=F('max_attempts'))
+    )
+
+
+def claim_job(worker_id, visibility_timeout):
+    """작업 하나를 가져와 잠금 (없으면 None)
+
+    조건부 UPDATE로 상태를 바꾸므로 행 잠금(SKIP LOCKED)이 없는 SQLite에서도
+    여러 워커 프로세스가 같은 작업을 동시에 가져가지 않습니다.
+    """
+    now = timezone.now()
+    candidates = claimable_jobs(now).order_by('run_after', 'id').values_list('id', flat=True)
+    for job_id in candidates[:10]:
+        claimed = claimable_jobs(now).filter(pk=job_id).update(
+            status='running',
+            attempts=F('attempts') + 1,
+            locked_by=worker_id,
+            locked_until=now + timedelta(seconds=visibility_timeout),
+            updated_at=now
+        )
+        if claimed:
+            job = ProcessingJob.objects.select_related('media_file').filter(pk=job_id).first()
+            if job is None:
+                # 그 사이 미디어 파일과 함께 삭제됨
+                continue
+            if job.media_file_id is not None:
+                MediaFile.objects.filter(pk=job.media_file_id, processing_status='pending').update(
+                    processing_status='processing'
+                )
+            return job
+    return None
+
+
+def fail_expired_jobs():
+    """시도 횟수를 다 쓴 채 잠금이 만료된 작업을 실패 처리"""
+    expired = ProcessingJob.objects.filter(
+        status='running', locked_until__lt=timezone.now(), attempts__gte=F('max_attempts')
+    )
+    media_ids = set(expired.values_list('media_file_id', flat=True))
+    failed = expired.update(status='failed', last_error='처리 시간이 초과되었습니다.', updated_at=timezone.now())
+    for media_id in media_ids - {None}:
+        refresh_processing_status(media_id)
+    return failed
+
+
+def refresh_processing_status(media_id):
+    """작업 상태로 미디어 파일의 처리 상태 갱신"""
+    counts = dict(
+        ProcessingJob.objects.filter(media_file_id=media_id)
+        .order_by().values_list('status').annotate(count=Count('id'))
+    )
+    if counts.get('pending') or counts.get('running'):
+        started = counts.get('running') or counts.get('succeeded') or counts.get('failed')
+        processing_status = 'processing' if started else 'pending'
+    elif counts.get('failed'):
+        processing_status = 'failed'
+    else:
+        processing_status = 'ready'
+    MediaFile.objects.filter(pk=media_id).update(processing_status=processing_status)
+    return processing_status
+
+
+def finish_job(job, worker_id, **fields):
+    """작업 결과 기록 (잠금이 만료되어 다른 워커가 가져간 작업이면 기록하지 않음)"""
+    updated = ProcessingJob.objects.filter(
+        pk=job.pk, status='running', locked_by=worker_id, attempts=job.attempts
+    ).update(locked_by='', locked_until=None, updated_at=timezone.now(), **fields)
+    if updated and job.media_file_id is not None:
+        refresh_processing_status(job.media_file_id)
+    return bool(updated)
+
+
+def run_job(job, worker_id):
+    """작업 실행 (실패 시 재시도 횟수가 남았으면 지연 후 다시 대기)"""
+    task = PROCESSING_TASKS.get(job.task)
+    try:
+        if task is None:
+            raise LookupError(f'등록되지 않은 작업입니다: {job.task}')
+        if job.media_file_id is not None:
+            task[0](job.media_file)
+        else:
+            task[0](**job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        logger.warning('후처리 작업 실패: %s (시도 %s/%s)', job, job.attempts, job.max_attempts)
+        if task is not None and job.attempts < job.max_attempts:
+            delay = settings.MEDIA_JOB_RETRY_DELAY * 2 ** (job.attempts - 1)
+            finish_job(
+                job, worker_id, status='pending', last_error=error,
+                run_after=timezone.now() + timedelta(seconds=delay)
+            )
+        else:
+            finish_job(job, worker_id, status='failed', last_error=error)
+        return False
+
+    finish_job(job, worker_id, status='succeeded', last_error='')
+    return True
+
+
+def retry_jobs(queryset):
+    """실패한 작업을 처음부터 다시 시도하도록 초기화"""
+    media_ids = set(queryset.filter(status='failed').values_list('media_file_id', flat=True))
+    updated = queryset.filter(status='failed').update(
+        status='pending', attempts=0, run_after=timezone.now(), updated_at=timezone.now()
+    )
+    for media_id in media_ids - {None}:
+        refresh_processing_status(media_id)
+    return updated
+
+
+def run_worker(worker_id, visibility_timeout, poll_interval, once=False, should_stop=lambda: False):
+    """작업 큐를 폴링하며 작업을 하나씩 처리 (once면 큐가 비었을 때 종료)
+
+    처리한 작업 수를 반환합니다.
+    """
+    processed = 0
+    while not should_stop():
+        fail_expired_jobs()
+        job = claim_job(worker_id, visibility_timeout)
+        if job is None:
+            if once:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        run_job(job, worker_id)
+        processed += 1
+    return processed
@@ -0,0 +1,210 @@
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from django.conf import settings
+from .cache import LRUCache
+from .models import KeyframeIndex
+from .probe import MP4_TOP_LEVEL_BOXES, ProbeError, file_length, iter_boxes, read_box, read_exact
+
+SAMPLE_TABLE_BOXES = {b'stss', b'stts', b'stsc', b'stsz', b'stco', b'co64'}
+
+
+class SeekTable:
+    """키프레임 시각(초)과 바이트 위치를 정렬된 배열 두 개로 보관하는 색인
+
+    시각으로 직전 키프레임을 이분 탐색(O(log n))으로 찾습니다.
+    직렬화하면 키프레임당 16 bytes(float64 시각 + uint64 위치)입니다.
+    """
+
+    def __init__(self, times=(), offsets=()):
+        self.times = array('d', times)
+        self.offsets = array('Q', offsets)
+
+    def __len__(self):
+        return len(self.times)
+
+    def find(self, seconds):
+        """seconds 이전(같거나 앞선) 마지막 키프레임의 (시각, 바이트 위치). 색인이 비었으면 None"""
+        if not self.times:
+            return None
+        index = max(bisect_right(self.times, seconds) - 1, 0)
+        return self.times[index], self.offsets[index]
+
+    def to_bytes(self):
+        times, offsets = array('d', self.times), array('Q', self.offsets)
+        if sys.byteorder == 'big':
+            times.byteswap()
+            offsets.byteswap()
+        return times.tobytes() + offsets.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data):
+        table = cls()
+        half = len(data) // 2
+        table.times.frombytes(data[:half])
+        table.offsets.frombytes(data[half:])
+        if sys.byteorder == 'big':
+            table.times.byteswap()
+            table.offsets.byteswap()
+        return table
+
+
+def read_uint_array(file, start, count, typecode='I'):
+    """big-endian 부호 없는 정수 배열 읽기"""
+    values = array(typecode)
+    file.seek(start)
+    values.frombytes(read_exact(file, count * values.itemsize))
+    if sys.byteorder == 'little':
+        values.byteswap()
+    return values
+
+
+def find_video_sample_tables(file, size):
+    """첫 번째 비디오 트랙의 (mdhd timescale, {샘플 테이블 box: (내용 시작, 내용 끝)})"""
+    for box_type, start, end in iter_boxes(file, 0, size):
+        if box_type == b'moov':
+            break
+    else:
+        raise ProbeError('moov box가 없습니다.')
+
+    for box_type, trak_start, trak_end in iter_boxes(file, start, end):
+        if box_type != b'trak':
+            continue
+        for child_type, mdia_start, mdia_end in iter_boxes(file, trak_start, trak_end):
+            if child_type != b'mdia':
+                continue
+
+            handler, timescale, tables = b'', 0, {}
+            for mdia_type, box_start, box_end in iter_boxes(file, mdia_start, mdia_end):
+                if mdia_type == b'hdlr':
+                    handler = read_box(file, box_start, box_end, 12)[8:12]
+                elif mdia_type == b'mdhd':
+                    data = read_box(file, box_start, box_end, 24)
+                    timescale = struct.unpack_from('>I', data, 20 if data[:1] == b'\x01' else 12)[0]
+                elif mdia_type == b'minf':
+                    for minf_type, stbl_start, stbl_end in iter_boxes(file, box_start, box_end):
+                        if minf_type == b'stbl':
+                            for table_type, table_start, table_end in iter_boxes(file, stbl_start, stbl_end):
+                                if table_type in SAMPLE_TABLE_BOXES:
+                                    tables[table_type] = (table_start, table_end)
+            if handler == b'vide':
+                return timescale, tables
+    return None, None
+
+
+def read_entry_table(file, tables, box_type, fields=1, typecode='I'):
+    """version/flags, entry_count 뒤에 이어지는 항목 배열 (box가 없으면 None)"""
+    if box_type not in tables:
+        return None
+    start, _ = tables[box_type]
+    file.seek(start + 4)
+    count = struct.unpack('>I', read_exact(file, 4))[0]
+    return read_uint_array(file, start + 8, count * fields, typecode)
+
+
+def decode_times(samples, stts):
+    """정렬된 샘플 번호(1부터)의 디코딩 시각 (timescale 단위)"""
+    times = []
+    run, run_first, run_time = 0, 1, 0
+    runs = len(stts) // 2
+    for sample in samples:
+        while run < runs and sample >= run_first + stts[run * 2]:
+            run_time += stts[run * 2] * stts[run * 2 + 1]
+            run_first += stts[run * 2]
+            run += 1
+        if run == runs:
+            break
+        times.append(run_time + (sample - run_first) * stts[run * 2 + 1])
+    return times
+
+
+def sample_offsets(samples, stsc, chunk_offsets, sizes, uniform_size):
+    """정렬된 샘플 번호(1부터)의 파일 내 바이트 위치 (stsc로 청크를 찾고 청크 안의 앞 샘플 크기를 더함)"""
+    offsets = []
+    run, run_first = 0, 1
+    runs = len(stsc) // 3
+    for sample in samples:
+        while True:
+            first_chunk, per_chunk = stsc[run * 3], stsc[run * 3 + 1]
+            last_chunk = stsc[(run + 1) * 3] - 1 if run + 1 < runs else len(chunk_offsets)
+            if not per_chunk:
+                raise ProbeError('stsc 항목이 올바르지 않습니다.')
+            run_samples = (last_chunk - first_chunk + 1) * per_chunk
+            if sample < run_first + run_samples or run + 1 == runs:
+                break
+            run_first += run_samples
+            run += 1
+
+        index = sample - run_first
+        chunk = first_chunk + index // per_chunk
+        if chunk > len(chunk_offsets):
+            break
+        chunk_first = sample - index % per_chunk
+        if uniform_size:
+            before = (sample - chunk_first) * uniform_size
+        else:
+            before = sum(sizes[chunk_first - 1:sample - 1])
+        offsets.append(chunk_offsets[chunk - 1] + before)
+    return offsets
+
+
+def build_seek_table(file):
+    """MP4/MOV 비디오 트랙의 키프레임 색인 (MP4가 아니거나 비디오 트랙이 없으면 None)
+
+    stss(키프레임 샘플 번호), stts(샘플 시각), stsc/stco(청크 위치), stsz(샘플 크기)만 읽습니다.
+    stss가 없으면 모든 샘플이 키프레임입니다.
+    """
+    size = file_length(file)
+    file.seek(0)
+    if file.read(8)[4:8] not in MP4_TOP_LEVEL_BOXES:
+        return None
+
+    timescale, tables = find_video_sample_tables(file, size)
+    if not timescale or not {b'stts', b'stsc', b'stsz'} <= set(tables):
+        return None
+
+    start, _ = tables[b'stsz']
+    file.seek(start + 4)
+    uniform_size, sample_count = struct.unpack('>II', read_exact(file, 8))
+    sizes = None if uniform_size else read_uint_array(file, start + 12, sample_count)
+
+    chunk_offsets = read_entry_table(file, tables, b'stco')
+    if chunk_offsets is None:
+        chunk_offsets = read_entry_table(file, tables, b'co64', typecode='Q')
+    if chunk_offsets is None:
+        return None
+
+    samples = read_entry_table(file, tables, b'stss')
+    if samples is None:
+        samples = range(1, sample_count + 1)
+
+    stsc = read_entry_table(file, tables, b'stsc', fields=3)
+    if not stsc:
+        return None
+
+    times = decode_times(samples, read_entry_table(file, tables, b'stts', fields=2))
+    offsets = sample_offsets(samples, stsc, chunk_offsets, sizes, uniform_size)
+    count = min(len(times), len(offsets))
+    return SeekTable([time / timescale for time in times[:count]], offsets[:count])
+
+
+seek_table_cache = LRUCache(
+    settings.STREAM_METADATA_CACHE_SIZE,
+    settings.STREAM_METADATA_CACHE_TTL
+)
+
+
+def get_seek_table(pk):
+    """캐시된 키프레임 색인 (색인이 없으면 빈 SeekTable)"""
+    key = str(pk)
+    table = seek_table_cache.get(key)
+    if table is None:
+        data = KeyframeIndex.objects.filter(media_file_id=pk).values_list('data', flat=True).first()
+        table = SeekTable.from_bytes(bytes(data)) if data else SeekTable()
+        seek_table_cache.set(key, table)
+    return table
+
+
+def invalidate_seek_table(pk):
+    seek_table_cache.invalidate(str(pk))
@@ -0,0 +1,171 @@
+import os
+import struct
+import tempfile
+import time
+from django.core.management.base import BaseCommand
+from media_files.probe import probe_media
+
+
+class CountingFile:
+    """읽은 바이트 수와 read/seek 호출 수를 기록하는 파일 래퍼"""
+
+    def __init__(self, file):
+        self.file = file
+        self.bytes_read = 0
+        self.reads = 0
+        self.seeks = 0
+
+    def read(self, size=-1):
+        data = self.file.read(size)
+        self.bytes_read += len(data)
+        self.reads += 1
+        return data
+
+    def seek(self, *args):
+        self.seeks += 1
+        return self.file.seek(*args)
+
+    def tell(self):
+        return self.file.tell()
+
+
+def box(box_type, *payload):
+    data = b''.join(payload)
+    return struct.pack('>I4s', 8 + len(data), box_type) + data
+
+
+def full_box(box_type, *payload):
+    return box(box_type, b'\x00\x00\x00\x00', *payload)
+
+
+def build_moov(duration, width, height, samples, data_offset=0, sample_size=4000, gop=30, chunk_samples=10):
+    """mvhd/tkhd/hdlr/stsd와 샘플 테이블(stts/stss/stsc/stsz/stco)을 가진 moov
+
+    gop개마다 키프레임(다른 샘플의 5배 크기)을 두고, chunk_samples개씩 묶은 청크가
+    data_offset부터 이어서 기록된 것으로 계산합니다.
+    """
+    matrix = struct.pack('>9I', 0x10000, 0, 0, 0, 0x10000, 0, 0, 0, 0x40000000)
+    mvhd = full_box(
+        b'mvhd', struct.pack('>IIII', 0, 0, 1000, int(duration * 1000)),
+        struct.pack('>IH', 0x10000, 0x100), bytes(10), matrix, bytes(24), struct.pack('>I', 2)
+    )
+    tkhd = full_box(
+        b'tkhd', struct.pack('>IIIII', 0, 0, 1, 0, int(duration * 1000)), bytes(8),
+        struct.pack('>HHHH', 0, 0, 0, 0), matrix, struct.pack('>II', width << 16, height << 16)
+    )
+    hdlr = full_box(b'hdlr', bytes(4), b'vide', bytes(12), b'VideoHandler\x00')
+    avc1 = box(
+        b'avc1', bytes(6), struct.pack('>H', 1), bytes(16),
+        struct.pack('>HH', width, height), bytes(50)
+    )
+
+    timescale = 30000
+    keyframes = range(1, samples + 1, gop)
+    sizes = [sample_size * 5 if i % gop == 0 else sample_size for i in range(samples)]
+    chunk_offsets, offset = [], data_offset
+    for start in range(0, samples, chunk_samples):
+        chunk_offsets.append(offset)
+        offset += sum(sizes[start:start + chunk_samples])
+
+    stsd = full_box(b'stsd', struct.pack('>I', 1), avc1)
+    stts = full_box(b'stts', struct.pack('>III', 1, samples, int(duration * timescale / samples)))
+    stss = full_box(b'stss', struct.pack(f'>I{len(keyframes)}I', len(keyframes), *keyframes))
+    stsc = full_box(b'stsc', struct.pack('>IIII', 1, 1, chunk_samples, 1))
+    stsz = full_box(b'stsz', struct.pack(f'>II{samples}I', 0, samples, *sizes))
+    stco = full_box(b'stco', struct.pack(f'>I{len(chunk_offsets)}I', len(chunk_offsets), *chunk_offsets))
+    stbl = box(b'stbl', stsd, stts, stss, stsc, stsz, stco)
+    mdhd = full_box(b'mdhd', struct.pack('>IIII', 0, 0, timescale, int(duration * timescale)), bytes(4))
+    mdia = box(b'mdia', mdhd, hdlr, box(b'minf', box(b'vmhd', bytes(12)), stbl))
+    return box(b'moov', mvhd, box(b'trak', tkhd, mdia))
+
+
+def write_mp4(path, size, moov, faststart):
+    """ftyp + mdat(희소 파일) + moov (faststart면 moov를 mdat 앞에 배치)"""
+    ftyp = box(b'ftyp', b'isom', bytes(4), b'isomavc1')
+    mdat_size = size - len(ftyp) - len(moov)
+    with open(path, 'wb') as file:
+        file.write(ftyp)
+        if faststart:
+            file.write(moov)
+        file.write(struct.pack('>I4s', mdat_size, b'mdat'))
+        file.seek(mdat_size - 8, 1)
+        if not faststart:
+            file.write(moov)
+        file.truncate(size)
+
+
+def ebml_element(element_id, payload):
+    id_bytes = element_id.to_bytes((element_id.bit_length() + 7) // 8, 'big')
+    return id_bytes + (0x01 << 56 | len(payload)).to_bytes(8, 'big') + payload
+
+
+def write_webm(path, size, duration, width, height):
+    """EBML 헤더 + 크기 미정 Segment(Info, Tracks) + 큰 Cluster(희소 파일)"""
+    header = ebml_element(0x1A45DFA3, ebml_element(0x4282, b'webm'))
+    info = ebml_element(0x1549A966, (
+        ebml_element(0x2AD7B1, (1_000_000).to_bytes(3, 'big')) +
+        ebml_element(0x4489, struct.pack('>d', duration * 1000))
+    ))
+    video = ebml_element(0xE0, (
+        ebml_element(0xB0, width.to_bytes(2, 'big')) + ebml_element(0xBA, height.to_bytes(2, 'big'))
+    ))
+    tracks = ebml_element(0x1654AE6B, ebml_element(0xAE, (
+        ebml_element(0xD7, b'\x01') + ebml_element(0x83, b'\x01') +
+        ebml_element(0x86, b'V_VP9') + video
+    )))
+    segment_head = b'\x18\x53\x80\x67\x01\xff\xff\xff\xff\xff\xff\xff'
+    with open(path, 'wb') as file:
+        file.write(header + segment_head + info + tracks)
+        cluster_size = size - file.tell() - 12
+        file.write(b'\x1f\x43\xb6\x75' + (0x01 << 56 | cluster_size).to_bytes(8, 'big'))
+        file.truncate(size)
+
+
+class Command(BaseCommand):
+    """비디오 메타데이터 추출 벤치마크 (파일 크기 대비 읽은 바이트)"""
+
+    help = '희소 파일로 만든 큰 MP4/WebM에서 재생시간을 추출하며 읽은 바이트, read/seek 횟수, 처리 시간을 출력합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--size',
+            type=int,
+            default=500,
+            help='테스트 파일 크기 (MB, 기본 500)',
+        )
+        parser.add_argument(
+            '--duration',
+            type=int,
+            default=3600,
+            help='재생시간 (초, 기본 3600). 샘플 테이블은 30fps 기준으로 생성됩니다.',
+        )
+
+    def handle(self, *args, **options):
+        size = options['size'] * 1024 * 1024
+        duration = options['duration']
+        moov = build_moov(duration, 1920, 1080, samples=duration * 30)
+        self.stdout.write(
+            f'파일 크기: {options["size"]}MB, 재생시간: {duration}초, moov 크기: {len(moov) / 1024:.0f}KB'
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            scenarios = [
+                ('MP4 (moov 뒤)', 'tail.mp4', lambda path: write_mp4(path, size, moov, faststart=False)),
+                ('MP4 (faststart)', 'front.mp4', lambda path: write_mp4(path, size, moov, faststart=True)),
+                ('WebM', 'video.webm', lambda path: write_webm(path, size, duration, 1920, 1080)),
+            ]
+            for label, name, build in scenarios:
+                path = os.path.join(directory, name)
+                build(path)
+
+                with open(path, 'rb') as raw:
+                    file = CountingFile(raw)
+                    start = time.perf_counter()
+                    info = probe_media(file)
+                    elapsed = time.perf_counter() - start
+
+                self.stdout.write(
+                    f'{label:<16} 재생시간={info.duration:.1f}초 {info.width}x{info.height} {info.codec:<5} '
+                    f'읽기={file.bytes_read:,} bytes (read {file.reads}회, seek {file.seeks}회) '
+                    f'{elapsed * 1000:.2f}ms'
+                )
@@ -0,0 +1,89 @@
+import os
+import tempfile
+import time
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from media_files.streaming import parse_range_header, range_response
+
+
+class CountingFile:
+    """읽은 바이트 수를 기록하는 파일 래퍼"""
+
+    def __init__(self, file):
+        self.file = file
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = self.file.read(size)
+        self.bytes_read += len(data)
+        return data
+
+    def seek(self, *args):
+        return self.file.seek(*args)
+
+    def close(self):
+        self.file.close()
+
+
+class Command(BaseCommand):
+    """Range 스트리밍 벤치마크 (요청 바이트 대비 디스크 읽기 바이트)"""
+
+    help = '임시 파일로 여러 Range 요청을 처리하며 요청/전송/디스크 읽기 바이트와 처리 시간을 출력합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--size',
+            type=int,
+            default=64,
+            help='테스트 파일 크기 (MB, 기본 64)',
+        )
+        parser.add_argument(
+            '--block-size',
+            type=int,
+            action='append',
+            dest='block_sizes',
+            help='읽기 단위 (KB, 여러 번 지정 가능, 기본 16/64/256)',
+        )
+
+    def handle(self, *args, **options):
+        size = options['size'] * 1024 * 1024
+        block_sizes = [kb * 1024 for kb in (options['block_sizes'] or [16, 64, 256])]
+        mb = 1024 * 1024
+        scenarios = [
+            ('처음 1MB', f'bytes=0-{mb - 1}'),
+            ('중간 1MB', f'bytes={size // 2}-{size // 2 + mb - 1}'),
+            ('마지막 1MB', f'bytes=-{mb}'),
+            ('열린 구간(끝 4MB)', f'bytes={size - 4 * mb}-'),
+            ('다중 구간 3x256KB', f'bytes=0-{mb // 4 - 1},{mb}-{mb + mb // 4 - 1},{size - mb // 4}-'),
+        ]
+
+        factory = RequestFactory()
+        with tempfile.NamedTemporaryFile(suffix='.mp4') as tmp:
+            chunk = os.urandom(mb)
+            for _ in range(size // mb):
+                tmp.write(chunk)
+            tmp.flush()
+
+            self.stdout.write(
+                f"{'시나리오':<20}{'블록':>8}{'요청':>12}{'전송':>12}{'디스크 읽기':>12}{'시간(ms)':>10}"
+            )
+            for block_size in block_sizes:
+                for name, header in scenarios:
+                    request = factory.get('/', HTTP_RANGE=header)
+                    file = CountingFile(open(tmp.name, 'rb'))
+
+                    started = time.perf_counter()
+                    response = range_response(request, file, size, 'video/mp4', block_size=block_size)
+                    sent = sum(len(part) for part in response.streaming_content)
+                    response.close()
+                    elapsed = (time.perf_counter() - started) * 1000
+
+                    requested = sum(
+                        end - start + 1 for start, end in parse_range_header(header, size)
+                    )
+                    self.stdout.write(
+                        f'{name:<20}{block_size // 1024:>7}K{requested:>12}{sent:>12}'
+                        f'{file.bytes_read:>12}{elapsed:>10.1f}'
+                    )
+                    if file.bytes_read != requested:
+                        self.stdout.write(self.style.WARNING('  요청보다 많이 읽었습니다.'))
@@ -0,0 +1,27 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from courses.models import Course
+from media_files.images import queue_image_variants
+
+# (모델, 이미지 필드, 변형 세트)
+IMAGE_FIELDS = [
+    (Course, 'thumbnail', 'course_thumbnail'),
+    (get_user_model(), 'profile_image', 'profile_image'),
+]
+
+
+class Command(BaseCommand):
+    """기존 강의 썸네일/프로필 이미지의 변형 이미지 생성 작업 등록"""
+
+    help = '변형 이미지가 없거나 원본이 바뀐 썸네일/프로필 이미지의 생성 작업을 처리 대기열에 등록합니다.'
+
+    def handle(self, *args, **options):
+        for model, field, variant_set in IMAGE_FIELDS:
+            queued = 0
+            instances = model.objects.exclude(**{field: ''}).only('pk', field, f'{field}_variants')
+            for instance in instances.iterator():
+                if queue_image_variants(instance, field, variant_set):
+                    queued += 1
+            self.stdout.write(f'{model._meta.verbose_name} {field}: {queued}개 작업 등록')
+
+        self.stdout.write(self.style.SUCCESS('process_media_jobs 워커가 등록된 작업을 처리합니다.'))
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from media_files.blobs import adopt_legacy_file, collect_blob, recount_references
+from media_files.models import MediaBlob, MediaFile
+
+
+class Command(BaseCommand):
+    """기존 미디어 파일을 내용 기반 저장소(blob)로 옮기고 중복 제거"""
+
+    help = 'blob이 없는 미디어 파일을 해시 경로로 옮겨 같은 내용을 하나로 합치고 참조 수를 재계산합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--recount-only',
+            action='store_true',
+            help='파일을 옮기지 않고 blob 참조 수만 재계산',
+        )
+
+    def handle(self, *args, **options):
+        if not options['recount_only']:
+            adopted = missing = 0
+            legacy = MediaFile.objects.filter(blob=None).exclude(file='').only(
+                'id', 'file', 'mime_type', 'content_hash'
+            )
+            for media in legacy.iterator():
+                try:
+                    adopt_legacy_file(media)
+                except FileNotFoundError:
+                    missing += 1
+                    self.stdout.write(self.style.WARNING(f'파일 없음: {media.pk} ({media.file.name})'))
+                    continue
+                adopted += 1
+
+            self.stdout.write(f'blob으로 옮긴 파일: {adopted}개 (파일 없음: {missing}개)')
+
+        updated = recount_references()
+
+        # 참조하는 미디어 파일이 없는 blob은 행과 파일 삭제
+        unreferenced = MediaBlob.objects.filter(ref_count=0).values_list('pk', flat=True)
+        collected = sum(collect_blob(blob_id) for blob_id in list(unreferenced))
+        self.stdout.write(self.style.SUCCESS(
+            f'{updated}개 blob의 참조 수를 재계산했습니다. (참조 없는 blob 삭제: {collected}개)'
+        ))
@@ -0,0 +1,101 @@
+import os
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from media_files.gc import delete_orphans, find_orphans
+
+
+def format_size(size):
+    return f'{size / (1024 * 1024):,.1f}MB/{size:,} bytes'
+
+
+class Command(BaseCommand):
+    """DB가 참조하지 않는 저장소 파일(고아 파일) 정리"""
+
+    help = (
+        'MEDIA_ROOT를 병렬로 훑어 어떤 FileField/변형 이미지/업로드 세션도 참조하지 않는 파일을 찾고, '
+        '회수 가능한 용량을 출력하거나(--dry-run) 배치로 삭제합니다.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='삭제하지 않고 대상 파일 수와 회수 가능한 용량만 출력',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=8,
+            help='디렉터리 순회/삭제 스레드 수 (기본 8)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='참조 경로 조회와 삭제 단위 (기본 1000)',
+        )
+        parser.add_argument(
+            '--min-age',
+            type=float,
+            default=24,
+            help='이 시간(시간 단위)보다 최근에 수정된 파일은 건너뜀 (기본 24, 저장 중인 파일 보호)',
+        )
+
+    def handle(self, *args, **options):
+        older_than = time.time() - options['min_age'] * 3600
+        batch_size = options['batch_size']
+        dry_run = options['dry_run']
+        empty_directories = []
+        found = Counter()
+        found_bytes = Counter()
+        deleted = deleted_bytes = 0
+
+        orphans = find_orphans(
+            str(settings.MEDIA_ROOT), options['workers'], batch_size, older_than, empty_directories
+        )
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            batch = []
+            for stored in orphans:
+                top = stored.name.split('/', 1)[0]
+                found[top] += 1
+                found_bytes[top] += stored.size
+                if dry_run:
+                    continue
+                batch.append(stored)
+                if len(batch) >= batch_size:
+                    count, size = delete_orphans(default_storage, batch, executor)
+                    deleted, deleted_bytes = deleted + count, deleted_bytes + size
+                    batch = []
+            if batch:
+                count, size = delete_orphans(default_storage, batch, executor)
+                deleted, deleted_bytes = deleted + count, deleted_bytes + size
+
+        for top in sorted(found):
+            self.stdout.write(f'{top}/: 고아 파일 {found[top]:,}개 ({format_size(found_bytes[top])})')
+
+        total, total_bytes = sum(found.values()), sum(found_bytes.values())
+        if dry_run:
+            self.stdout.write(self.style.SUCCESS(
+                f'회수 가능: {total:,}개, {format_size(total_bytes)} (--dry-run, 삭제하지 않음)'
+            ))
+            return
+
+        removed = 0
+        for directory in sorted(empty_directories, key=lambda name: name.count('/'), reverse=True):
+            path = os.path.join(settings.MEDIA_ROOT, directory)
+            try:
+                # 방금 만든(파일 저장 직전의) 디렉터리는 남김
+                if os.stat(path).st_mtime < older_than:
+                    os.rmdir(path)
+                    removed += 1
+            except OSError:
+                continue
+
+        self.stdout.write(self.style.SUCCESS(
+            f'삭제: {deleted:,}개, {format_size(deleted_bytes)} '
+            f'(다시 참조되어 남긴 파일 {total - deleted:,}개, 빈 디렉터리 {removed:,}개 삭제)'
+        ))
@@ -0,0 +1,110 @@
+import multiprocessing
+import os
+import signal
+import socket
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+from media_files.jobs import run_worker
+
+
+class StopFlag:
+    """SIGTERM/SIGINT를 받으면 진행 중인 작업을 마친 뒤 종료하도록 표시"""
+
+    def __init__(self):
+        self.stopped = False
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+    def stop(self, signum, frame):
+        self.stopped = True
+
+    def __call__(self):
+        return self.stopped
+
+
+def worker_main(options):
+    """워커 프로세스 진입점 (프로세스마다 별도 DB 연결 사용)"""
+    django.setup()
+    worker_id = f'{socket.gethostname()}:{os.getpid()}'
+    try:
+        return run_worker(
+            worker_id,
+            options['visibility_timeout'],
+            options['poll_interval'],
+            once=options['once'],
+            should_stop=StopFlag()
+        )
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    """미디어 후처리 작업 큐 워커"""
+
+    help = 'DB 작업 큐에서 미디어 후처리 작업(메타데이터 확인 등)을 가져와 처리합니다. 외부 브로커가 필요 없습니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=1,
+            help='워커 프로세스 수 (기본값: 1)',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='지금 실행할 수 있는 작업을 모두 처리한 뒤 종료',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=settings.MEDIA_JOB_POLL_INTERVAL,
+            help='큐가 비었을 때 다시 확인하기까지의 대기 시간 (초)',
+        )
+        parser.add_argument(
+            '--visibility-timeout',
+            type=int,
+            default=settings.MEDIA_JOB_VISIBILITY_TIMEOUT,
+            help='가져간 작업이 다른 워커에게 보이지 않는 시간 (초). 이 안에 끝나지 않으면 다시 실행됩니다.',
+        )
+
+    def handle(self, *args, **options):
+        processes = max(1, options['processes'])
+        self.stdout.write(f'미디어 후처리 워커 {processes}개를 시작합니다.')
+
+        if processes == 1:
+            processed = worker_main(options)
+            self.stdout.write(self.style.SUCCESS(f'처리한 작업: {processed}개'))
+            return
+
+        # 자식 프로세스가 부모의 DB 연결을 공유하지 않도록 미리 닫음
+        connections.close_all()
+        context = multiprocessing.get_context()
+        worker_options = {
+            key: options[key] for key in ('once', 'poll_interval', 'visibility_timeout')
+        }
+        workers = [
+            context.Process(target=worker_main, args=(worker_options,))
+            for _ in range(processes)
+        ]
+        for worker in workers:
+            worker.start()
+
+        # 종료 신호는 자식에게 전달하고, 자식이 진행 중인 작업을 마칠 때까지 대기
+        def forward(signum, frame):
+            for worker in workers:
+                if worker.is_alive():
+                    os.kill(worker.pid, signal.SIGTERM)
+
+        signal.signal(signal.SIGTERM, forward)
+        signal.signal(signal.SIGINT, forward)
+        for worker in workers:
+            worker.join()
+
+        failed = sum(1 for worker in workers if worker.exitcode)
+        if failed:
+            self.stderr.write(self.style.ERROR(f'비정상 종료된 워커: {failed}개'))
+        else:
+            self.stdout.write(self.style.SUCCESS('모든 워커가 종료되었습니다.'))
@@ -0,0 +1,164 @@
+import errno
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from courses.cache import invalidate_courses
+from courses.models import Course
+from media_files.images import queue_image_variants
+from media_files.models import MediaFile
+
+# (모델, 파일 필드, 추가 조건, 변형 세트). blob 파일은 이미 해시 경로에 있으므로 제외
+RELOCATIONS = [
+    (MediaFile, 'file', {'blob': None}, None),
+    (Course, 'thumbnail', {}, 'course_thumbnail'),
+    (get_user_model(), 'profile_image', {}, 'profile_image'),
+]
+
+
+def link_file(storage, old_name, new_name):
+    """old_name의 파일을 new_name에도 연결 (하드 링크, 다른 파일 시스템이면 복사)
+
+    원본은 DB 경로가 바뀐 뒤에 지우므로 중간에 중단되어도 DB가 가리키는 파일은 남아 있습니다.
+    """
+    source = storage.path(old_name)
+    target = storage.path(new_name)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    try:
+        os.link(source, target)
+    except OSError as error:
+        if error.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+            raise
+        shutil.copy2(source, target)
+
+
+def find_legacy_rows(model, field_name, filters, variant_set):
+    """분산 경로 규칙을 따르지 않는 파일 경로별 행 목록 {기존 경로: [인스턴스, ...]}"""
+    field = model._meta.get_field(field_name)
+    columns = ['pk', field_name]
+    if variant_set:
+        columns.append(f'{field_name}_variants')
+    if model is MediaFile:
+        # media_file_path가 파일 타입을 경로에 사용
+        columns.append('file_type')
+
+    rows = {}
+    queryset = (
+        model.objects.filter(**filters)
+        .exclude(**{field_name: ''})
+        .exclude(**{f'{field_name}__isnull': True})
+    )
+    for instance in queryset.only(*columns).iterator():
+        name = getattr(instance, field_name).name
+        if not field.storage.is_sharded(name):
+            rows.setdefault(name, []).append(instance)
+    return rows
+
+
+class Command(BaseCommand):
+    """업로드 파일을 분산(해시 fan-out) 경로로 옮기고 FileField 경로 일괄 갱신"""
+
+    help = (
+        '날짜/ID 기반 경로에 있는 미디어 파일, 강의 썸네일, 프로필 이미지를 '
+        'upload_to 규칙의 새 경로로 병렬 이동하고 DB 경로를 배치로 갱신합니다.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=8,
+            help='파일을 옮기는 스레드 수 (기본 8)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='한 번에 옮기고 DB에 반영할 파일 수 (기본 500)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='옮기지 않고 대상 파일 수만 출력',
+        )
+
+    def handle(self, *args, **options):
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            for model, field_name, filters, variant_set in RELOCATIONS:
+                rows = find_legacy_rows(model, field_name, filters, variant_set)
+                label = f'{model._meta.verbose_name} {field_name}'
+                if options['dry_run']:
+                    self.stdout.write(f'{label}: 이전 대상 {len(rows)}개')
+                    continue
+
+                names = list(rows)
+                moved = missing = 0
+                for start in range(0, len(names), options['batch_size']):
+                    batch = {name: rows[name] for name in names[start:start + options['batch_size']]}
+                    done, lost = self.relocate_batch(executor, model, field_name, variant_set, batch)
+                    moved += done
+                    missing += lost
+                self.stdout.write(f'{label}: {moved}개 이동, 파일 없음 {missing}개')
+
+        if not options['dry_run']:
+            self.stdout.write(self.style.SUCCESS('경로 이전을 완료했습니다.'))
+
+    def relocate_batch(self, executor, model, field_name, variant_set, batch):
+        """배치의 파일을 병렬로 새 경로에 연결하고, DB 갱신 커밋 후 기존 파일 삭제"""
+        field = model._meta.get_field(field_name)
+        storage = field.storage
+        targets = {
+            name: field.generate_filename(instances[0], os.path.basename(name))
+            for name, instances in batch.items()
+        }
+
+        def link(name):
+            try:
+                link_file(storage, name, targets[name])
+            except FileNotFoundError:
+                return name, False
+            return name, True
+
+        linked = []
+        for name, ok in executor.map(link, batch):
+            if ok:
+                linked.append(name)
+            else:
+                self.stdout.write(self.style.WARNING(f'파일 없음: {name}'))
+
+        variants_field = f'{field_name}_variants'
+        # bulk_update는 auto_now를 갱신하지 않으므로 직접 설정 (ETag/Last-Modified가 바뀌도록)
+        touched = [field.name for field in model._meta.concrete_fields if getattr(field, 'auto_now', False)]
+        now = timezone.now()
+        updated, stale = [], []
+        for name in linked:
+            for instance in batch[name]:
+                setattr(instance, field_name, targets[name])
+                for touched_name in touched:
+                    setattr(instance, touched_name, now)
+                if variant_set:
+                    variants = getattr(instance, variants_field) or {}
+                    if variants.get('source') == name:
+                        # 내용이 같으므로 변형 이미지는 다시 만들지 않고 원본 경로만 갱신
+                        setattr(instance, variants_field, {**variants, 'source': targets[name]})
+                    else:
+                        stale.append(instance)
+                updated.append(instance)
+
+        fields = ([field_name, variants_field] if variant_set else [field_name]) + touched
+        with transaction.atomic():
+            model.objects.bulk_update(updated, fields, batch_size=500)
+            for instance in stale:
+                # 기존 경로로 등록된 생성 작업은 경로가 달라 건너뛰므로 새 경로로 다시 등록
+                queue_image_variants(instance, field_name, variant_set)
+            if model is Course:
+                invalidate_courses(instance.pk for instance in updated)
+            elif field_name == 'profile_image':
+                invalidate_courses(
+                    Course.objects.filter(instructor__in=updated).values_list('pk', flat=True)
+                )
+            transaction.on_commit(lambda: list(executor.map(storage.delete, linked)))
+        return len(linked), len(batch) - len(linked)
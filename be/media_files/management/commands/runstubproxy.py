@@ -0,0 +1,47 @@
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+from media_files.proxy import OffloadStubProxy
+
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class Command(BaseCommand):
+    """전송 위임(X-Accel-Redirect / X-Sendfile)을 처리하는 로컬 스텁 프록시 실행"""
+
+    help = (
+        'Django 앱 앞에 nginx/Apache 역할을 하는 스텁 프록시를 띄웁니다. '
+        'STREAM_DELIVERY_BACKEND가 x-accel-redirect 또는 x-sendfile일 때 로컬 확인용입니다.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'addrport',
+            nargs='?',
+            default='127.0.0.1:8080',
+            help='바인딩 주소:포트 (기본 127.0.0.1:8080)',
+        )
+
+    def handle(self, *args, **options):
+        host, _, port = options['addrport'].rpartition(':')
+        app = OffloadStubProxy(get_wsgi_application())
+        server = make_server(
+            host or '127.0.0.1', int(port), app,
+            server_class=ThreadingWSGIServer,
+            handler_class=WSGIRequestHandler
+        )
+
+        self.stdout.write(
+            f"스텁 프록시 실행: http://{options['addrport']}/ "
+            f"(전송 방식: {settings.STREAM_DELIVERY_BACKEND})"
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
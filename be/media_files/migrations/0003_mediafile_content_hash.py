@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-18 03:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('media_files', '0002_upload_session'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mediafile',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=64, verbose_name='콘텐츠 해시(SHA-256)'),
+        ),
+    ]
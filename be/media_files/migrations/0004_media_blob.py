@@ -0,0 +1,37 @@
+# Generated by Django 5.0.1 on 2026-10-18 03:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('media_files', '0003_mediafile_content_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64, unique=True, verbose_name='콘텐츠 해시(SHA-256)')),
+                ('file', models.FileField(max_length=255, upload_to='', verbose_name='파일')),
+                ('size', models.PositiveBigIntegerField(verbose_name='파일 크기(bytes)')),
+                ('mime_type', models.CharField(blank=True, max_length=100, verbose_name='MIME 타입')),
+                ('ref_count', models.PositiveIntegerField(default=0, verbose_name='참조 수')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일')),
+            ],
+            options={
+                'verbose_name': '저장 파일',
+                'verbose_name_plural': '저장 파일 목록',
+                'db_table': 'media_blobs',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='mediafile',
+            name='blob',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='media_files', to='media_files.mediablob', verbose_name='저장 파일'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.0.1 on 2026-10-18 03:29
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('media_files', '0004_media_blob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mediafile',
+            name='processing_status',
+            field=models.CharField(choices=[('pending', '처리 대기'), ('processing', '처리 중'), ('ready', '처리 완료'), ('failed', '처리 실패')], default='ready', max_length=10, verbose_name='처리 상태'),
+        ),
+        migrations.CreateModel(
+            name='ProcessingJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task', models.CharField(max_length=50, verbose_name='작업')),
+                ('status', models.CharField(choices=[('pending', '대기'), ('running', '실행 중'), ('succeeded', '성공'), ('failed', '실패')], default='pending', max_length=10, verbose_name='상태')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='시도 횟수')),
+                ('max_attempts', models.PositiveSmallIntegerField(default=3, verbose_name='최대 시도 횟수')),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, verbose_name='실행 가능 시각')),
+                ('locked_by', models.CharField(blank=True, max_length=100, verbose_name='처리 워커')),
+                ('locked_until', models.DateTimeField(blank=True, null=True, verbose_name='잠금 만료 시각')),
+                ('last_error', models.TextField(blank=True, verbose_name='마지막 오류')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일')),
+                ('media_file', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='processing_jobs', to='media_files.mediafile', verbose_name='미디어 파일')),
+            ],
+            options={
+                'verbose_name': '후처리 작업',
+                'verbose_name_plural': '후처리 작업 목록',
+                'db_table': 'media_processing_jobs',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'run_after'], name='media_proce_status_b97097_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.1 on 2026-10-18 03:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('media_files', '0005_processing_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mediafile',
+            name='duration',
+            field=models.FloatField(blank=True, null=True, verbose_name='재생시간(초)'),
+        ),
+        migrations.AddField(
+            model_name='mediafile',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='높이(px)'),
+        ),
+        migrations.AddField(
+            model_name='mediafile',
+            name='video_codec',
+            field=models.CharField(blank=True, max_length=20, verbose_name='비디오 코덱'),
+        ),
+        migrations.AddField(
+            model_name='mediafile',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='너비(px)'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.0.1 on 2026-10-18 03:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('media_files', '0006_video_metadata'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KeyframeIndex',
+            fields=[
+                ('media_file', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='keyframe_index', serialize=False, to='media_files.mediafile', verbose_name='미디어 파일')),
+                ('data', models.BinaryField(verbose_name='색인 데이터')),
+                ('keyframe_count', models.PositiveIntegerField(default=0, verbose_name='키프레임 수')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일')),
+            ],
+            options={
+                'verbose_name': '키프레임 색인',
+                'verbose_name_plural': '키프레임 색인 목록',
+                'db_table': 'media_keyframe_indexes',
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.1 on 2026-10-18 03:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('media_files', '0007_keyframe_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='processingjob',
+            name='payload',
+            field=models.JSONField(blank=True, default=dict, verbose_name='작업 인자'),
+        ),
+        migrations.AlterField(
+            model_name='processingjob',
+            name='media_file',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='processing_jobs', to='media_files.mediafile', verbose_name='미디어 파일'),
+        ),
+    ]
@@ -1,38 +1,73 @@
 from django.db import models
 from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
+from django.utils import timezone
 import os
-from datetime import datetime
+import uuid
+from .storage import upload_path
 
 
 def media_file_path(instance, filename):
-    """미디어 파일 저장 경로"""
-    today = datetime.now()
-    ext = os.path.splitext(filename)[1]
-    unique_filename = f'{instance.id}_{today.strftime("%Y%m%d%H%M%S")}{ext}'
-    return f'media/{instance.file_type}/{today.year}/{today.month:02d}/{unique_filename}'
+    """미디어 파일 저장 경로 (media/<파일 타입>/ab/cd/<uuid>.<확장자>)"""
+    return upload_path(f'media/{instance.file_type or "other"}', filename)
 
 
-def validate_file_size(file):
-    """파일 크기 검증"""
-    ext = os.path.splitext(file.name)[1].lower()
+FILE_TYPE_LABELS = {
+    'video': '비디오',
+    'document': '문서',
+    'image': '이미지',
+}
 
+
+def get_file_type(filename):
+    """확장자로 파일 타입 판별 (지원하지 않으면 None)"""
+    ext = os.path.splitext(filename)[1].lower()
     if ext in settings.ALLOWED_VIDEO_EXTENSIONS:
-        max_size = settings.MAX_VIDEO_SIZE
-        file_type = '비디오'
-    elif ext in settings.ALLOWED_DOCUMENT_EXTENSIONS:
-        max_size = settings.MAX_DOCUMENT_SIZE
-        file_type = '문서'
-    elif ext in settings.ALLOWED_IMAGE_EXTENSIONS:
-        max_size = settings.MAX_IMAGE_SIZE
-        file_type = '이미지'
-    else:
+        return 'video'
+    if ext in settings.ALLOWED_DOCUMENT_EXTENSIONS:
+        return 'document'
+    if ext in settings.ALLOWED_IMAGE_EXTENSIONS:
+        return 'image'
+    return None
+
+
+def is_public_media(name):
+    """MEDIA_URL로 직접 공개할 수 있는 파일인지 (비디오는 서명된 스트리밍 URL로만 전송)"""
+    return get_file_type(name) != 'video'
+
+
+def get_allowed_extensions(file_type):
+    """파일 타입별 허용 확장자"""
+    return {
+        'video': settings.ALLOWED_VIDEO_EXTENSIONS,
+        'document': settings.ALLOWED_DOCUMENT_EXTENSIONS,
+        'image': settings.ALLOWED_IMAGE_EXTENSIONS,
+    }[file_type]
+
+
+def get_size_limit(file_type):
+    """파일 타입별 최대 크기 (bytes)"""
+    return {
+        'video': settings.MAX_VIDEO_SIZE,
+        'document': settings.MAX_DOCUMENT_SIZE,
+        'image': settings.MAX_IMAGE_SIZE,
+    }[file_type]
+
+
+def size_limit_message(file_type):
+    max_size = get_size_limit(file_type)
+    return f'{FILE_TYPE_LABELS[file_type]} 파일 크기는 {max_size // (1024*1024)}MB를 초과할 수 없습니다.'
+
+
+def validate_file_size(file):
+    """파일 크기 검증"""
+    file_type = get_file_type(file.name)
+    if file_type is None:
         raise ValidationError('지원하지 않는 파일 형식입니다.')
 
-    if file.size > max_size:
-        raise ValidationError(
-            f'{file_type} 파일 크기는 {max_size // (1024*1024)}MB를 초과할 수 없습니다.'
-        )
+    if file.size > get_size_limit(file_type):
+        raise ValidationError(size_limit_message(file_type))
 
 
 def validate_file_extension(file):
@@ -50,6 +85,37 @@ def validate_file_extension(file):
         )
 
 
+def media_blob_path(content_hash, ext=''):
+    """해시 기반 blob 저장 경로 (해시 앞부분으로 분산)"""
+    return default_storage.shard_path('blobs', content_hash, ext.lower())
+
+
+class MediaBlob(models.Model):
+    """내용 기반(content-addressed) 저장 파일
+
+    같은 내용의 파일은 SHA-256 해시로 한 번만 저장되고, 여러 MediaFile이 참조합니다.
+    ref_count가 0이 되면 파일과 함께 삭제됩니다.
+    """
+
+    content_hash = models.CharField('콘텐츠 해시(SHA-256)', max_length=64, unique=True)
+    file = models.FileField('파일', max_length=255)
+    size = models.PositiveBigIntegerField('파일 크기(bytes)')
+    mime_type = models.CharField('MIME 타입', max_length=100, blank=True)
+    ref_count = models.PositiveIntegerField('참조 수', default=0)
+
+    # 타임스탬프
+    created_at = models.DateTimeField('생성일', auto_now_add=True)
+
+    class Meta:
+        db_table = 'media_blobs'
+        verbose_name = '저장 파일'
+        verbose_name_plural = '저장 파일 목록'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return self.content_hash
+
+
 class MediaFile(models.Model):
     """미디어 파일 모델 (비디오, 문서 등)"""
 
@@ -59,6 +125,13 @@ class MediaFile(models.Model):
         ('image', '이미지'),
     ]
 
+    PROCESSING_STATUS_CHOICES = [
+        ('pending', '처리 대기'),
+        ('processing', '처리 중'),
+        ('ready', '처리 완료'),
+        ('failed', '처리 실패'),
+    ]
+
     uploaded_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -75,8 +148,31 @@ class MediaFile(models.Model):
     # 메타데이터
     file_size = models.PositiveBigIntegerField('파일 크기(bytes)', default=0)
     mime_type = models.CharField('MIME 타입', max_length=100, blank=True)
+    content_hash = models.CharField('콘텐츠 해시(SHA-256)', max_length=64, blank=True, db_index=True)
+    blob = models.ForeignKey(
+        MediaBlob,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='media_files',
+        verbose_name='저장 파일'
+    )
     original_filename = models.CharField('원본 파일명', max_length=255)
 
+    # 비디오 메타데이터 (후처리 작업에서 컨테이너 헤더를 읽어 기록)
+    duration = models.FloatField('재생시간(초)', null=True, blank=True)
+    width = models.PositiveIntegerField('너비(px)', null=True, blank=True)
+    height = models.PositiveIntegerField('높이(px)', null=True, blank=True)
+    video_codec = models.CharField('비디오 코덱', max_length=20, blank=True)
+
+    # 후처리 상태 (업로드 후 워커가 처리)
+    processing_status = models.CharField(
+        '처리 상태',
+        max_length=10,
+        choices=PROCESSING_STATUS_CHOICES,
+        default='ready'
+    )
+
     # 타임스탬프
     uploaded_at = models.DateTimeField('업로드일', auto_now_add=True)
 
@@ -94,18 +190,139 @@ class MediaFile(models.Model):
         return self.original_filename
 
     def save(self, *args, **kwargs):
-        """저장 시 메타데이터 자동 설정"""
-        if self.file:
+        """새 파일 저장 시 메타데이터 자동 설정 (이미 저장된 파일은 그대로 유지)"""
+        if self.file and not self.file._committed:
             self.file_size = self.file.size
             self.original_filename = self.file.name
 
             # 파일 타입 자동 감지
-            ext = os.path.splitext(self.file.name)[1].lower()
-            if ext in settings.ALLOWED_VIDEO_EXTENSIONS:
-                self.file_type = 'video'
-            elif ext in settings.ALLOWED_DOCUMENT_EXTENSIONS:
-                self.file_type = 'document'
-            elif ext in settings.ALLOWED_IMAGE_EXTENSIONS:
-                self.file_type = 'image'
+            self.file_type = get_file_type(self.file.name) or self.file_type
 
         super().save(*args, **kwargs)
+
+
+class KeyframeIndex(models.Model):
+    """MP4 비디오의 키프레임 색인 (시간 기반 탐색용)
+
+    키프레임 시각(float64)과 바이트 위치(uint64) 배열을 이어 붙인 little-endian 바이너리로 저장합니다.
+    미디어 파일 목록 조회 시 함께 읽지 않도록 별도 테이블에 둡니다.
+    """
+
+    media_file = models.OneToOneField(
+        MediaFile,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='keyframe_index',
+        verbose_name='미디어 파일'
+    )
+    data = models.BinaryField('색인 데이터')
+    keyframe_count = models.PositiveIntegerField('키프레임 수', default=0)
+
+    # 타임스탬프
+    created_at = models.DateTimeField('생성일', auto_now_add=True)
+
+    class Meta:
+        db_table = 'media_keyframe_indexes'
+        verbose_name = '키프레임 색인'
+        verbose_name_plural = '키프레임 색인 목록'
+
+    def __str__(self):
+        return f'{self.media_file_id} ({self.keyframe_count})'
+
+
+class UploadSession(models.Model):
+    """재개 가능한 분할 업로드 세션
+
+    청크는 스테이징 파일에 이어 붙이고, 완료 시 blob 경로로 옮겨 MediaFile을 생성합니다.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    uploaded_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='upload_sessions',
+        verbose_name='업로더'
+    )
+    filename = models.CharField('원본 파일명', max_length=255)
+    file_size = models.PositiveBigIntegerField('전체 크기(bytes)')
+    offset = models.PositiveBigIntegerField('업로드된 크기(bytes)', default=0)
+    media_file = models.OneToOneField(
+        MediaFile,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='upload_session',
+        verbose_name='미디어 파일'
+    )
+
+    # 타임스탬프
+    created_at = models.DateTimeField('생성일', auto_now_add=True)
+    updated_at = models.DateTimeField('수정일', auto_now=True)
+
+    class Meta:
+        db_table = 'upload_sessions'
+        verbose_name = '업로드 세션'
+        verbose_name_plural = '업로드 세션 목록'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f'{self.filename} ({self.offset}/{self.file_size})'
+
+    @property
+    def staging_path(self):
+        """청크를 이어 붙이는 임시 파일 경로"""
+        return os.path.join(settings.MEDIA_ROOT, settings.UPLOAD_STAGING_DIR, f'{self.id}.part')
+
+    @property
+    def is_complete(self):
+        return self.media_file_id is not None
+
+
+class ProcessingJob(models.Model):
+    """미디어 파일 후처리 작업 (DB 기반 작업 큐)
+
+    미디어 파일 후처리 외의 작업(이미지 변형 생성 등)은 media_file 없이 payload를 인자로 실행됩니다.
+    워커(process_media_jobs)가 대기 중인 작업을 가져가면 locked_until까지 다른 워커에게 보이지 않으며,
+    그 안에 끝나지 않으면(워커 중단 등) 다시 가져갈 수 있습니다. 실패하면 지연 후 max_attempts까지 재시도합니다.
+    """
+
+    STATUS_CHOICES = [
+        ('pending', '대기'),
+        ('running', '실행 중'),
+        ('succeeded', '성공'),
+        ('failed', '실패'),
+    ]
+
+    media_file = models.ForeignKey(
+        MediaFile,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='processing_jobs',
+        verbose_name='미디어 파일'
+    )
+    task = models.CharField('작업', max_length=50)
+    payload = models.JSONField('작업 인자', default=dict, blank=True)
+    status = models.CharField('상태', max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField('시도 횟수', default=0)
+    max_attempts = models.PositiveSmallIntegerField('최대 시도 횟수', default=3)
+    run_after = models.DateTimeField('실행 가능 시각', default=timezone.now)
+    locked_by = models.CharField('처리 워커', max_length=100, blank=True)
+    locked_until = models.DateTimeField('잠금 만료 시각', null=True, blank=True)
+    last_error = models.TextField('마지막 오류', blank=True)
+
+    # 타임스탬프
+    created_at = models.DateTimeField('생성일', auto_now_add=True)
+    updated_at = models.DateTimeField('수정일', auto_now=True)
+
+    class Meta:
+        db_table = 'media_processing_jobs'
+        verbose_name = '후처리 작업'
+        verbose_name_plural = '후처리 작업 목록'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'run_after']),
+        ]
+
+    def __str__(self):
+        return f'{self.task} ({self.media_file_id or self.payload})'
@@ -0,0 +1,280 @@
+import struct
+from collections import namedtuple
+
+MediaInfo = namedtuple('MediaInfo', ['duration', 'width', 'height', 'codec'])
+
+
+class ProbeError(ValueError):
+    """컨테이너 구조를 해석할 수 없음"""
+
+
+def read_exact(file, size):
+    data = file.read(size)
+    if len(data) != size:
+        raise ProbeError('파일이 중간에 끝났습니다.')
+    return data
+
+
+def file_length(file):
+    file.seek(0, 2)
+    return file.tell()
+
+
+# ---------------------------------------------------------------------------
+# MP4 / MOV (ISO base media file format)
+# ---------------------------------------------------------------------------
+
+def iter_boxes(file, start, end):
+    """start~end 구간의 box를 (타입, 내용 시작, 내용 끝)으로 순회
+
+    box 헤더(8~16 bytes)만 읽고 내용은 건너뛰므로, moov가 mdat 뒤에 있어도 mdat은 읽지 않습니다.
+    """
+    offset = start
+    while offset + 8 <= end:
+        file.seek(offset)
+        size, box_type = struct.unpack('>I4s', read_exact(file, 8))
+        header = 8
+        if size == 1:
+            size = struct.unpack('>Q', read_exact(file, 8))[0]
+            header = 16
+        elif size == 0:
+            size = end - offset
+        if size < header:
+            raise ProbeError('box 크기가 올바르지 않습니다.')
+
+        yield box_type, offset + header, min(offset + size, end)
+        offset += size
+
+
+def read_box(file, start, end, limit):
+    """box 내용 앞부분(최대 limit bytes) 읽기"""
+    file.seek(start)
+    return file.read(min(end - start, limit))
+
+
+def parse_mvhd(data):
+    """movie header: (timescale, duration)"""
+    if data[:1] == b'\x01':
+        timescale, duration = struct.unpack_from('>IQ', data, 20)
+        unknown = duration == 0xFFFFFFFFFFFFFFFF
+    else:
+        timescale, duration = struct.unpack_from('>II', data, 12)
+        unknown = duration == 0xFFFFFFFF
+    return timescale, 0 if unknown else duration
+
+
+def parse_tkhd(data):
+    """track header: 표시 크기 (16.16 고정소수점)"""
+    offset = 88 if data[:1] == b'\x01' else 76
+    width, height = struct.unpack_from('>II', data, offset)
+    return width >> 16, height >> 16
+
+
+def parse_trak(file, start, end):
+    """트랙의 (handler 타입, 너비, 높이, 코덱 fourcc)"""
+    handler, width, height, codec = b'', None, None, ''
+    for box_type, box_start, box_end in iter_boxes(file, start, end):
+        if box_type == b'tkhd':
+            width, height = parse_tkhd(read_box(file, box_start, box_end, 96))
+        elif box_type == b'mdia':
+            for child_type, child_start, child_end in iter_boxes(file, box_start, box_end):
+                if child_type == b'hdlr':
+                    handler = read_box(file, child_start, child_end, 12)[8:12]
+                elif child_type == b'minf':
+                    codec = parse_minf(file, child_start, child_end)
+    return handler, width, height, codec
+
+
+def parse_minf(file, start, end):
+    """minf/stbl/stsd의 첫 번째 샘플 항목 형식 (샘플 테이블 stts/stsz/stco는 읽지 않음)"""
+    for box_type, box_start, box_end in iter_boxes(file, start, end):
+        if box_type == b'stbl':
+            for child_type, child_start, child_end in iter_boxes(file, box_start, box_end):
+                if child_type == b'stsd':
+                    data = read_box(file, child_start, child_end, 16)
+                    if len(data) == 16:
+                        return data[12:16].decode('latin-1').strip()
+    return ''
+
+
+def probe_mp4(file, size):
+    """moov의 mvhd(재생시간)와 비디오 트랙의 tkhd/stsd(해상도, 코덱)만 읽어 MediaInfo 반환"""
+    for box_type, start, end in iter_boxes(file, 0, size):
+        if box_type == b'moov':
+            break
+    else:
+        raise ProbeError('moov box가 없습니다.')
+
+    timescale = duration = 0
+    fragment_duration = 0
+    video = None
+    for box_type, box_start, box_end in iter_boxes(file, start, end):
+        if box_type == b'mvhd':
+            timescale, duration = parse_mvhd(read_box(file, box_start, box_end, 32))
+        elif box_type == b'trak' and video is None:
+            handler, width, height, codec = parse_trak(file, box_start, box_end)
+            if handler == b'vide':
+                video = (width, height, codec)
+        elif box_type == b'mvex':
+            # 조각(fragmented) MP4는 mvhd 대신 mehd에 전체 재생시간을 기록
+            for child_type, child_start, child_end in iter_boxes(file, box_start, box_end):
+                if child_type == b'mehd':
+                    data = read_box(file, child_start, child_end, 12)
+                    fmt = '>Q' if data[:1] == b'\x01' else '>I'
+                    fragment_duration = struct.unpack_from(fmt, data, 4)[0]
+
+    duration = duration or fragment_duration
+    width, height, codec = video or (None, None, '')
+    return MediaInfo(
+        duration=duration / timescale if timescale and duration else None,
+        width=width or None,
+        height=height or None,
+        codec=codec
+    )
+
+
+# ---------------------------------------------------------------------------
+# WebM / Matroska (EBML)
+# ---------------------------------------------------------------------------
+
+EBML_HEADER = 0x1A45DFA3
+SEGMENT = 0x18538067
+INFO = 0x1549A966
+TIMECODE_SCALE = 0x2AD7B1
+DURATION = 0x4489
+TRACKS = 0x1654AE6B
+TRACK_ENTRY = 0xAE
+TRACK_TYPE = 0x83
+CODEC_ID = 0x86
+VIDEO = 0xE0
+PIXEL_WIDTH = 0xB0
+PIXEL_HEIGHT = 0xBA
+CLUSTER = 0x1F43B675
+
+VIDEO_TRACK = 1
+DEFAULT_TIMECODE_SCALE = 1_000_000  # ns
+
+
+def read_vint(file, keep_marker=False):
+    """EBML 가변 길이 정수 (ID는 marker 비트 포함, 크기는 제외). 알 수 없는 크기는 None"""
+    first = read_exact(file, 1)[0]
+    if not first:
+        raise ProbeError('EBML 가변 길이 정수가 올바르지 않습니다.')
+    length = 9 - first.bit_length()
+    value = first if keep_marker else first & (0xFF >> length)
+    all_ones = value == 0xFF >> length
+    for byte in read_exact(file, length - 1):
+        value = value << 8 | byte
+        all_ones = all_ones and byte == 0xFF
+    if all_ones and not keep_marker:
+        return None, length
+    return value, length
+
+
+def iter_elements(file, start, end):
+    """start~end 구간의 EBML 요소를 (ID, 내용 시작, 내용 끝)으로 순회 (내용은 읽지 않음)
+
+    크기를 알 수 없는 요소(스트리밍으로 기록된 Segment/Cluster)는 구간 끝까지로 보고 순회를 멈춥니다.
+    """
+    offset = start
+    while offset < end:
+        file.seek(offset)
+        element_id, id_length = read_vint(file, keep_marker=True)
+        size, size_length = read_vint(file)
+        data_start = offset + id_length + size_length
+        if size is None:
+            yield element_id, data_start, end
+            return
+        yield element_id, data_start, min(data_start + size, end)
+        offset = data_start + size
+
+
+def read_uint(file, start, end):
+    file.seek(start)
+    return int.from_bytes(read_exact(file, min(end - start, 8)), 'big')
+
+
+def read_float(file, start, end):
+    file.seek(start)
+    if end - start == 4:
+        return struct.unpack('>f', read_exact(file, 4))[0]
+    if end - start == 8:
+        return struct.unpack('>d', read_exact(file, 8))[0]
+    raise ProbeError('EBML 실수 길이가 올바르지 않습니다.')
+
+
+def parse_track_entry(file, start, end):
+    """트랙의 (타입, 코덱 ID, 너비, 높이)"""
+    track_type, codec, width, height = None, '', None, None
+    for element_id, data_start, data_end in iter_elements(file, start, end):
+        if element_id == TRACK_TYPE:
+            track_type = read_uint(file, data_start, data_end)
+        elif element_id == CODEC_ID:
+            file.seek(data_start)
+            codec = file.read(min(data_end - data_start, 32)).rstrip(b'\x00').decode('ascii', 'replace')
+        elif element_id == VIDEO:
+            for child_id, child_start, child_end in iter_elements(file, data_start, data_end):
+                if child_id == PIXEL_WIDTH:
+                    width = read_uint(file, child_start, child_end)
+                elif child_id == PIXEL_HEIGHT:
+                    height = read_uint(file, child_start, child_end)
+    return track_type, codec, width, height
+
+
+def probe_webm(file, size):
+    """Segment의 Info(재생시간)와 Tracks(해상도, 코덱)만 읽어 MediaInfo 반환 (Cluster 전에서 멈춤)"""
+    elements = iter_elements(file, 0, size)
+    header = next(elements, None)
+    if header is None or header[0] != EBML_HEADER:
+        raise ProbeError('EBML 헤더가 없습니다.')
+
+    for element_id, segment_start, segment_end in elements:
+        if element_id == SEGMENT:
+            break
+    else:
+        raise ProbeError('Segment가 없습니다.')
+
+    scale, duration, video = DEFAULT_TIMECODE_SCALE, None, None
+    for element_id, start, end in iter_elements(file, segment_start, segment_end):
+        if element_id == INFO:
+            for child_id, child_start, child_end in iter_elements(file, start, end):
+                if child_id == TIMECODE_SCALE:
+                    scale = read_uint(file, child_start, child_end)
+                elif child_id == DURATION:
+                    duration = read_float(file, child_start, child_end)
+        elif element_id == TRACKS:
+            for child_id, child_start, child_end in iter_elements(file, start, end):
+                if child_id == TRACK_ENTRY and video is None:
+                    track_type, codec, width, height = parse_track_entry(file, child_start, child_end)
+                    if track_type == VIDEO_TRACK:
+                        video = (width, height, codec)
+        elif element_id == CLUSTER:
+            # 메타데이터는 미디어 데이터(Cluster)보다 앞에 기록됨
+            break
+
+    width, height, codec = video or (None, None, '')
+    return MediaInfo(
+        duration=duration * scale / 1e9 if duration else None,
+        width=width,
+        height=height,
+        codec=codec[2:].lower() if codec.startswith('V_') else codec.lower()
+    )
+
+
+MP4_TOP_LEVEL_BOXES = {b'ftyp', b'moov', b'mdat', b'free', b'wide', b'skip'}
+
+
+def probe_media(file):
+    """비디오 파일의 재생시간/해상도/코덱 (지원하지 않는 형식이면 None)
+
+    파일 전체를 읽지 않고 컨테이너 헤더만 seek하며 읽습니다. (MP4/MOV, WebM/Matroska)
+    구조가 손상되었으면 ProbeError가 발생합니다.
+    """
+    size = file_length(file)
+    file.seek(0)
+    head = file.read(8)
+    if head[4:8] in MP4_TOP_LEVEL_BOXES:
+        return probe_mp4(file, size)
+    if head[:4] == b'\x1a\x45\xdf\xa3':
+        return probe_webm(file, size)
+    return None
@@ -0,0 +1,101 @@
+import os
+import secrets
+from urllib.parse import unquote
+from django.conf import settings
+from .delivery import OFFLOAD_HEADERS
+from .streaming import (
+    RANGE_UNIT, get_block_size, iter_ranges, multipart_length, parse_range_header
+)
+
+PASSTHROUGH_HEADERS = ['content-type', 'etag', 'last-modified', 'cache-control']
+
+
+class OffloadStubProxy:
+    """X-Accel-Redirect / X-Sendfile 응답을 대신 처리하는 로컬 테스트용 WSGI 프록시
+
+    앞단 nginx/Apache 없이도 전송 위임 설정을 확인할 수 있도록 Django 응답의 위임 헤더를 읽어
+    MEDIA_ROOT 아래의 파일을 Range 요청에 맞게 직접 전송합니다. 운영 환경용이 아닙니다.
+    """
+
+    def __init__(self, app, media_root=None):
+        self.app = app
+        self.media_root = os.path.realpath(media_root or settings.MEDIA_ROOT)
+
+    def __call__(self, environ, start_response):
+        upstream = {}
+
+        def capture(status, headers, exc_info=None):
+            upstream['status'] = status
+            upstream['headers'] = headers
+            return lambda data: None
+
+        body = self.app(environ, capture)
+        headers = {name.lower(): value for name, value in upstream['headers']}
+        offload = next((name for name in OFFLOAD_HEADERS if name.lower() in headers), None)
+        if offload is None:
+            start_response(upstream['status'], upstream['headers'])
+            return body
+
+        if hasattr(body, 'close'):
+            body.close()
+
+        path = self.resolve(offload, headers[offload.lower()])
+        if path is None:
+            start_response('404 Not Found', [('Content-Type', 'text/plain')])
+            return [b'Not Found']
+        return self.serve_file(environ, start_response, path, headers)
+
+    def resolve(self, header, value):
+        """위임 헤더 값을 MEDIA_ROOT 아래의 실제 파일 경로로 변환 (벗어나면 None)"""
+        if header == 'X-Accel-Redirect':
+            prefix = settings.STREAM_ACCEL_REDIRECT_PREFIX
+            if not value.startswith(prefix):
+                return None
+            value = os.path.join(self.media_root, unquote(value[len(prefix):]))
+
+        path = os.path.realpath(value)
+        if not path.startswith(self.media_root + os.sep) or not os.path.isfile(path):
+            return None
+        return path
+
+    def serve_file(self, environ, start_response, path, upstream_headers):
+        """프록시처럼 Range / If-Range를 처리하여 파일 전송"""
+        size = os.path.getsize(path)
+        content_type = upstream_headers.get('content-type', 'application/octet-stream')
+        headers = [
+            (name.title(), upstream_headers[name])
+            for name in PASSTHROUGH_HEADERS if name in upstream_headers
+        ]
+        headers.append(('Accept-Ranges', RANGE_UNIT))
+
+        ranges = None
+        if_range = environ.get('HTTP_IF_RANGE')
+        if not if_range or if_range in (upstream_headers.get('etag'), upstream_headers.get('last-modified')):
+            ranges = parse_range_header(environ.get('HTTP_RANGE', ''), size)
+
+        if ranges == []:
+            start_response('416 Range Not Satisfiable', [
+                ('Content-Range', f'{RANGE_UNIT} */{size}'), ('Content-Length', '0')
+            ])
+            return [b'']
+
+        boundary = None
+        if ranges is None:
+            status = '200 OK'
+            ranges = [(0, size - 1)] if size else []
+            length = size
+        elif len(ranges) == 1:
+            status = '206 Partial Content'
+            start, end = ranges[0]
+            length = end - start + 1
+            headers.append(('Content-Range', f'{RANGE_UNIT} {start}-{end}/{size}'))
+        else:
+            status = '206 Partial Content'
+            boundary = secrets.token_hex(16)
+            length = multipart_length(ranges, boundary, content_type, size)
+            headers = [(name, value) for name, value in headers if name != 'Content-Type']
+            headers.append(('Content-Type', f'multipart/byteranges; boundary={boundary}'))
+
+        headers.append(('Content-Length', str(length)))
+        start_response(status, headers)
+        return iter_ranges(open(path, 'rb'), ranges, size, content_type, get_block_size(), boundary)
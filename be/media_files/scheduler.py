@@ -0,0 +1,207 @@
+import threading
+import time
+from collections import Counter
+from django.conf import settings
+
+
+class TokenBucket:
+    """초당 rate bytes를 허용하는 토큰 버킷 (예약 방식, rate가 0이면 제한 없음)
+
+    요청한 순서대로 전송 시각을 배정하므로, 여러 스트림이 한 버킷을 나눠 쓰면
+    청크 단위로 번갈아 전송되어 활성 스트림끼리 대역폭이 공평하게 나뉩니다.
+    쉬고 있던 버킷은 최대 1초 분량(burst)까지 기다리지 않고 보낼 수 있습니다.
+    """
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.available_at = 0.0
+        self.lock = threading.Lock()
+
+    def reserve(self, size, now):
+        """size bytes를 보내기 전에 기다려야 하는 시간 (초)"""
+        if not self.rate:
+            return 0.0
+        with self.lock:
+            start = max(self.available_at, now - 1.0)
+            self.available_at = start + size / self.rate
+            return max(self.available_at - now, 0.0)
+
+
+class StreamSlot:
+    """열려 있는 스트림 하나 (연결별 버킷과 사용자 버킷을 가짐)"""
+
+    def __init__(self, scheduler, client):
+        self.scheduler = scheduler
+        self.client = client
+        self.bucket = TokenBucket(scheduler.connection_rate)
+        self.closed = False
+
+    def close(self):
+        self.scheduler.release(self)
+
+
+class ThrottledStream:
+    """응답 본문 청크를 스케줄러가 배정한 시각에 맞춰 내보내는 반복자
+
+    응답이 끝나거나 연결이 끊겨 WSGI 서버가 close()를 호출하면 스트림 자리를 반납합니다.
+    """
+
+    def __init__(self, slot, chunks):
+        self.slot = slot
+        self.chunks = iter(chunks)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            chunk = next(self.chunks)
+        except StopIteration:
+            self.close()
+            raise
+        self.slot.scheduler.wait(self.slot, len(chunk))
+        return chunk
+
+    def close(self):
+        close = getattr(self.chunks, 'close', None)
+        if close is not None:
+            close()
+        self.slot.close()
+
+
+class StreamScheduler:
+    """스트리밍 전송 스케줄러 (프로세스 내 상태)
+
+    - 연결별 대역폭 상한 (connection_rate)
+    - 사용자별 대역폭 상한 (user_rate, 같은 사용자의 스트림이 나눠 씀)
+    - 전체 대역폭 (global_rate, 활성 스트림이 청크 단위로 번갈아 사용)
+    - 사용자별/전체 동시 스트림 수 (max_user_streams, max_streams)
+    값이 0이면 해당 제한을 두지 않습니다. 워커 프로세스마다 따로 적용됩니다.
+    대역폭 제한은 워커가 본문을 직접 내보내는 응답에만 적용되고, sendfile 응답은 동시 스트림 수만 셉니다.
+    clock/sleep은 테스트에서 고정 시계를 넣을 때 바꿉니다.
+    """
+
+    def __init__(self, connection_rate=0, user_rate=0, global_rate=0, max_user_streams=0, max_streams=0,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.config = (connection_rate, user_rate, global_rate, max_user_streams, max_streams)
+        self.clock = clock
+        self.sleep = sleep
+        self.connection_rate = connection_rate
+        self.user_rate = user_rate
+        self.max_user_streams = max_user_streams
+        self.max_streams = max_streams
+        self.global_bucket = TokenBucket(global_rate)
+        self.user_buckets = {}
+        self.user_streams = Counter()
+        self.lock = threading.Lock()
+        self.counters = Counter()
+
+    @property
+    def enabled(self):
+        return any(self.config)
+
+    def open(self, client):
+        """client(사용자/IP)의 스트림 자리 확보 (동시 스트림 수를 넘으면 None)"""
+        with self.lock:
+            active = sum(self.user_streams.values())
+            if (self.max_streams and active >= self.max_streams) or \
+                    (self.max_user_streams and self.user_streams[client] >= self.max_user_streams):
+                self.counters['streams_rejected'] += 1
+                return None
+
+            self.user_streams[client] += 1
+            if client not in self.user_buckets:
+                self.user_buckets[client] = TokenBucket(self.user_rate)
+            self.counters['streams_opened'] += 1
+        return StreamSlot(self, client)
+
+    def release(self, slot):
+        with self.lock:
+            if slot.closed:
+                return
+            slot.closed = True
+            self.user_streams[slot.client] -= 1
+            if self.user_streams[slot.client] <= 0:
+                del self.user_streams[slot.client]
+                del self.user_buckets[slot.client]
+
+    def wait(self, slot, size):
+        """size bytes를 보낼 차례까지 대기 (연결/사용자/전체 버킷 중 가장 늦은 시각)"""
+        now = self.clock()
+        user_bucket = self.user_buckets.get(slot.client)
+        delay = max(
+            slot.bucket.reserve(size, now),
+            user_bucket.reserve(size, now) if user_bucket is not None else 0.0,
+            self.global_bucket.reserve(size, now)
+        )
+        if delay > 0:
+            self.sleep(delay)
+        with self.lock:
+            self.counters['bytes_sent'] += size
+            if delay > 0:
+                self.counters['throttled_chunks'] += 1
+                self.counters['throttled_seconds'] += delay
+
+    def throttle(self, slot, chunks):
+        return ThrottledStream(slot, chunks)
+
+    def attach(self, slot, response):
+        """응답에 스트림 자리를 연결 (응답이 닫히면 반납)
+
+        sendfile 응답(file_to_stream)은 본문을 감싸면 WSGI 서버의 file_wrapper를 못 쓰게 되므로
+        그대로 두고 자리만 잡아 둡니다. 워커가 직접 내보내는 스트리밍 응답만 대역폭을 제한합니다.
+        """
+        if getattr(response, 'file_to_stream', None) is not None:
+            response._resource_closers.append(slot.close)
+        elif response.streaming:
+            response.streaming_content = self.throttle(slot, response.streaming_content)
+        else:
+            slot.close()
+        return response
+
+    def get_stats(self):
+        """모니터링용 카운터 (이 프로세스 기준)"""
+        with self.lock:
+            return {
+                'active_streams': sum(self.user_streams.values()),
+                'active_clients': len(self.user_streams),
+                'streams_opened': self.counters['streams_opened'],
+                'streams_rejected': self.counters['streams_rejected'],
+                'bytes_sent': self.counters['bytes_sent'],
+                'throttled_chunks': self.counters['throttled_chunks'],
+                'throttled_seconds': round(self.counters['throttled_seconds'], 3),
+                'limits': {
+                    'connection_rate': self.connection_rate,
+                    'user_rate': self.user_rate,
+                    'global_rate': self.global_bucket.rate,
+                    'max_user_streams': self.max_user_streams,
+                    'max_streams': self.max_streams,
+                },
+            }
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_stream_scheduler():
+    """설정(STREAM_*_RATE, STREAM_MAX_*_STREAMS)에 맞는 프로세스 공용 스케줄러"""
+    global _scheduler
+    config = (
+        settings.STREAM_CONNECTION_RATE,
+        settings.STREAM_USER_RATE,
+        settings.STREAM_GLOBAL_RATE,
+        settings.STREAM_MAX_USER_STREAMS,
+        settings.STREAM_MAX_STREAMS,
+    )
+    with _scheduler_lock:
+        if _scheduler is None or _scheduler.config != config:
+            _scheduler = StreamScheduler(*config)
+        return _scheduler
+
+
+def stream_client_key(request, user_id=None):
+    """동시 스트림/사용자 대역폭을 묶는 기준 (서명된 사용자 ID, 없으면 클라이언트 IP)"""
+    if user_id is not None:
+        return f'user:{user_id}'
+    return f'ip:{request.META.get("REMOTE_ADDR", "")}'
@@ -1,6 +1,10 @@
 from rest_framework import serializers
-from .models import MediaFile
+import os
+from types import SimpleNamespace
+from .models import MediaFile, UploadSession, validate_file_extension, validate_file_size
 from accounts.serializers import UserSerializer
+from .blobs import store_upload
+from .signing import build_stream_url
 
 
 class MediaFileSerializer(serializers.ModelSerializer):
@@ -14,26 +18,38 @@ class MediaFileSerializer(serializers.ModelSerializer):
         model = MediaFile
         fields = [
             'id', 'file', 'file_type', 'file_size',
-            'mime_type', 'original_filename', 'uploaded_by',
-            'file_url', 'stream_url', 'uploaded_at'
+            'mime_type', 'content_hash', 'original_filename', 'uploaded_by',
+            'duration', 'width', 'height', 'video_codec',
+            'processing_status', 'file_url', 'stream_url', 'uploaded_at'
         ]
         read_only_fields = [
-            'id', 'file_type', 'file_size', 'mime_type',
-            'original_filename', 'uploaded_by', 'uploaded_at'
+            'id', 'file_type', 'file_size', 'mime_type', 'content_hash',
+            'original_filename', 'uploaded_by', 'duration', 'width', 'height',
+            'video_codec', 'processing_status', 'uploaded_at'
         ]
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if instance.file_type == 'video':
+            # 비디오는 저장 경로를 노출하지 않고 서명된 stream_url로만 전송
+            data['file'] = None
+        return data
+
     def get_file_url(self, obj):
-        """파일 다운로드 URL"""
+        """파일 다운로드 URL (비디오 제외)"""
         request = self.context.get('request')
-        if obj.file and request:
+        if obj.file and request and obj.file_type != 'video':
             return request.build_absolute_uri(obj.file.url)
         return None
 
     def get_stream_url(self, obj):
-        """스트리밍 URL (비디오인 경우)"""
+        """서명된 스트리밍 URL (업로더 본인의 비디오인 경우, STREAM_URL_TTL 후 만료)
+
+        수강생에게는 레슨 상세(LectureDetailSerializer)의 stream_url이 발급됩니다.
+        """
         request = self.context.get('request')
-        if obj.file_type == 'video' and request:
-            return request.build_absolute_uri(f'/api/media/{obj.id}/stream/')
+        if obj.file_type == 'video' and request and obj.uploaded_by_id == request.user.pk:
+            return build_stream_url(request, obj.id)
         return None
 
 
@@ -45,7 +61,69 @@ class MediaFileUploadSerializer(serializers.ModelSerializer):
         fields = ['file']
 
     def create(self, validated_data):
-        """파일 업로드"""
+        """파일 업로드 (같은 내용의 파일이 이미 있으면 저장하지 않고 참조)"""
+        request = self.context.get('request')
+        return store_upload(
+            request.user,
+            validated_data['file'],
+            mime_type=validated_data.get('mime_type', ''),
+            content_hash=validated_data.get('content_hash', '')
+        )
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    """분할 업로드 세션 Serializer"""
+
+    upload_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = UploadSession
+        fields = [
+            'id', 'filename', 'file_size', 'offset',
+            'media_file', 'upload_url', 'created_at', 'updated_at'
+        ]
+        read_only_fields = fields
+
+    def get_upload_url(self, obj):
+        """청크 전송(PATCH) URL"""
+        request = self.context.get('request')
+        if request:
+            return request.build_absolute_uri(f'/api/media/uploads/{obj.id}/')
+        return None
+
+
+class UploadSessionCreateSerializer(serializers.ModelSerializer):
+    """분할 업로드 세션 생성 Serializer (확장자/크기 사전 검증)"""
+
+    file_size = serializers.IntegerField(min_value=1)
+    content_hash = serializers.RegexField(
+        r'^[0-9a-f]{64}$',
+        required=False,
+        write_only=True,
+        help_text='파일의 SHA-256 (본인이 이미 올린 같은 파일이 있으면 전송 없이 완료)'
+    )
+
+    class Meta:
+        model = UploadSession
+        fields = ['filename', 'file_size', 'content_hash']
+
+    def validate_filename(self, value):
+        """경로를 제외한 파일명만 사용"""
+        value = os.path.basename(value.replace('\\', '/'))
+        if not value:
+            raise serializers.ValidationError('파일명이 올바르지 않습니다.')
+        return value
+
+    def validate(self, attrs):
+        # 일반 업로드와 같은 검증기 사용 (파일 대신 선언된 이름/크기로 검증)
+        declared = SimpleNamespace(name=attrs['filename'], size=attrs['file_size'])
+        validate_file_extension(declared)
+        validate_file_size(declared)
+        return attrs
+
+    def create(self, validated_data):
+        """세션 생성"""
         request = self.context.get('request')
         validated_data['uploaded_by'] = request.user
+        validated_data.pop('content_hash', None)
         return super().create(validated_data)
@@ -0,0 +1,35 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .blobs import release_media_content
+from .cache import invalidate_stream_metadata
+from .keyframes import invalidate_seek_table
+from .models import KeyframeIndex, MediaFile, UploadSession
+from .uploads import remove_staging_file
+
+
+@receiver(post_save, sender=MediaFile)
+@receiver(post_delete, sender=MediaFile)
+def invalidate_media_metadata(sender, instance, **kwargs):
+    """미디어 파일 변경/삭제 시 스트리밍 메타데이터 캐시 무효화"""
+    invalidate_stream_metadata(instance.pk)
+
+
+@receiver(post_delete, sender=MediaFile)
+def release_media_file_content(sender, instance, **kwargs):
+    """미디어 파일 삭제 시 blob 참조 해제 (마지막 참조면 커밋 후 파일 삭제)"""
+    release_media_content(instance)
+
+
+@receiver(post_delete, sender=UploadSession)
+def remove_upload_staging_file(sender, instance, **kwargs):
+    """업로드 세션 삭제 시 커밋 후 스테이징 파일 삭제"""
+    path = instance.staging_path
+    transaction.on_commit(lambda: remove_staging_file(path))
+
+
+@receiver(post_save, sender=KeyframeIndex)
+@receiver(post_delete, sender=KeyframeIndex)
+def invalidate_keyframe_index(sender, instance, **kwargs):
+    """키프레임 색인 변경/삭제 시 캐시된 색인 무효화"""
+    invalidate_seek_table(instance.media_file_id)
@@ -0,0 +1,74 @@
+import base64
+import hashlib
+import hmac
+import math
+import time
+from functools import lru_cache
+from urllib.parse import urlencode
+from django.conf import settings
+from django.core.signing import BadSignature, SignatureExpired
+
+# 만료 시각을 이 단위(초)로 올림하여 같은 구간 안에서는 같은 URL을 발급 (브라우저/CDN 캐시 재사용)
+EXPIRY_STEP = 300
+SIGNATURE_BYTES = 16
+
+
+@lru_cache(maxsize=None)
+def signing_key(secret):
+    """서명 키 (다른 용도의 SECRET_KEY 서명과 섞이지 않도록 용도별로 파생)"""
+    return hashlib.sha256(b'media_files.stream:' + secret.encode()).digest()
+
+
+def stream_signature(media_id, expires, user_id=None):
+    """미디어 ID, 만료 시각, 사용자 ID(선택)의 HMAC-SHA256 서명 (URL-safe base64)
+
+    값은 정수로 정규화하여 서명하므로 '01'과 '1'처럼 표기만 다른 값도 같은 서명이 됩니다.
+    """
+    message = f'{int(media_id)}:{int(expires)}:{int(user_id) if user_id else ""}'.encode()
+    key = signing_key(settings.STREAM_URL_SECRET or settings.SECRET_KEY)
+    digest = hmac.new(key, message, hashlib.sha256).digest()[:SIGNATURE_BYTES]
+    return base64.urlsafe_b64encode(digest).rstrip(b'=').decode()
+
+
+def stream_expiry(now=None):
+    now = time.time() if now is None else now
+    return math.ceil((now + settings.STREAM_URL_TTL) / EXPIRY_STEP) * EXPIRY_STEP
+
+
+def signed_stream_params(media_id, user_id=None, now=None):
+    """스트리밍 URL 쿼리 파라미터 (expires, uid, sig)"""
+    expires = stream_expiry(now)
+    params = {'expires': expires}
+    if user_id:
+        params['uid'] = user_id
+    params['sig'] = stream_signature(media_id, expires, user_id)
+    return params
+
+
+def build_stream_url(request, media_id):
+    """서명된 스트리밍 URL (로그인 사용자면 사용자 ID 포함)"""
+    user = getattr(request, 'user', None)
+    user_id = user.pk if user is not None and user.is_authenticated else None
+    query = urlencode(signed_stream_params(media_id, user_id))
+    return request.build_absolute_uri(f'/api/media/{media_id}/stream/?{query}')
+
+
+def verify_stream_signature(media_id, params, now=None):
+    """스트리밍 URL 서명을 확인하고 서명에 포함된 사용자 ID(없으면 None) 반환
+
+    DB 조회 없이 HMAC 계산과 상수 시간 비교만 수행합니다.
+    서명이 없거나 다르면 BadSignature, 만료되었으면 SignatureExpired가 발생합니다.
+    """
+    expires, user_id, signature = params.get('expires', ''), params.get('uid', ''), params.get('sig', '')
+    if not expires.isdigit() or (user_id and not user_id.isdigit()) or not signature:
+        raise BadSignature('스트리밍 URL 서명이 없습니다.')
+
+    try:
+        expected = stream_signature(media_id, expires, user_id)
+    except ValueError:
+        raise BadSignature('스트리밍 URL 서명이 올바르지 않습니다.')
+    if not hmac.compare_digest(expected.encode(), signature.encode()):
+        raise BadSignature('스트리밍 URL 서명이 올바르지 않습니다.')
+    if int(expires) < (time.time() if now is None else now):
+        raise SignatureExpired('스트리밍 URL이 만료되었습니다.')
+    return int(user_id) if user_id else None
@@ -0,0 +1,91 @@
+import mimetypes
+import os
+from .probe import MP4_TOP_LEVEL_BOXES
+
+# 형식 판별에 필요한 파일 앞부분 길이
+SNIFF_LENGTH = 512
+
+OLE_STORAGE = 'application/x-ole-storage'
+ZIP_ARCHIVE = 'application/zip'
+
+MAGIC_SIGNATURES = [
+    (b'\x1a\x45\xdf\xa3', 'video/webm'),
+    (b'%PDF-', 'application/pdf'),
+    (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', OLE_STORAGE),
+    (b'PK\x03\x04', ZIP_ARCHIVE),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+]
+
+# 확장자별로 허용되는 실제 내용 형식
+EXTENSION_CONTENT_TYPES = {
+    '.mp4': {'video/mp4', 'video/quicktime'},
+    '.mov': {'video/quicktime', 'video/mp4'},
+    '.webm': {'video/webm'},
+    '.avi': {'video/x-msvideo'},
+    '.pdf': {'application/pdf'},
+    '.doc': {OLE_STORAGE},
+    '.ppt': {OLE_STORAGE},
+    '.docx': {ZIP_ARCHIVE},
+    '.pptx': {ZIP_ARCHIVE},
+    '.txt': {'text/plain'},
+    '.jpg': {'image/jpeg'},
+    '.jpeg': {'image/jpeg'},
+    '.png': {'image/png'},
+    '.gif': {'image/gif'},
+    '.webp': {'image/webp'},
+}
+
+# 파일 타입별로 허용되는 선언된 Content-Type 주 타입
+DECLARED_TYPE_PREFIXES = {
+    'video': ('video/',),
+    'image': ('image/',),
+    'document': ('application/', 'text/'),
+}
+GENERIC_CONTENT_TYPES = {'', 'application/octet-stream', 'binary/octet-stream'}
+
+# 텍스트 인코딩 BOM (UTF-8, UTF-16 LE/BE). UTF-16 텍스트는 NUL 바이트를 포함하므로 먼저 확인
+TEXT_BOMS = (b'\xef\xbb\xbf', b'\xff\xfe', b'\xfe\xff')
+
+
+def sniff_mime_type(head):
+    """파일 앞부분(매직 바이트)으로 MIME 타입 판별 (알 수 없으면 None)"""
+    if head.startswith(TEXT_BOMS):
+        return 'text/plain'
+    if head[4:8] == b'ftyp':
+        return 'video/quicktime' if head[8:12] == b'qt  ' else 'video/mp4'
+    if head[4:8] in MP4_TOP_LEVEL_BOXES:
+        # ftyp 없이 moov/mdat/wide 등으로 시작하는 구형 QuickTime 파일
+        return 'video/quicktime'
+    if head[:4] == b'RIFF':
+        return {b'AVI ': 'video/x-msvideo', b'WEBP': 'image/webp'}.get(head[8:12])
+    for signature, mime_type in MAGIC_SIGNATURES:
+        if head.startswith(signature):
+            return mime_type
+    if head and b'\x00' not in head:
+        return 'text/plain'
+    return None
+
+
+def resolve_mime_type(filename, head):
+    """확장자와 실제 내용이 일치하면 저장할 MIME 타입을, 아니면 None을 반환
+
+    zip/OLE 컨테이너 형식(docx, ppt 등)은 확장자의 MIME 타입으로 저장합니다.
+    """
+    ext = os.path.splitext(filename)[1].lower()
+    sniffed = sniff_mime_type(head)
+    if sniffed is None or sniffed not in EXTENSION_CONTENT_TYPES.get(ext, ()):
+        return None
+    if sniffed in (OLE_STORAGE, ZIP_ARCHIVE):
+        return mimetypes.guess_type(filename)[0] or sniffed
+    return sniffed
+
+
+def declared_type_matches(file_type, content_type):
+    """클라이언트가 선언한 Content-Type이 파일 타입과 어긋나지 않는지 확인"""
+    content_type = (content_type or '').lower()
+    if content_type in GENERIC_CONTENT_TYPES:
+        return True
+    return content_type.startswith(DECLARED_TYPE_PREFIXES.get(file_type, ()))
@@ -0,0 +1,55 @@
+import os
+import re
+import uuid
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.db import transaction
+
+HEX_CHARS_PER_LEVEL = 2
+KEY_PATTERN = re.compile(r'[0-9a-f]{32,64}(?=$|[._])')
+
+
+class ShardedStorage(FileSystemStorage):
+    """키 앞부분으로 여러 단계의 하위 디렉터리에 분산 저장하는 파일 저장소
+
+    키 앞 2자리(16진수)마다 한 단계씩, 단계당 최대 256개 디렉터리로 나눠
+    한 디렉터리의 항목 수가 파일 수에 비례해 커지지 않도록 합니다.
+    모든 upload_to 함수와 blob/변형 이미지 경로가 이 저장소의 shard_path를 거칩니다.
+    """
+
+    def __init__(self, *args, shard_levels=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.shard_levels = settings.MEDIA_SHARD_LEVELS if shard_levels is None else shard_levels
+
+    def shards(self, key):
+        """키 앞부분으로 만든 하위 디렉터리 이름 목록 (['ab', 'cd'])"""
+        width = HEX_CHARS_PER_LEVEL
+        return [key[i * width:(i + 1) * width] for i in range(self.shard_levels)]
+
+    def shard_path(self, prefix, key, suffix=''):
+        """prefix/ab/cd/<key><suffix> 형태의 경로 (단계 수는 shard_levels)"""
+        return '/'.join([prefix, *self.shards(key), f'{key}{suffix}'])
+
+    def unique_path(self, prefix, filename):
+        """업로드 파일의 충돌 없는 저장 경로 (임의 UUID 키, 원본 확장자 유지)"""
+        ext = os.path.splitext(filename)[1].lower()
+        return self.shard_path(prefix, uuid.uuid4().hex, ext)
+
+    def is_sharded(self, name):
+        """name이 분산 경로 규칙(.../ab/cd/<key>...)을 따르는지 여부 (이전 대상 판별용)"""
+        *directories, filename = (name or '').split('/')
+        key = KEY_PATTERN.match(filename)
+        if key is None or len(directories) <= self.shard_levels:
+            return False
+        return directories[len(directories) - self.shard_levels:] == self.shards(key.group())
+
+
+def upload_path(prefix, filename):
+    """upload_to 함수용 저장 경로 (기본 저장소를 거침)"""
+    return default_storage.unique_path(prefix, filename)
+
+
+def delete_on_commit(name):
+    """트랜잭션 커밋 후 저장소 파일 삭제 (롤백되면 파일을 남김)"""
+    if name:
+        transaction.on_commit(lambda: default_storage.delete(name))
@@ -0,0 +1,220 @@
+import secrets
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.http import parse_http_date_safe
+
+RANGE_UNIT = 'bytes'
+
+
+def get_block_size():
+    """스트리밍 읽기 단위 (bytes)"""
+    return settings.STREAM_BLOCK_SIZE
+
+
+def parse_range_header(header, size):
+    """Range 헤더를 (start, end) 목록으로 변환 (end 포함)
+
+    - bytes=0-499 : 지정 구간
+    - bytes=500-  : 500번째 바이트부터 끝까지
+    - bytes=-500  : 마지막 500바이트
+    문법이 잘못된 헤더는 None(무시하고 전체 전송)을, 만족 가능한 구간이 없으면 빈 목록(416)을 반환합니다.
+    겹치거나 맞닿은 구간은 합치고, 구간이 너무 많으면 헤더를 무시합니다.
+    """
+    if not header or size <= 0:
+        return None
+
+    unit, _, specs = header.partition('=')
+    if unit.strip().lower() != RANGE_UNIT or not specs.strip():
+        return None
+
+    ranges = []
+    for spec in specs.split(','):
+        first, dash, last = (part.strip() for part in spec.partition('-'))
+        if not dash or not (first or last):
+            return None
+        if (first and not first.isdigit()) or (last and not last.isdigit()):
+            return None
+
+        if not first:
+            # 마지막 N바이트
+            suffix = int(last)
+            if suffix == 0:
+                continue
+            ranges.append((max(size - suffix, 0), size - 1))
+            continue
+
+        start = int(first)
+        end = int(last) if last else size - 1
+        if last and end < start:
+            return None
+        if start >= size:
+            continue
+        ranges.append((start, min(end, size - 1)))
+
+    if len(ranges) > settings.STREAM_MAX_RANGES:
+        return None
+
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def if_range_matches(request, etag, last_modified):
+    """If-Range 검증 (없거나 현재 검증자와 일치하면 True)
+
+    ETag는 강한 비교로, 날짜는 Last-Modified와 정확히 같을 때만 일치로 봅니다.
+    """
+    value = request.META.get('HTTP_IF_RANGE', '').strip()
+    if not value:
+        return True
+    if value.startswith('"') or value.startswith('W/'):
+        return not value.startswith('W/') and value == etag
+
+    timestamp = parse_http_date_safe(value)
+    return (
+        timestamp is not None
+        and last_modified is not None
+        and timestamp == int(last_modified.timestamp())
+    )
+
+
+def get_ranges(request, size, etag=None, last_modified=None):
+    """요청의 유효한 구간 목록 (Range 없음/무시는 None, 만족 불가는 빈 목록)"""
+    header = request.META.get('HTTP_RANGE', '').strip()
+    if not header or not if_range_matches(request, etag, last_modified):
+        return None
+    return parse_range_header(header, size)
+
+
+class RangeFile:
+    """파일의 [start, start + length) 구간만 노출하는 파일 객체
+
+    read()는 구간 밖을 읽지 않고, fileno()와 구간 시작으로 옮겨 둔 파일 위치로
+    WSGI 서버의 file_wrapper가 Content-Length만큼 os.sendfile 할 수 있습니다.
+    """
+
+    def __init__(self, file, start, length):
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size) if size else b''
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def read_range(file, start, length, block_size):
+    """start부터 length 바이트만 block_size 단위로 읽기 (요청 범위를 넘어서 읽지 않음)"""
+    file.seek(start)
+    remaining = length
+    while remaining > 0:
+        chunk = file.read(min(block_size, remaining))
+        if not chunk:
+            break
+        remaining -= len(chunk)
+        yield chunk
+
+
+def multipart_headers(boundary, content_type, start, end, size):
+    """multipart/byteranges 파트 헤더"""
+    return (
+        f'\r\n--{boundary}\r\n'
+        f'Content-Type: {content_type}\r\n'
+        f'Content-Range: {RANGE_UNIT} {start}-{end}/{size}\r\n\r\n'
+    ).encode('ascii')
+
+
+def multipart_trailer(boundary):
+    return f'\r\n--{boundary}--\r\n'.encode('ascii')
+
+
+def multipart_length(ranges, boundary, content_type, size):
+    """multipart/byteranges 본문 전체 길이"""
+    total = len(multipart_trailer(boundary))
+    for start, end in ranges:
+        total += len(multipart_headers(boundary, content_type, start, end, size))
+        total += end - start + 1
+    return total
+
+
+def iter_ranges(file, ranges, size, content_type, block_size, boundary=None):
+    """구간 목록을 순서대로 전송 (boundary가 있으면 multipart/byteranges 본문)"""
+    try:
+        for start, end in ranges:
+            if boundary is not None:
+                yield multipart_headers(boundary, content_type, start, end, size)
+            yield from read_range(file, start, end - start + 1, block_size)
+        if boundary is not None:
+            yield multipart_trailer(boundary)
+    finally:
+        file.close()
+
+
+def range_not_satisfiable(size):
+    response = HttpResponse(status=416)
+    response['Content-Range'] = f'{RANGE_UNIT} */{size}'
+    return response
+
+
+def range_response(request, file, size, content_type, etag=None, last_modified=None,
+                   block_size=None, sendfile=False):
+    """Range 요청을 처리하는 파일 응답
+
+    Range가 없거나(If-Range 불일치 포함) 무시해야 하면 200 전체 응답을,
+    구간이 하나면 206 단일 응답을, 여러 개면 206 multipart/byteranges 응답을 반환합니다.
+    어떤 경우든 디스크에서는 요청된 바이트만 block_size 단위로 읽습니다.
+    sendfile이면 단일 구간도 FileResponse(RangeFile)로 반환하여 WSGI 서버가 무복사 전송하게 합니다.
+    """
+    block_size = block_size or get_block_size()
+    ranges = get_ranges(request, size, etag, last_modified)
+
+    if ranges is None:
+        response = FileResponse(file, content_type=content_type)
+        response.block_size = block_size
+        response['Content-Length'] = str(size)
+    elif not ranges:
+        file.close()
+        response = range_not_satisfiable(size)
+    elif len(ranges) == 1 and sendfile:
+        start, end = ranges[0]
+        response = FileResponse(
+            RangeFile(file, start, end - start + 1),
+            status=206,
+            content_type=content_type
+        )
+        response.block_size = block_size
+        response['Content-Length'] = str(end - start + 1)
+        response['Content-Range'] = f'{RANGE_UNIT} {start}-{end}/{size}'
+    elif len(ranges) == 1:
+        start, end = ranges[0]
+        response = StreamingHttpResponse(
+            iter_ranges(file, ranges, size, content_type, block_size),
+            status=206,
+            content_type=content_type
+        )
+        response['Content-Length'] = str(end - start + 1)
+        response['Content-Range'] = f'{RANGE_UNIT} {start}-{end}/{size}'
+    else:
+        boundary = secrets.token_hex(16)
+        response = StreamingHttpResponse(
+            iter_ranges(file, ranges, size, content_type, block_size, boundary),
+            status=206,
+            content_type=f'multipart/byteranges; boundary={boundary}'
+        )
+        response['Content-Length'] = str(multipart_length(ranges, boundary, content_type, size))
+
+    response['Accept-Ranges'] = RANGE_UNIT
+    return response
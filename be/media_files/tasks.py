@@ -0,0 +1,103 @@
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.db import transaction
+from courses.stats import sync_media_duration
+from .blobs import hash_file
+from .images import generate_variants
+from .jobs import register_task
+from .keyframes import build_seek_table
+from .models import KeyframeIndex, MediaBlob, MediaFile
+from .probe import probe_media
+from .sniffing import SNIFF_LENGTH, resolve_mime_type
+
+
+@register_task('inspect')
+def inspect_media(media):
+    """저장된 파일의 크기, MIME 타입, 콘텐츠 해시를 확인하여 비어 있는 값 보완
+
+    업로드 중 계산하지 못한 값(blob 도입 전 파일, 관리자 페이지 업로드 등)만 다시 계산합니다.
+    """
+    name = media.file.name
+    updates = {}
+
+    size = default_storage.size(name)
+    if size != media.file_size:
+        updates['file_size'] = size
+
+    if not media.mime_type or not media.content_hash:
+        with default_storage.open(name, 'rb') as file:
+            if not media.mime_type:
+                mime_type = resolve_mime_type(media.original_filename, file.read(SNIFF_LENGTH))
+                if mime_type:
+                    updates['mime_type'] = mime_type
+            if not media.content_hash:
+                updates['content_hash'] = hash_file(file)
+
+    if updates:
+        MediaFile.objects.filter(pk=media.pk).update(**updates)
+        if media.blob_id and updates.get('mime_type'):
+            MediaBlob.objects.filter(pk=media.blob_id, mime_type='').update(mime_type=updates['mime_type'])
+    return updates
+
+
+@register_task('probe', file_types=['video'])
+def probe_video(media):
+    """컨테이너 헤더에서 재생시간/해상도/코덱을 읽어 기록하고, 이 파일을 쓰는 레슨의 재생시간 갱신
+
+    ffmpeg 없이 moov/mvhd(MP4, MOV) 또는 EBML Info/Tracks(WebM)만 seek하며 읽습니다.
+    """
+    with default_storage.open(media.file.name, 'rb') as file:
+        info = probe_media(file)
+    if info is None:
+        return None
+
+    MediaFile.objects.filter(pk=media.pk).update(
+        duration=info.duration,
+        width=info.width,
+        height=info.height,
+        video_codec=info.codec[:20]
+    )
+    if info.duration:
+        sync_media_duration(media.pk, round(info.duration))
+    return info
+
+
+@register_task('keyframes', file_types=['video'])
+def index_keyframes(media):
+    """MP4 샘플 테이블에서 키프레임 색인을 만들어 저장 (?t= 탐색용)"""
+    with default_storage.open(media.file.name, 'rb') as file:
+        table = build_seek_table(file)
+
+    if not table:
+        KeyframeIndex.objects.filter(media_file=media).delete()
+        return 0
+
+    KeyframeIndex.objects.update_or_create(
+        media_file=media,
+        defaults={'data': table.to_bytes(), 'keyframe_count': len(table)}
+    )
+    return len(table)
+
+
+@register_task('image_variants', file_types=[])
+def build_image_variants(model, pk, field, name, variant_set):
+    """강의 썸네일/프로필 이미지의 고정 크기 WebP/JPEG 변형을 만들어 '<필드>_variants'에 기록
+
+    원본이 이미지가 아니면 변형 없이 원본 경로만 기록하여 같은 파일로 작업이 다시 등록되지 않게 합니다.
+    """
+    queryset = apps.get_model(model).objects.filter(pk=pk)
+    if not queryset.filter(**{field: name}).exists():
+        # 그 사이 이미지가 바뀌었거나 삭제/이동됨 (새 경로의 작업이 따로 등록됨)
+        return None
+
+    variants = generate_variants(name, variant_set)
+
+    with transaction.atomic():
+        instance = queryset.select_for_update().first()
+        if instance is None or getattr(instance, field).name != name:
+            # 변형 이미지를 만드는 동안 이미지가 바뀜
+            return None
+
+        setattr(instance, f'{field}_variants', {'source': name, **(variants or {})})
+        instance.save(update_fields=[f'{field}_variants', 'updated_at'])
+    return variants
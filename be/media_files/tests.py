@@ -1,3 +1,1014 @@
-from django.test import TestCase
+import io
+import os
+import shutil
+import struct
+import tempfile
+import time
+from datetime import timedelta
+from unittest import mock
+from PIL import Image
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from accounts.models import User
+from rest_framework.test import APIClient, APIRequestFactory
+from courses.models import Course
+from .blobs import collect_blob, delete_media_file, store_upload
+from .cache import LRUCache, invalidate_stream_metadata
+from .gc import filter_unreferenced
+from .images import IMAGE_VARIANT_SETS, queue_image_variants, variant_path
+from .jobs import PROCESSING_TASKS, claim_job, enqueue_task, fail_expired_jobs, finish_job, run_job, run_worker
+from .keyframes import SeekTable, build_seek_table, invalidate_seek_table
+from .management.commands.benchmark_probe import build_moov, ebml_element
+from .signing import EXPIRY_STEP, signed_stream_params
+from .probe import ProbeError, probe_media
+from .models import KeyframeIndex, MediaBlob, MediaFile, ProcessingJob, UploadSession
+from .scheduler import StreamScheduler, TokenBucket
+from .views import MediaFileViewSet
+from .sniffing import resolve_mime_type
+from .tasks import build_image_variants
 
-# Create your tests here.
+
+def box(kind, payload=b''):
+    return struct.pack('>I4s', 8 + len(payload), kind) + payload
+
+
+class TemporaryMediaRootMixin:
+    """테스트마다 빈 MEDIA_ROOT 사용"""
+
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media_override = override_settings(MEDIA_ROOT=media_root)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+
+    def put_file(self, name, content):
+        path = default_storage.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as file:
+            file.write(content)
+
+    def image_bytes(self):
+        buffer = io.BytesIO()
+        Image.new('RGB', (400, 300), (10, 20, 30)).save(buffer, 'JPEG')
+        return buffer.getvalue()
+
+
+class ResolveMimeTypeTest(SimpleTestCase):
+    """확장자와 파일 앞부분(매직 바이트) 일치 여부"""
+
+    def test_mp4_with_ftyp(self):
+        head = box(b'ftyp', b'isom' + bytes(4) + b'isomavc1')
+        self.assertEqual(resolve_mime_type('video.mp4', head), 'video/mp4')
+        self.assertEqual(resolve_mime_type('video.mov', box(b'ftyp', b'qt  ' + bytes(4))), 'video/quicktime')
+
+    def test_quicktime_without_ftyp(self):
+        """ftyp 없이 시작하는 구형 QuickTime(.mov) 파일"""
+        for kind in [b'wide', b'moov', b'mdat', b'free', b'skip']:
+            with self.subTest(kind=kind):
+                head = box(kind, bytes(16)) + box(b'mdat', bytes(32))
+                self.assertEqual(resolve_mime_type('old.mov', head), 'video/quicktime')
+
+    def test_unknown_box_is_rejected(self):
+        self.assertIsNone(resolve_mime_type('fake.mov', box(b'abcd', bytes(16))))
+
+    def test_text_with_bom(self):
+        for encoding in ['utf-8-sig', 'utf-16', 'utf-16-le', 'utf-16-be']:
+            with self.subTest(encoding=encoding):
+                # utf-16-le/be 코덱은 BOM을 붙이지 않으므로 직접 추가
+                bom = '' if encoding in ('utf-8-sig', 'utf-16') else '\ufeff'
+                text = f'{bom}강의 자료입니다.\n'.encode(encoding)
+                self.assertEqual(resolve_mime_type('notes.txt', text), 'text/plain')
+
+    def test_binary_text_is_rejected(self):
+        self.assertIsNone(resolve_mime_type('notes.txt', b'abc\x00def'))
+        self.assertIsNone(resolve_mime_type('notes.txt', box(b'moov', bytes(16))))
+
+
+class RelocateMediaTest(TemporaryMediaRootMixin, TestCase):
+    """relocate_media: 이전 경로의 썸네일을 분산 경로로 이동"""
+
+    legacy_name = 'courses/7/thumbnail.jpg'
+
+    def setUp(self):
+        super().setUp()
+        instructor = User.objects.create_user(username='instructor', email='i@example.com', password='pw12345!x')
+        self.course = Course.objects.create(instructor=instructor, title='이전 강의', description='경로 이전 테스트 강의')
+        self.put_file(self.legacy_name, self.image_bytes())
+        self.old_updated_at = timezone.now() - timedelta(days=1)
+        Course.objects.filter(pk=self.course.pk).update(thumbnail=self.legacy_name, updated_at=self.old_updated_at)
+
+    def test_relocation_touches_updated_at(self):
+        """경로가 바뀐 행은 updated_at도 바뀌어 ETag/Last-Modified가 달라짐"""
+        call_command('relocate_media', stdout=io.StringIO())
+
+        self.course.refresh_from_db()
+        self.assertTrue(default_storage.is_sharded(self.course.thumbnail.name))
+        self.assertTrue(default_storage.exists(self.course.thumbnail.name))
+        self.assertGreater(self.course.updated_at, self.old_updated_at)
+
+    def test_job_for_old_path_is_skipped(self):
+        """이전 경로로 등록된 변형 이미지 작업은 파일을 읽지 않고 건너뜀"""
+        call_command('relocate_media', stdout=io.StringIO())
+        default_storage.delete(self.legacy_name)
+
+        self.assertIsNone(
+            build_image_variants('courses.Course', self.course.pk, 'thumbnail', self.legacy_name, 'course_thumbnail')
+        )
+
+
+class FilterUnreferencedTest(TestCase):
+    """gc_media 삭제 직전 재확인"""
+
+    def test_variant_paths_are_referenced(self):
+        """변형 이미지 JSON에 다시 기록된 경로는 삭제 대상에서 제외"""
+        referenced = variant_path('a' * 64, (400, 225), 'webp')
+        orphan = variant_path('b' * 64, (400, 225), 'webp')
+        # 같은 해시의 다른 크기 경로는 부분 일치하더라도 참조가 아님
+        other_size = variant_path('a' * 64, (40, 22), 'webp')
+
+        instructor = User.objects.create_user(username='instructor', email='i@example.com', password='pw12345!x')
+        course = Course.objects.create(instructor=instructor, title='변형 이미지', description='재확인 테스트 강의')
+        Course.objects.filter(pk=course.pk).update(
+            thumbnail='courses/thumbnails/aa/bb/source.jpg',
+            thumbnail_variants={'source': 'courses/thumbnails/aa/bb/source.jpg', 'card': {'webp': referenced}}
+        )
+
+        names = [referenced, orphan, other_size, 'courses/thumbnails/aa/bb/source.jpg', 'media/document/old.txt']
+        self.assertEqual(filter_unreferenced(names), {orphan, other_size, 'media/document/old.txt'})
+
+
+class StreamMediaMixin(TemporaryMediaRootMixin):
+    """스트리밍 테스트용 비디오 미디어 파일 (1000 bytes)"""
+
+    video_content = bytes(range(250)) * 4
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.uploader = User.objects.create_user(username='uploader', email='u@example.com', password='pw12345!x')
+        self.put_file('media/video/ab/cd/clip.mp4', self.video_content)
+        self.media = MediaFile.objects.create(
+            uploaded_by=self.uploader,
+            file='media/video/ab/cd/clip.mp4',
+            file_type='video',
+            file_size=len(self.video_content),
+            mime_type='video/mp4',
+            original_filename='clip.mp4'
+        )
+        self.url = f'/api/media/{self.media.pk}/stream/'
+        # 프로세스 캐시에 이전 테스트의 같은 ID가 남아 있을 수 있음
+        for invalidate in (invalidate_stream_metadata, invalidate_seek_table):
+            invalidate(self.media.pk)
+            self.addCleanup(invalidate, self.media.pk)
+
+    def body(self, response):
+        return b''.join(response.streaming_content) if response.streaming else response.content
+
+
+@override_settings(STREAM_REQUIRE_SIGNED_URLS=False, STREAM_DELIVERY_BACKEND='python')
+class StreamSeekTest(StreamMediaMixin, TestCase):
+    """?t= 시각 탐색 응답"""
+
+    def set_keyframes(self, times, offsets):
+        KeyframeIndex.objects.create(
+            media_file=self.media,
+            data=SeekTable(times, offsets).to_bytes(),
+            keyframe_count=len(times)
+        )
+
+    def test_seek_time_header(self):
+        self.set_keyframes([0.0, 2.0], [0, 400])
+        response = self.client.get(self.url, {'t': 3})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 400-999/1000')
+        self.assertEqual(response['X-Seek-Time'], '2.000')
+
+    def test_offset_past_end_has_no_seek_time(self):
+        """색인의 바이트 위치가 파일 끝을 넘으면 416이며 X-Seek-Time을 보내지 않음"""
+        self.set_keyframes([0.0, 2.0], [0, 5000])
+        response = self.client.get(self.url, {'t': 3})
+        self.assertEqual(response.status_code, 416)
+        self.assertNotIn('X-Seek-Time', response)
+
+
+class BlobReferenceTest(TemporaryMediaRootMixin, TestCase):
+    """내용 기반 저장소(blob)의 중복 제거와 참조 수"""
+
+    content = '같은 내용의 강의 자료입니다.\n'.encode()
+
+    def setUp(self):
+        super().setUp()
+        self.users = [
+            User.objects.create_user(username=f'user{i}', email=f'user{i}@example.com', password='pw12345!x')
+            for i in range(2)
+        ]
+
+    def upload(self, user, name='notes.txt', content=None):
+        return store_upload(user, SimpleUploadedFile(name, content or self.content), 'text/plain')
+
+    def delete(self, media):
+        with self.captureOnCommitCallbacks(execute=True):
+            delete_media_file(media)
+
+    def test_same_content_is_stored_once(self):
+        first = self.upload(self.users[0], 'a.txt')
+        second = self.upload(self.users[1], 'b.txt')
+
+        blob = MediaBlob.objects.get()
+        self.assertEqual(blob.ref_count, 2)
+        self.assertEqual(first.file.name, second.file.name)
+        self.assertEqual(os.listdir(os.path.dirname(default_storage.path(blob.file.name))), [os.path.basename(blob.file.name)])
+
+    def test_shared_content_survives_one_delete(self):
+        first = self.upload(self.users[0])
+        self.upload(self.users[1])
+
+        self.delete(first)
+        blob = MediaBlob.objects.get()
+        self.assertEqual(blob.ref_count, 1)
+        self.assertTrue(default_storage.exists(blob.file.name))
+
+    def test_release_to_zero_deletes_blob_and_file(self):
+        media = [self.upload(user) for user in self.users]
+        name = media[0].file.name
+
+        for item in media:
+            self.delete(item)
+        self.assertFalse(MediaBlob.objects.exists())
+        self.assertFalse(default_storage.exists(name))
+
+    def test_reacquired_before_cleanup_is_kept(self):
+        """마지막 참조 해제 후 정리 전에 같은 내용이 다시 올라오면 파일을 삭제하지 않음"""
+        media = self.upload(self.users[0])
+        with self.captureOnCommitCallbacks() as callbacks:
+            delete_media_file(media)
+
+        again = self.upload(self.users[1])
+        for callback in callbacks:
+            callback()
+
+        blob = MediaBlob.objects.get()
+        self.assertEqual(blob.ref_count, 1)
+        self.assertEqual(again.blob, blob)
+        self.assertTrue(default_storage.exists(blob.file.name))
+
+    def test_uploaded_after_cleanup_is_rewritten(self):
+        media = self.upload(self.users[0])
+        with self.captureOnCommitCallbacks() as callbacks:
+            delete_media_file(media)
+        for callback in callbacks:
+            callback()
+        self.assertFalse(collect_blob(media.blob_id))
+
+        again = self.upload(self.users[1])
+        with default_storage.open(again.file.name) as file:
+            self.assertEqual(file.read(), self.content)
+
+    def test_admin_upload_uses_blob(self):
+        """관리자 페이지에서 추가/교체한 파일도 blob 참조로 저장"""
+        existing = self.upload(self.users[0])
+        admin_user = User.objects.create_superuser(username='admin', email='admin@example.com', password='pw12345!x')
+        self.client.force_login(admin_user)
+
+        response = self.client.post('/admin/media_files/mediafile/add/', {
+            'file': SimpleUploadedFile('copy.txt', self.content),
+            'file_type': 'document',
+            'uploaded_by': self.users[1].pk,
+        })
+        self.assertEqual(response.status_code, 302)
+        added = MediaFile.objects.exclude(pk=existing.pk).get()
+        self.assertEqual(added.blob, existing.blob)
+        self.assertEqual(MediaBlob.objects.get().ref_count, 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'/admin/media_files/mediafile/{added.pk}/change/', {
+                'file': SimpleUploadedFile('other.txt', '다른 내용입니다.\n'.encode()),
+                'file_type': 'document',
+                'uploaded_by': self.users[1].pk,
+            })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(
+            sorted(MediaBlob.objects.values_list('ref_count', flat=True)), [1, 1]
+        )
+
+
+class ChunkedUploadTest(TemporaryMediaRootMixin, TestCase):
+    """재개 가능한 분할 업로드 (tus 방식)"""
+
+    content = ('강의 자료 본문입니다. ' * 2000).encode()
+
+    def setUp(self):
+        super().setUp()
+        user = User.objects.create_user(username='uploader', email='u@example.com', password='pw12345!x')
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+        response = self.client.post(
+            '/api/media/uploads/', {'filename': 'notes.txt', 'file_size': len(self.content)}, format='json'
+        )
+        self.session = UploadSession.objects.get(pk=response.data['id'])
+        self.url = f'/api/media/uploads/{self.session.pk}/'
+
+    def patch(self, offset, body):
+        return self.client.generic(
+            'PATCH', self.url, body,
+            content_type='application/offset+octet-stream',
+            HTTP_UPLOAD_OFFSET=str(offset)
+        )
+
+    def staged(self):
+        with open(self.session.staging_path, 'rb') as staging:
+            return staging.read()
+
+    def test_offset_mismatch_is_conflict(self):
+        self.assertEqual(self.patch(0, self.content[:1000])['Upload-Offset'], '1000')
+        self.assertEqual(self.patch(0, self.content[:1000]).status_code, 409)
+        self.assertEqual(self.patch(2000, self.content[2000:3000]).status_code, 409)
+        self.assertEqual(self.staged(), self.content[:1000])
+
+    def test_resume_after_partial_chunk(self):
+        """끊긴 청크는 받은 만큼만 기록되고, HEAD로 확인한 위치부터 이어서 전송"""
+        self.assertEqual(self.patch(0, self.content[:7000]).status_code, 200)
+        self.assertEqual(self.client.head(self.url)['Upload-Offset'], '7000')
+
+        response = self.patch(7000, self.content[7000:])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Upload-Offset'], str(len(self.content)))
+        self.assertEqual(self.staged(), self.content)
+
+    def test_overflow_past_declared_length(self):
+        self.patch(0, self.content[:1000])
+        response = self.patch(1000, self.content[1000:] + b'extra')
+        self.assertEqual(response.status_code, 400)
+
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.offset, 1000)
+        self.assertEqual(self.staged(), self.content[:1000])
+        # 임시 청크 파일이 남지 않음
+        self.assertEqual(os.listdir(os.path.dirname(self.session.staging_path)), [os.path.basename(self.session.staging_path)])
+
+    def test_complete_creates_media_file(self):
+        self.assertEqual(self.client.post(f'{self.url}complete/').status_code, 400)
+        self.patch(0, self.content)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'{self.url}complete/')
+        self.assertEqual(response.status_code, 201)
+
+        media = MediaFile.objects.get(pk=response.data['id'])
+        self.assertEqual((media.file_type, media.file_size, media.mime_type), ('document', len(self.content), 'text/plain'))
+        with default_storage.open(media.file.name) as file:
+            self.assertEqual(file.read(), self.content)
+        self.assertFalse(os.path.exists(self.session.staging_path))
+        self.assertEqual(self.patch(len(self.content), b'x').status_code, 409)
+
+
+@override_settings(STREAM_REQUIRE_SIGNED_URLS=True, STREAM_DELIVERY_BACKEND='python', STREAM_URL_TTL=3600)
+class StreamSignatureTest(StreamMediaMixin, TestCase):
+    """서명된 스트리밍 URL 검증 (DB 조회 없음)"""
+
+    def get(self, params, url=None):
+        return self.client.get(url or self.url, params)
+
+    def test_valid_signature(self):
+        response = self.get(signed_stream_params(self.media.pk, self.uploader.pk))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.body(response), self.video_content)
+
+    def test_leading_zero_id_uses_same_signature(self):
+        """/media/01/ 처럼 표기만 다른 ID도 정수 ID로 서명을 확인"""
+        params = signed_stream_params(self.media.pk)
+        self.assertEqual(self.get(params, f'/api/media/0{self.media.pk}/stream/').status_code, 200)
+        self.assertEqual(self.get({**params, 'expires': f'0{params["expires"]}'}).status_code, 200)
+
+    def test_expired_signature(self):
+        past = time.time() - 3600 - 2 * EXPIRY_STEP
+        response = self.get(signed_stream_params(self.media.pk, now=past))
+        self.assertEqual(response.status_code, 403)
+        self.assertIn('만료', response.data['error'])
+
+    def test_tampered_signature(self):
+        params = signed_stream_params(self.media.pk, self.uploader.pk)
+        tampered = [
+            {**params, 'uid': self.uploader.pk + 1},
+            {**params, 'expires': params['expires'] + EXPIRY_STEP},
+            {**params, 'sig': params['sig'][:-2] + ('AA' if params['sig'][-2:] != 'AA' else 'BB')},
+        ]
+        for query in tampered:
+            with self.subTest(query=query):
+                self.assertEqual(self.get(query).status_code, 403)
+        # 다른 미디어 ID의 서명
+        other = signed_stream_params(self.media.pk + 1, self.uploader.pk)
+        self.assertEqual(self.get(other).status_code, 403)
+
+    def test_unsigned_request(self):
+        self.client.force_authenticate(self.uploader)
+        self.assertEqual(self.get({}).status_code, 403)
+
+
+class FakeClock:
+    """고정 시계 (sleep하면 그만큼 시각이 흐름)"""
+
+    def __init__(self, now=100.0):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TokenBucketTest(SimpleTestCase):
+    """토큰 버킷의 대역폭/burst 계산"""
+
+    def test_unlimited(self):
+        bucket = TokenBucket(0)
+        self.assertEqual(bucket.reserve(10 ** 9, 100.0), 0.0)
+
+    def test_rate_accounting(self):
+        """1초 분량(burst)까지는 바로 보내고, 이후는 rate만큼 늦어짐"""
+        bucket = TokenBucket(1000)
+        self.assertEqual(bucket.reserve(500, 100.0), 0.0)
+        self.assertEqual(bucket.reserve(500, 100.0), 0.0)
+        self.assertAlmostEqual(bucket.reserve(500, 100.0), 0.5)
+        self.assertAlmostEqual(bucket.reserve(1000, 100.0), 1.5)
+        # 시간이 흐른 만큼 대기 시간이 줄어듦
+        self.assertAlmostEqual(bucket.reserve(500, 101.0), 1.0)
+
+    def test_burst_is_capped_after_idle(self):
+        """오래 쉬어도 기다리지 않고 보낼 수 있는 양은 1초 분량뿐"""
+        bucket = TokenBucket(1000)
+        bucket.reserve(100, 100.0)
+        self.assertEqual(bucket.reserve(1000, 200.0), 0.0)
+        self.assertAlmostEqual(bucket.reserve(1000, 200.0), 1.0)
+
+
+class StreamSchedulerTest(SimpleTestCase):
+    """스트림 스케줄러 (고정 시계, 실제 대기 없음)"""
+
+    def make_scheduler(self, **limits):
+        self.clock = FakeClock()
+        return StreamScheduler(**limits, clock=self.clock, sleep=self.clock.sleep)
+
+    def test_connection_rate(self):
+        scheduler = self.make_scheduler(connection_rate=1000)
+        slot = scheduler.open('user:1')
+        chunks = list(scheduler.throttle(slot, [b'x' * 500] * 6))
+
+        self.assertEqual(len(chunks), 6)
+        # 처음 1000 bytes는 burst, 나머지 2000 bytes는 2초에 걸쳐 전송
+        self.assertAlmostEqual(sum(self.clock.sleeps), 2.0)
+        stats = scheduler.get_stats()
+        self.assertEqual(stats['bytes_sent'], 3000)
+        self.assertEqual(stats['throttled_chunks'], 4)
+        self.assertEqual(stats['active_streams'], 0)
+
+    def test_user_rate_is_shared(self):
+        """같은 사용자의 스트림은 사용자 버킷을 나눠 씀"""
+        scheduler = self.make_scheduler(user_rate=1000)
+        first = scheduler.open('user:1')
+        second = scheduler.open('user:1')
+        other = scheduler.open('user:2')
+
+        scheduler.wait(first, 1000)
+        scheduler.wait(second, 1000)
+        self.assertEqual(self.clock.sleeps, [1.0])
+        scheduler.wait(other, 1000)
+        self.assertEqual(self.clock.sleeps, [1.0])
+
+    def test_stream_limits(self):
+        scheduler = self.make_scheduler(max_user_streams=1, max_streams=2)
+        first = scheduler.open('user:1')
+        self.assertIsNotNone(first)
+        self.assertIsNone(scheduler.open('user:1'))
+        self.assertIsNotNone(scheduler.open('user:2'))
+        self.assertIsNone(scheduler.open('user:3'))
+
+        first.close()
+        first.close()
+        self.assertIsNotNone(scheduler.open('user:3'))
+        stats = scheduler.get_stats()
+        self.assertEqual(stats['active_streams'], 2)
+        self.assertEqual(stats['streams_opened'], 3)
+        self.assertEqual(stats['streams_rejected'], 2)
+
+
+@override_settings(STREAM_REQUIRE_SIGNED_URLS=False, STREAM_CONNECTION_RATE=1000, STREAM_MAX_STREAMS=1)
+class StreamShapingDeliveryTest(StreamMediaMixin, TestCase):
+    """대역폭 제한이 켜져 있어도 sendfile/프록시 전송은 Python 전송으로 바뀌지 않음
+
+    테스트 클라이언트는 응답 본문을 다시 감싸므로 뷰를 직접 호출해 WSGI 서버가 받을 응답을 확인합니다.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.scheduler = StreamScheduler(connection_rate=1000, max_streams=1, sleep=self.fail)
+        patcher = mock.patch('media_files.views.get_stream_scheduler', return_value=self.scheduler)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.view = MediaFileViewSet.as_view({'get': 'stream'})
+
+    def get(self, **headers):
+        return self.view(APIRequestFactory().get(self.url, **headers), pk=str(self.media.pk))
+
+    def test_sendfile_keeps_file_wrapper(self):
+        with override_settings(STREAM_DELIVERY_BACKEND='sendfile'):
+            response = self.get(HTTP_RANGE='bytes=0-99')
+            self.assertEqual(response.status_code, 206)
+            self.assertIsNotNone(response.file_to_stream)
+            # 응답이 닫힐 때까지 자리를 차지
+            self.assertEqual(self.get().status_code, 429)
+            response.close()
+            response = self.get()
+            self.assertEqual(response.status_code, 200)
+            self.assertIsNotNone(response.file_to_stream)
+            response.close()
+        self.assertEqual(self.scheduler.get_stats()['active_streams'], 0)
+
+    def test_python_delivery_is_throttled(self):
+        with override_settings(STREAM_DELIVERY_BACKEND='python'):
+            response = self.get(HTTP_RANGE='bytes=0-99')
+        self.assertEqual(b''.join(response.streaming_content), self.video_content[:100])
+        self.assertEqual(self.scheduler.get_stats()['bytes_sent'], 100)
+        self.assertEqual(self.scheduler.get_stats()['active_streams'], 0)
+
+    def test_x_accel_keeps_offload(self):
+        with override_settings(STREAM_DELIVERY_BACKEND='x-accel-redirect'):
+            response = self.get()
+        self.assertIn('X-Accel-Redirect', response)
+        self.assertEqual(response['X-Accel-Limit-Rate'], '1000')
+        self.assertEqual(self.scheduler.get_stats()['streams_opened'], 0)
+
+
+@override_settings(MEDIA_JOB_MAX_ATTEMPTS=3, MEDIA_JOB_RETRY_DELAY=30)
+class ProcessingJobQueueTest(TestCase):
+    """DB 작업 큐의 가져가기/잠금 만료/재시도 (고정 시계, 워커 프로세스 없음)"""
+
+    timeout = 60
+
+    def setUp(self):
+        super().setUp()
+        self.now = timezone.now()
+        patcher = mock.patch('django.utils.timezone.now', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.calls = []
+        self.failures = 0
+        tasks = mock.patch.dict(PROCESSING_TASKS, {'test_task': (self.task, ())})
+        tasks.start()
+        self.addCleanup(tasks.stop)
+
+    def task(self, **payload):
+        self.calls.append(payload)
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError('처리 실패')
+
+    def enqueue(self, **payload):
+        job = enqueue_task('test_task', **payload)
+        ProcessingJob.objects.filter(pk=job.pk).update(run_after=self.now)
+        return job
+
+    def advance(self, seconds):
+        self.now += timedelta(seconds=seconds)
+
+    def test_claim(self):
+        first = self.enqueue(n=1)
+        second = self.enqueue(n=2)
+        later = self.enqueue(n=3)
+        ProcessingJob.objects.filter(pk=later.pk).update(run_after=self.now + timedelta(seconds=10))
+
+        job = claim_job('worker-a', self.timeout)
+        self.assertEqual(job.pk, first.pk)
+        self.assertEqual(job.status, 'running')
+        self.assertEqual(job.attempts, 1)
+        self.assertEqual(job.locked_by, 'worker-a')
+        self.assertEqual(job.locked_until, self.now + timedelta(seconds=self.timeout))
+
+        # 가져간 작업은 다른 워커에게 보이지 않고, 실행 시각 전의 작업도 가져가지 않음
+        self.assertEqual(claim_job('worker-b', self.timeout).pk, second.pk)
+        self.assertIsNone(claim_job('worker-c', self.timeout))
+        self.advance(10)
+        self.assertEqual(claim_job('worker-c', self.timeout).pk, later.pk)
+
+    def test_expired_lock_is_reclaimed(self):
+        """워커가 중단되어 잠금이 만료된 작업은 다른 워커가 다시 가져가고, 이전 워커의 결과는 버려짐"""
+        self.enqueue()
+        stale = claim_job('worker-a', self.timeout)
+
+        self.advance(self.timeout)
+        self.assertIsNone(claim_job('worker-b', self.timeout))
+        self.advance(1)
+        job = claim_job('worker-b', self.timeout)
+        self.assertEqual(job.pk, stale.pk)
+        self.assertEqual(job.attempts, 2)
+
+        self.assertFalse(finish_job(stale, 'worker-a', status='succeeded'))
+        self.assertTrue(run_job(job, 'worker-b'))
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'succeeded')
+        self.assertEqual(job.locked_by, '')
+
+    def test_retry_backoff(self):
+        """실패하면 MEDIA_JOB_RETRY_DELAY부터 두 배씩 늘어나는 지연 후 다시 대기"""
+        self.failures = 2
+        self.enqueue()
+
+        for attempt, delay in [(1, 30), (2, 60)]:
+            job = claim_job('worker-a', self.timeout)
+            self.assertEqual(job.attempts, attempt)
+            self.assertFalse(run_job(job, 'worker-a'))
+            job.refresh_from_db()
+            self.assertEqual(job.status, 'pending')
+            self.assertEqual(job.run_after, self.now + timedelta(seconds=delay))
+            self.assertIn('처리 실패', job.last_error)
+
+            self.advance(delay - 1)
+            self.assertIsNone(claim_job('worker-a', self.timeout))
+            self.advance(1)
+
+        job = claim_job('worker-a', self.timeout)
+        self.assertTrue(run_job(job, 'worker-a'))
+        self.assertEqual(ProcessingJob.objects.get(pk=job.pk).status, 'succeeded')
+
+    def test_max_attempts(self):
+        self.failures = 3
+        self.enqueue()
+
+        for _ in range(3):
+            job = claim_job('worker-a', self.timeout)
+            run_job(job, 'worker-a')
+            self.advance(3600)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertEqual(job.attempts, 3)
+        self.assertIsNone(claim_job('worker-a', self.timeout))
+        self.assertEqual(len(self.calls), 3)
+
+    def test_expired_last_attempt_fails(self):
+        """마지막 시도 중 잠금이 만료되면 다시 가져가지 않고 실패 처리"""
+        job = self.enqueue()
+        ProcessingJob.objects.filter(pk=job.pk).update(attempts=2)
+        claim_job('worker-a', self.timeout)
+
+        self.advance(self.timeout + 1)
+        self.assertIsNone(claim_job('worker-b', self.timeout))
+        self.assertEqual(fail_expired_jobs(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertEqual(job.last_error, '처리 시간이 초과되었습니다.')
+
+    def test_run_worker_once(self):
+        self.enqueue(n=1)
+        self.enqueue(n=2)
+        self.assertEqual(run_worker('worker-a', self.timeout, poll_interval=0, once=True), 2)
+        self.assertEqual(self.calls, [{'n': 1}, {'n': 2}])
+        self.assertFalse(ProcessingJob.objects.exclude(status='succeeded').exists())
+
+
+def build_mp4(samples=300, gop=30, sample_size=100, duration=10):
+    """ftyp + mdat + moov (키프레임 샘플 자리에 'K00030'처럼 샘플 번호를 기록)"""
+    ftyp = box(b'ftyp', b'isom' + bytes(4) + b'isomavc1')
+    moov = build_moov(
+        duration, 320, 240, samples,
+        data_offset=len(ftyp) + 8, sample_size=sample_size, gop=gop, chunk_samples=7
+    )
+    payload = b''.join(
+        f'K{i:05d}'.encode().ljust(sample_size * 5, b'.') if i % gop == 0 else bytes(sample_size)
+        for i in range(samples)
+    )
+    return ftyp + box(b'mdat', payload) + moov
+
+
+def build_webm(duration_ms=5000.0, width=64, height=48):
+    header = ebml_element(0x1A45DFA3, ebml_element(0x4282, b'webm'))
+    info = ebml_element(0x1549A966, (
+        ebml_element(0x2AD7B1, (1_000_000).to_bytes(3, 'big')) +
+        ebml_element(0x4489, struct.pack('>d', duration_ms))
+    ))
+    video = ebml_element(0xE0, (
+        ebml_element(0xB0, width.to_bytes(2, 'big')) + ebml_element(0xBA, height.to_bytes(2, 'big'))
+    ))
+    tracks = ebml_element(0x1654AE6B, ebml_element(0xAE, (
+        ebml_element(0xD7, b'\x01') + ebml_element(0x83, b'\x01') + ebml_element(0x86, b'V_VP9') + video
+    )))
+    cluster = ebml_element(0x1F43B675, bytes(64))
+    return header + ebml_element(0x18538067, info + tracks + cluster)
+
+
+class ProbeMediaTest(SimpleTestCase):
+    """컨테이너 헤더에서 재생시간/해상도/코덱 추출"""
+
+    def test_mp4(self):
+        info = probe_media(io.BytesIO(build_mp4()))
+        self.assertEqual(info.duration, 10)
+        self.assertEqual((info.width, info.height, info.codec), (320, 240, 'avc1'))
+
+    def test_webm(self):
+        info = probe_media(io.BytesIO(build_webm()))
+        self.assertEqual(info.duration, 5)
+        self.assertEqual((info.width, info.height, info.codec), (64, 48, 'vp9'))
+
+    def test_unknown_and_broken(self):
+        self.assertIsNone(probe_media(io.BytesIO(b'not a video file')))
+        with self.assertRaises(ProbeError):
+            probe_media(io.BytesIO(box(b'ftyp', b'isom' + bytes(4)) + box(b'mdat', bytes(16))))
+        with self.assertRaises(ProbeError):
+            # 헤더보다 작은 box 크기
+            probe_media(io.BytesIO(box(b'ftyp', b'isom' + bytes(4)) + struct.pack('>I4s', 4, b'moov')))
+
+
+class SeekTableTest(SimpleTestCase):
+    """키프레임 색인 추출과 시각 탐색"""
+
+    def test_keyframes_from_sample_tables(self):
+        """30샘플(1초)마다 있는 키프레임의 시각과 파일 내 위치"""
+        mp4 = build_mp4()
+        table = build_seek_table(io.BytesIO(mp4))
+
+        self.assertEqual(len(table), 10)
+        self.assertEqual(list(table.times), [float(second) for second in range(10)])
+        for index, offset in enumerate(table.offsets):
+            self.assertEqual(mp4[offset:offset + 6], f'K{index * 30:05d}'.encode())
+
+    def test_not_mp4(self):
+        self.assertIsNone(build_seek_table(io.BytesIO(build_webm())))
+
+    def test_find_boundaries(self):
+        table = SeekTable([0.0, 2.0, 4.0], [48, 400, 900])
+        self.assertEqual(table.find(0), (0.0, 48))
+        self.assertEqual(table.find(1.999), (0.0, 48))
+        self.assertEqual(table.find(2.0), (2.0, 400))
+        self.assertEqual(table.find(4.0), (4.0, 900))
+        self.assertEqual(table.find(10 ** 6), (4.0, 900))
+        # 첫 키프레임보다 앞선 시각은 첫 키프레임
+        self.assertEqual(SeekTable([1.5], [100]).find(0), (1.5, 100))
+        self.assertIsNone(SeekTable().find(1))
+
+    def test_serialization(self):
+        table = SeekTable([0.0, 2.5], [0, 2 ** 40])
+        data = table.to_bytes()
+        self.assertEqual(len(data), 32)
+        restored = SeekTable.from_bytes(data)
+        self.assertEqual(restored.find(3), (2.5, 2 ** 40))
+
+
+class ImageVariantsTest(TemporaryMediaRootMixin, TestCase):
+    """강의 썸네일 변형 이미지 생성 (작업 큐를 워커 프로세스 없이 실행)"""
+
+    source_name = 'courses/thumbnails/aa/bb/source.jpg'
+
+    def setUp(self):
+        super().setUp()
+        self.instructor = User.objects.create_user(username='instructor', email='i@example.com', password='pw12345!x')
+
+    def create_course(self, name, content):
+        self.put_file(name, content)
+        return Course.objects.create(
+            instructor=self.instructor, title='썸네일 강의', description='변형 이미지 테스트 강의', thumbnail=name
+        )
+
+    def run_jobs(self):
+        return run_worker('worker-test', 60, poll_interval=0, once=True)
+
+    def png_bytes(self, color):
+        buffer = io.BytesIO()
+        Image.new('RGBA', (1000, 600), color).save(buffer, 'PNG')
+        return buffer.getvalue()
+
+    def test_generate_variants(self):
+        course = self.create_course(self.source_name, self.image_bytes())
+        self.assertEqual(self.run_jobs(), 1)
+
+        course.refresh_from_db()
+        variants = course.thumbnail_variants
+        self.assertEqual(variants['source'], self.source_name)
+        for variant, size in IMAGE_VARIANT_SETS['course_thumbnail'].items():
+            for ext, image_format in [('webp', 'WEBP'), ('jpeg', 'JPEG')]:
+                with self.subTest(variant=variant, ext=ext):
+                    path = variants[variant][ext]
+                    self.assertTrue(path.endswith(f'_{size[0]}x{size[1]}.{ext}'))
+                    with default_storage.open(path, 'rb') as file, Image.open(file) as image:
+                        self.assertEqual(image.size, size)
+                        self.assertEqual(image.format, image_format)
+
+    def test_source_is_not_an_image(self):
+        """이미지가 아닌 원본은 재시도 없이 건너뛰고 다시 등록하지 않음"""
+        course = self.create_course('courses/thumbnails/aa/bb/notes.jpg', '이미지가 아닙니다.'.encode())
+        self.run_jobs()
+
+        job = ProcessingJob.objects.get(task='image_variants')
+        self.assertEqual((job.status, job.attempts), ('succeeded', 1))
+        course.refresh_from_db()
+        self.assertEqual(course.thumbnail_variants, {'source': 'courses/thumbnails/aa/bb/notes.jpg'})
+        self.assertFalse(default_storage.exists('derivatives'))
+        self.assertIsNone(queue_image_variants(course, 'thumbnail', 'course_thumbnail'))
+
+    def test_regenerated_after_source_change(self):
+        course = self.create_course(self.source_name, self.png_bytes((255, 0, 0, 255)))
+        self.run_jobs()
+        course.refresh_from_db()
+        old_variants = course.thumbnail_variants
+
+        new_name = 'courses/thumbnails/cc/dd/source.png'
+        self.put_file(new_name, self.png_bytes((0, 0, 255, 128)))
+        course.thumbnail = new_name
+        course.save()
+        self.assertEqual(self.run_jobs(), 1)
+
+        course.refresh_from_db()
+        variants = course.thumbnail_variants
+        self.assertEqual(variants['source'], new_name)
+        self.assertNotEqual(variants['card']['webp'], old_variants['card']['webp'])
+        with default_storage.open(variants['card']['jpeg'], 'rb') as file, Image.open(file) as image:
+            # 반투명 원본은 JPEG에서 흰 배경과 합성됨
+            red, green, blue = image.convert('RGB').getpixel((200, 112))
+            self.assertGreater(blue, 200)
+            self.assertGreater(red, 100)
+        # 이전 변형 이미지는 남아 있다가 gc_media가 정리
+        self.assertTrue(default_storage.exists(old_variants['card']['webp']))
+
+
+@override_settings(STREAM_REQUIRE_SIGNED_URLS=False, STREAM_DELIVERY_BACKEND='python', STREAM_BLOCK_SIZE=64)
+class StreamRangeTest(StreamMediaMixin, TestCase):
+    """Range 요청 응답 (단일/다중 구간, 만족 불가)"""
+
+    def get(self, range_header, **headers):
+        return self.client.get(self.url, HTTP_RANGE=range_header, **headers)
+
+    def test_single_range(self):
+        for header, start, end in [('bytes=10-19', 10, 19), ('bytes=990-', 990, 999), ('bytes=-5', 995, 999)]:
+            with self.subTest(header=header):
+                response = self.get(header)
+                self.assertEqual(response.status_code, 206)
+                self.assertEqual(response['Content-Range'], f'bytes {start}-{end}/1000')
+                self.assertEqual(self.body(response), self.video_content[start:end + 1])
+
+    def test_multipart_byteranges(self):
+        response = self.get('bytes=0-9,500-599')
+        self.assertEqual(response.status_code, 206)
+        content_type, _, boundary = response['Content-Type'].partition('; boundary=')
+        self.assertEqual(content_type, 'multipart/byteranges')
+
+        body = self.body(response)
+        self.assertEqual(int(response['Content-Length']), len(body))
+        self.assertTrue(body.endswith(f'\r\n--{boundary}--\r\n'.encode()))
+        parts = body.split(f'\r\n--{boundary}'.encode())[1:-1]
+        self.assertEqual(len(parts), 2)
+        for part, (start, end) in zip(parts, [(0, 9), (500, 599)]):
+            headers, _, data = part.partition(b'\r\n\r\n')
+            self.assertIn(b'Content-Type: video/mp4', headers)
+            self.assertIn(f'Content-Range: bytes {start}-{end}/1000'.encode(), headers)
+            self.assertEqual(data, self.video_content[start:end + 1])
+
+    def test_overlapping_ranges_are_merged(self):
+        response = self.get('bytes=0-9,5-19')
+        self.assertEqual(response['Content-Range'], 'bytes 0-19/1000')
+        self.assertEqual(self.body(response), self.video_content[:20])
+
+    def test_unsatisfiable_range(self):
+        for header in ['bytes=1000-', 'bytes=5000-6000', 'bytes=-0']:
+            with self.subTest(header=header):
+                response = self.get(header)
+                self.assertEqual(response.status_code, 416)
+                self.assertEqual(response['Content-Range'], 'bytes */1000')
+
+    def test_invalid_or_stale_range_sends_full_file(self):
+        """문법이 잘못된 Range나 If-Range 불일치는 무시하고 200 전체 응답"""
+        for header, extra in [('bytes=abc', {}), ('items=0-9', {}), ('bytes=0-9', {'HTTP_IF_RANGE': '"stale"'})]:
+            with self.subTest(header=header, extra=extra):
+                response = self.get(header, **extra)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(self.body(response), self.video_content)
+
+
+@override_settings(STREAM_REQUIRE_SIGNED_URLS=False, STREAM_ACCEL_REDIRECT_PREFIX='/protected-media/')
+class StreamDeliveryBackendTest(StreamMediaMixin, TestCase):
+    """STREAM_DELIVERY_BACKEND별 응답"""
+
+    def get(self, backend, **headers):
+        with override_settings(STREAM_DELIVERY_BACKEND=backend):
+            return self.client.get(self.url, **headers)
+
+    def test_x_accel_redirect(self):
+        response = self.get('x-accel-redirect', HTTP_RANGE='bytes=0-9')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/media/video/ab/cd/clip.mp4')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['Content-Type'], 'video/mp4')
+        self.assertNotIn('X-Sendfile', response)
+        self.assertEqual(response.content, b'')
+
+    def test_x_sendfile(self):
+        response = self.get('x-sendfile')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Sendfile'], default_storage.path('media/video/ab/cd/clip.mp4'))
+        self.assertNotIn('X-Accel-Redirect', response)
+        self.assertEqual(response.content, b'')
+
+    def test_proxy_rejects_unsatisfiable_range(self):
+        """만족할 수 없는 구간은 프록시로 넘기지 않고 416"""
+        for backend in ['x-accel-redirect', 'x-sendfile']:
+            with self.subTest(backend=backend):
+                response = self.get(backend, HTTP_RANGE='bytes=2000-')
+                self.assertEqual(response.status_code, 416)
+                self.assertNotIn('X-Accel-Redirect', response)
+                self.assertNotIn('X-Sendfile', response)
+
+    def test_sendfile_and_python(self):
+        for backend in ['sendfile', 'python']:
+            with self.subTest(backend=backend):
+                response = self.get(backend)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(self.body(response), self.video_content)
+
+                response = self.get(backend, HTTP_RANGE='bytes=100-199')
+                self.assertEqual(response.status_code, 206)
+                self.assertEqual(response['Content-Length'], '100')
+                self.assertEqual(self.body(response), self.video_content[100:200])
+                self.assertNotIn('X-Accel-Redirect', response)
+                self.assertNotIn('X-Sendfile', response)
+
+
+@override_settings(STREAM_REQUIRE_SIGNED_URLS=False, STREAM_DELIVERY_BACKEND='python')
+class StreamMetadataCacheTest(StreamMediaMixin, TestCase):
+    """스트리밍 메타데이터 LRU 캐시 (적중 시 SQL 없음, 파일/행 변경 시 갱신)"""
+
+    def get(self, **headers):
+        response = self.client.get(self.url, **headers)
+        response.body = self.body(response)
+        return response
+
+    def test_cache_hit_skips_database(self):
+        with self.assertNumQueries(1):
+            first = self.get()
+        with self.assertNumQueries(0):
+            second = self.get(HTTP_RANGE='bytes=0-9')
+        self.assertEqual(second.status_code, 206)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_file_changed_on_disk(self):
+        """캐시된 뒤 파일 내용이 바뀌면 stat으로 감지하여 새 크기/검증자로 응답"""
+        first = self.get()
+        new_content = b'changed!' * 200
+        self.put_file('media/video/ab/cd/clip.mp4', new_content)
+        path = default_storage.path('media/video/ab/cd/clip.mp4')
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10 ** 9))
+
+        with self.assertNumQueries(0):
+            response = self.get()
+        self.assertEqual(response.body, new_content)
+        self.assertEqual(response['Content-Length'], str(len(new_content)))
+        self.assertNotEqual(response['ETag'], first['ETag'])
+        self.assertEqual(self.get(HTTP_IF_NONE_MATCH=first['ETag']).status_code, 200)
+
+    def test_row_saved_with_new_file(self):
+        """MediaFile 저장(post_save)으로 캐시가 무효화되어 새 파일을 전송"""
+        self.get()
+        self.put_file('media/video/ef/01/other.mp4', b'other video')
+        self.media.file = 'media/video/ef/01/other.mp4'
+        self.media.save()
+
+        self.assertEqual(self.get().body, b'other video')
+
+    def test_file_moved_without_signal(self):
+        """다른 프로세스가 파일을 옮겨 캐시된 경로가 없으면 DB에서 다시 조회"""
+        self.get()
+        os.makedirs(default_storage.path('media/video/ef/01'))
+        os.rename(default_storage.path('media/video/ab/cd/clip.mp4'), default_storage.path('media/video/ef/01/clip.mp4'))
+        MediaFile.objects.filter(pk=self.media.pk).update(file='media/video/ef/01/clip.mp4')
+
+        with self.assertNumQueries(1):
+            response = self.get()
+        self.assertEqual(response.body, self.video_content)
+
+    def test_deleted_row(self):
+        self.get()
+        MediaFile.objects.filter(pk=self.media.pk).delete()
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+
+class LRUCacheTest(SimpleTestCase):
+
+    def test_eviction_and_ttl(self):
+        cache = LRUCache(maxsize=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.set('c', 3)
+        # 가장 오래 쓰이지 않은 b가 밀려남
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual((cache.get('a'), cache.get('c')), (1, 3))
+
+        with mock.patch('media_files.cache.time.monotonic', return_value=time.monotonic() + 61):
+            self.assertIsNone(cache.get('a'))
+        self.assertEqual(len(cache), 1)
@@ -0,0 +1,115 @@
+import hashlib
+from django.core.files.uploadhandler import FileUploadHandler, StopUpload
+from django.http import QueryDict
+from django.utils.datastructures import MultiValueDict
+from rest_framework.exceptions import ValidationError
+from .models import FILE_TYPE_LABELS, get_allowed_extensions, get_file_type, get_size_limit, size_limit_message
+from .sniffing import SNIFF_LENGTH, declared_type_matches, resolve_mime_type
+
+# 파일 외 폼 필드와 multipart 경계에 허용하는 여유분
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class ValidatingUploadHandler(FileUploadHandler):
+    """업로드를 받는 동안 검증하는 업로드 핸들러 (기본 핸들러 앞에 설치)
+
+    본문을 다 받은 뒤가 아니라 받는 즉시 확장자, 선언된 Content-Type, 매직 바이트, 타입별 크기 제한을
+    확인하고, 위반하면 나머지 본문을 읽지 않고 중단합니다. 같은 단일 패스에서 SHA-256과 MIME 타입을
+    계산하여 request.upload_metadata[필드명]에 저장하며, 청크는 다음 핸들러(메모리/임시 파일)로 그대로 넘깁니다.
+    """
+
+    def __init__(self, request=None, file_types=None, field_name='file'):
+        super().__init__(request)
+        self.file_types = list(file_types or FILE_TYPE_LABELS)
+        self.default_field = field_name
+        request.upload_metadata = {}
+        request.upload_errors = {}
+
+    def reject(self, message):
+        self.request.upload_errors[self.field_name] = [message]
+        raise StopUpload(connection_reset=True)
+
+    def allowed_extensions(self):
+        return [ext for file_type in self.file_types for ext in get_allowed_extensions(file_type)]
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        """본문 전체 크기가 허용 최대치를 넘으면 읽기 전에 중단"""
+        max_size = max(get_size_limit(file_type) for file_type in self.file_types)
+        if content_length > max_size + MULTIPART_OVERHEAD:
+            self.request.upload_errors[self.default_field] = [
+                f'요청 크기가 허용된 최대 파일 크기({max_size // (1024*1024)}MB)를 초과합니다.'
+            ]
+            return QueryDict(encoding=encoding), MultiValueDict()
+        return None
+
+    def new_file(self, field_name, file_name, content_type, content_length, charset=None, content_type_extra=None):
+        super().new_file(field_name, file_name, content_type, content_length, charset, content_type_extra)
+        self.head = b''
+        self.mime_type = None
+        self.hash = hashlib.sha256()
+
+        self.file_type = get_file_type(file_name)
+        if self.file_type not in self.file_types:
+            self.reject(
+                f'지원하지 않는 파일 형식입니다. 허용된 형식: {", ".join(self.allowed_extensions())}'
+            )
+        if not declared_type_matches(self.file_type, content_type):
+            self.reject(f'선언된 Content-Type({content_type})이 파일 형식과 맞지 않습니다.')
+
+        self.max_size = get_size_limit(self.file_type)
+        if content_length and content_length > self.max_size:
+            self.reject(size_limit_message(self.file_type))
+
+    def check_content(self):
+        """파일 앞부분의 매직 바이트가 확장자와 맞는지 확인"""
+        self.mime_type = resolve_mime_type(self.file_name, self.head)
+        if self.mime_type is None:
+            self.reject('파일 내용이 확장자와 일치하지 않습니다.')
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > self.max_size:
+            self.reject(size_limit_message(self.file_type))
+
+        if self.mime_type is None and len(self.head) < SNIFF_LENGTH:
+            self.head += raw_data[:SNIFF_LENGTH - len(self.head)]
+            if len(self.head) >= SNIFF_LENGTH:
+                self.check_content()
+
+        self.hash.update(raw_data)
+        return raw_data
+
+    def file_complete(self, file_size):
+        if self.mime_type is None:
+            self.check_content()
+
+        self.request.upload_metadata[self.field_name] = {
+            'mime_type': self.mime_type,
+            'content_hash': self.hash.hexdigest(),
+            'size': file_size,
+        }
+        return None
+
+
+class ValidatedUploadMixin:
+    """멀티파트 본문을 받는 동안 검증하도록 ValidatingUploadHandler를 설치하는 뷰 믹스인"""
+
+    upload_file_types = None
+    upload_field_name = 'file'
+
+    def initialize_request(self, request, *args, **kwargs):
+        request.upload_handlers = [
+            ValidatingUploadHandler(request, self.upload_file_types, self.upload_field_name),
+            *request.upload_handlers
+        ]
+        return super().initialize_request(request, *args, **kwargs)
+
+    def check_upload(self, request):
+        """업로드 핸들러가 업로드를 중단했으면 검증 오류 발생"""
+        request.data  # 본문 파싱 (업로드 핸들러 실행)
+        errors = getattr(request, 'upload_errors', None)
+        if errors:
+            raise ValidationError(errors)
+
+    def get_upload_metadata(self, request, field_name=None):
+        """업로드 중 계산된 (mime_type, content_hash, size)"""
+        return getattr(request, 'upload_metadata', {}).get(field_name or self.upload_field_name, {})
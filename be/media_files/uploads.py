@@ -0,0 +1,180 @@
+import hashlib
+import os
+import shutil
+import uuid
+from django.db import transaction
+from django.http import UnreadablePostError
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotFound, ValidationError
+from .blobs import acquire_blob, add_reference, create_media_file, lock_blob, prepare_path
+from .models import UploadSession
+from .sniffing import SNIFF_LENGTH, resolve_mime_type
+
+CHUNK_READ_SIZE = 64 * 1024
+
+
+class UploadConflict(APIException):
+    """요청의 Upload-Offset이 서버에 기록된 위치와 다름"""
+
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = '업로드 위치(Upload-Offset)가 일치하지 않습니다.'
+    default_code = 'upload_conflict'
+
+
+def create_staging_file(session):
+    """빈 스테이징 파일 생성"""
+    os.makedirs(os.path.dirname(session.staging_path), exist_ok=True)
+    open(session.staging_path, 'wb').close()
+
+
+def check_offset(session, offset):
+    """청크를 이어 붙일 수 있는 세션/위치인지 확인"""
+    if session.is_complete:
+        raise UploadConflict('이미 완료된 업로드입니다.')
+    if offset != session.offset:
+        raise UploadConflict()
+
+
+def receive_chunk(session, offset, stream):
+    """요청 본문을 요청별 임시 청크 파일에 기록하고 (경로, 기록한 크기)를 반환
+
+    네트워크에서 읽는 동안에는 트랜잭션과 행 잠금을 잡지 않습니다.
+    전송이 중간에 끊기면 받은 만큼만 기록합니다.
+    """
+    remaining = session.file_size - offset
+    path = f'{session.staging_path}.{uuid.uuid4().hex}'
+    written = 0
+    try:
+        with open(path, 'wb') as chunk_file:
+            try:
+                while written < remaining:
+                    chunk = stream.read(min(CHUNK_READ_SIZE, remaining - written))
+                    if not chunk:
+                        break
+                    chunk_file.write(chunk)
+                    written += len(chunk)
+                overflow = bool(stream.read(1))
+            except UnreadablePostError:
+                overflow = False
+
+        if overflow:
+            raise ValidationError({'detail': '선언한 파일 크기를 초과했습니다.'})
+
+        # 첫 청크에서 파일 내용(매직 바이트)이 확장자와 맞는지 확인
+        if offset == 0 and written:
+            with open(path, 'rb') as chunk_file:
+                if resolve_mime_type(session.filename, chunk_file.read(SNIFF_LENGTH)) is None:
+                    raise ValidationError({'detail': '파일 내용이 확장자와 일치하지 않습니다.'})
+    except BaseException:
+        remove_staging_file(path)
+        raise
+    return path, written
+
+
+def append_chunk(session_id, offset, stream):
+    """스테이징 파일의 offset 위치에 요청 본문을 이어 붙이고 갱신된 세션을 반환
+
+    본문은 먼저 임시 청크 파일로 받고, 세션 행을 잠근 짧은 트랜잭션 안에서 offset을 다시 확인한 뒤
+    스테이징 파일에 옮겨 offset을 전진시킵니다. 같은 위치로 동시에 온 PATCH는 먼저 커밋한 쪽만 반영되고
+    나머지는 409를 받습니다.
+    """
+    session = UploadSession.objects.get(pk=session_id)
+    check_offset(session, offset)
+
+    path, written = receive_chunk(session, offset, stream)
+    try:
+        with transaction.atomic():
+            session = UploadSession.objects.select_for_update().filter(pk=session_id).first()
+            if session is None:
+                raise NotFound('업로드 세션이 취소되었습니다.')
+            check_offset(session, offset)
+
+            with open(session.staging_path, 'r+b') as staging, open(path, 'rb') as chunk_file:
+                staging.seek(offset)
+                shutil.copyfileobj(chunk_file, staging, CHUNK_READ_SIZE)
+                # 이전에 기록되지 못한 꼬리 데이터 제거
+                staging.truncate(offset + written)
+
+            session.offset = offset + written
+            session.save(update_fields=['offset', 'updated_at'])
+    finally:
+        remove_staging_file(path)
+    return session
+
+
+def inspect_staging_file(path):
+    """스테이징 파일의 앞부분과 SHA-256 (청크가 여러 요청에 나뉘므로 완료 시 한 번 읽음)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as staging:
+        head = staging.read(SNIFF_LENGTH)
+        digest.update(head)
+        for chunk in iter(lambda: staging.read(CHUNK_READ_SIZE), b''):
+            digest.update(chunk)
+    return head, digest.hexdigest()
+
+
+def complete_upload(session_id):
+    """업로드 완료 처리: 스테이징 파일을 blob으로 옮기고 MediaFile 생성
+
+    같은 파일 시스템 안에서 os.replace로 옮기므로 blob 경로에는 완성된 파일만 나타나며,
+    같은 내용의 blob이 이미 있으면 스테이징 파일은 버리고 참조만 추가합니다.
+    이미 완료된 세션이면 기존 MediaFile을 그대로 반환합니다.
+    """
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().get(pk=session_id)
+        if session.is_complete:
+            return session.media_file
+        if session.offset != session.file_size:
+            raise ValidationError({
+                'detail': f'업로드가 완료되지 않았습니다. ({session.offset}/{session.file_size} bytes)'
+            })
+
+        staging_path = session.staging_path
+        head, content_hash = inspect_staging_file(staging_path)
+
+        blob = acquire_blob(
+            content_hash,
+            session.file_size,
+            os.path.splitext(session.filename)[1],
+            resolve_mime_type(session.filename, head) or '',
+            lambda name: os.replace(staging_path, prepare_path(name))
+        )
+        media = create_media_file(session.uploaded_by, blob, session.filename)
+
+        session.media_file = media
+        session.save(update_fields=['media_file', 'updated_at'])
+
+        # 기존 blob을 참조한 경우 남은 스테이징 파일 삭제
+        transaction.on_commit(lambda: remove_staging_file(staging_path))
+        return media
+
+
+def instant_upload(session, content_hash):
+    """업로더가 이미 가진 같은 해시/크기의 blob이 있으면 청크 전송 없이 세션 완료 (없으면 None)
+
+    해시만으로는 파일을 가지고 있다는 증명이 되지 않으므로, 다른 사용자의 blob은
+    해시가 일치해도 연결하지 않고 일반 업로드로 진행합니다. (전송 완료 시 중복 제거됨)
+    """
+    with transaction.atomic():
+        blob = lock_blob(content_hash, session.file_size)
+        if blob is None or not blob.media_files.filter(uploaded_by=session.uploaded_by).exists():
+            return None
+
+        add_reference(blob)
+        media = create_media_file(session.uploaded_by, blob, session.filename)
+
+        session.offset = session.file_size
+        session.media_file = media
+        session.save(update_fields=['offset', 'media_file', 'updated_at'])
+        return media
+
+
+def remove_staging_file(path):
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def abort_upload(session):
+    """업로드 취소 (스테이징 파일은 post_delete 시그널에서 커밋 후 삭제)"""
+    with transaction.atomic():
+        session.delete()
@@ -1,9 +1,11 @@
 from rest_framework.routers import DefaultRouter
-from .views import MediaFileViewSet
+from .views import MediaFileViewSet, UploadSessionViewSet
 
 app_name = 'media_files'
 
 router = DefaultRouter()
+# 업로드 세션 경로가 미디어 파일 상세(/{pk}/)보다 먼저 매칭되도록 먼저 등록
+router.register('uploads', UploadSessionViewSet, basename='upload-session')
 router.register('', MediaFileViewSet, basename='mediafile')
 
 urlpatterns = router.urls
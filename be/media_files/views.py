@@ -1,14 +1,29 @@
-from rest_framework import viewsets, status
+from rest_framework import mixins, viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
-from django.http import FileResponse, Http404, HttpResponse
-from drf_spectacular.utils import extend_schema, OpenApiResponse
-import os
-import re
-from wsgiref.util import FileWrapper
-from .models import MediaFile
-from .serializers import MediaFileSerializer, MediaFileUploadSerializer
+from rest_framework.permissions import IsAdminUser, IsAuthenticatedOrReadOnly, IsAuthenticated
+from django.conf import settings
+from django.core.signing import BadSignature, SignatureExpired
+from django.http import Http404
+from django.views.static import serve
+from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse
+import io
+import math
+from datetime import datetime, timezone
+from courses.conditional import conditional_response, make_etag
+from .models import MediaFile, UploadSession, is_public_media
+from .serializers import (
+    MediaFileSerializer, MediaFileUploadSerializer,
+    UploadSessionSerializer, UploadSessionCreateSerializer
+)
+from .upload_handlers import ValidatedUploadMixin
+from .uploads import abort_upload, append_chunk, complete_upload, create_staging_file, instant_upload
+from .blobs import delete_media_file
+from .cache import get_stream_metadata
+from .delivery import ProxyDelivery, SendfileDelivery, get_delivery_backend
+from .keyframes import get_seek_table
+from .scheduler import get_stream_scheduler, stream_client_key
+from .signing import verify_stream_signature
 
 
 class IsOwnerOrReadOnly(IsAuthenticatedOrReadOnly):
@@ -24,7 +39,7 @@ class IsOwnerOrReadOnly(IsAuthenticatedOrReadOnly):
 
 
 @extend_schema(tags=['미디어'])
-class MediaFileViewSet(viewsets.ModelViewSet):
+class MediaFileViewSet(ValidatedUploadMixin, viewsets.ModelViewSet):
     """미디어 파일 업로드 및 관리 API"""
 
     queryset = MediaFile.objects.select_related('uploaded_by')
@@ -53,7 +68,10 @@ class MediaFileViewSet(viewsets.ModelViewSet):
 
     @extend_schema(
         summary='미디어 파일 업로드',
-        description='비디오, 문서, 이미지 파일을 업로드합니다. (인증 필요)',
+        description=(
+            '비디오, 문서, 이미지 파일을 업로드합니다. 확장자, 파일 내용(매직 바이트), 크기 제한은 '
+            '업로드를 받는 동안 검증되어 위반 시 즉시 중단됩니다. (인증 필요)'
+        ),
         request=MediaFileUploadSerializer,
         responses={
             201: MediaFileSerializer,
@@ -61,9 +79,18 @@ class MediaFileViewSet(viewsets.ModelViewSet):
         }
     )
     def create(self, request, *args, **kwargs):
+        # 업로드 중 검증에서 중단된 경우 오류 반환
+        self.check_upload(request)
+
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        media_file = serializer.save()
+
+        # 업로드 중 계산한 MIME 타입과 콘텐츠 해시 저장
+        metadata = self.get_upload_metadata(request)
+        media_file = serializer.save(
+            mime_type=metadata.get('mime_type') or '',
+            content_hash=metadata.get('content_hash', '')
+        )
 
         # 생성된 파일 정보 반환
         output_serializer = MediaFileSerializer(media_file, context={'request': request})
@@ -71,32 +98,75 @@ class MediaFileViewSet(viewsets.ModelViewSet):
 
     @extend_schema(
         summary='미디어 파일 삭제',
-        description='미디어 파일을 삭제합니다. (업로더만 가능)'
+        description='미디어 파일을 삭제합니다. 같은 내용의 다른 미디어 파일이 없을 때만 실제 파일이 삭제됩니다. (업로더만 가능)'
     )
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
 
-        # 파일 시스템에서 실제 파일 삭제
-        if instance.file and os.path.isfile(instance.file.path):
-            os.remove(instance.file.path)
-
-        # DB에서 삭제
-        self.perform_destroy(instance)
+        # DB에서 삭제 (같은 내용을 참조하는 파일이 없을 때만 실제 파일 삭제)
+        delete_media_file(instance)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     @extend_schema(
         summary='비디오 스트리밍',
-        description='비디오 파일을 HTTP Range 요청으로 스트리밍합니다.',
+        description=(
+            '비디오 파일을 HTTP Range 요청으로 스트리밍합니다. '
+            '단일/열린/접미사 구간(bytes=0-99, bytes=100-, bytes=-100), '
+            '여러 구간(multipart/byteranges)과 If-Range를 지원합니다. '
+            't(초)를 지정하면 그 시각 직전 키프레임의 바이트 위치부터 전송하고(206), '
+            '실제 시작 시각을 X-Seek-Time 헤더로 알려줍니다. (키프레임 색인이 있는 MP4만, Range 헤더가 있으면 무시) '
+            '미디어 파일 응답의 stream_url(서명된 URL)로 요청해야 하며, 만료되었거나 서명이 다르면 403을 반환합니다.'
+        ),
+        parameters=[
+            OpenApiParameter(name='t', description='탐색할 재생 시각 (초)', type=float),
+            OpenApiParameter(name='expires', description='URL 만료 시각 (Unix 시간)', type=int),
+            OpenApiParameter(name='uid', description='URL을 발급받은 사용자 ID', type=int),
+            OpenApiParameter(name='sig', description='HMAC 서명', type=str),
+        ],
         responses={
             200: OpenApiResponse(description='스트리밍 성공'),
             206: OpenApiResponse(description='부분 콘텐츠 (Partial Content)'),
-            404: OpenApiResponse(description='파일을 찾을 수 없음')
+            304: OpenApiResponse(description='변경 없음 (Not Modified)'),
+            403: OpenApiResponse(description='서명이 없거나 만료된 URL'),
+            404: OpenApiResponse(description='파일을 찾을 수 없음'),
+            416: OpenApiResponse(description='요청 범위를 만족할 수 없음'),
+            429: OpenApiResponse(description='동시 스트림 수 초과')
         }
     )
-    @action(detail=True, methods=['get'], permission_classes=[])
+    @action(detail=True, methods=['get'], permission_classes=[], authentication_classes=[])
     def stream(self, request, pk=None):
-        """비디오 파일 스트리밍 (HTTP Range 요청 지원)"""
-        media = self.get_object()
+        """비디오 파일 스트리밍 (HTTP Range 요청 지원)
+
+        재생 중 반복되는 Range 요청은 캐시된 메타데이터로 처리하여 DB를 조회하지 않습니다.
+        권한은 JWT 인증(사용자 조회) 대신 URL 서명으로 확인합니다.
+        """
+        # 서명, 메타데이터/키프레임 캐시 키가 같은 값을 쓰도록 정수로 정규화 (/media/01/ 과 /media/1/)
+        try:
+            pk = int(pk)
+        except ValueError:
+            raise Http404
+
+        user_id = None
+        if settings.STREAM_REQUIRE_SIGNED_URLS:
+            try:
+                user_id = verify_stream_signature(pk, request.query_params)
+            except SignatureExpired:
+                return Response(
+                    {'error': '스트리밍 URL이 만료되었습니다. 미디어 정보를 다시 조회하세요.'},
+                    status=status.HTTP_403_FORBIDDEN
+                )
+            except BadSignature:
+                return Response(
+                    {'error': '유효하지 않은 스트리밍 URL입니다.'},
+                    status=status.HTTP_403_FORBIDDEN
+                )
+
+        try:
+            media = get_stream_metadata(pk)
+        except MediaFile.DoesNotExist:
+            raise Http404
+        except OSError:
+            raise Http404('파일을 찾을 수 없습니다.')
 
         # 비디오 파일이 아니면 에러
         if media.file_type != 'video':
@@ -105,49 +175,204 @@ class MediaFileViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # 파일 존재 확인
-        if not os.path.exists(media.file.path):
-            raise Http404('파일을 찾을 수 없습니다.')
+        # 파일 크기/수정 시각으로 검증자 생성 (If-Range, 조건부 GET)
+        etag = make_etag(pk, media.size, media.mtime_ns)
+        last_modified = datetime.fromtimestamp(media.mtime_ns / 1e9, tz=timezone.utc)
+
+        # 설정된 전송 방식으로 전송 (직접 / sendfile / 프록시 위임)
+        backend = get_delivery_backend()
 
-        # 파일 크기
-        file_size = os.path.getsize(media.file.path)
-
-        # Range 요청 헤더 확인
-        range_header = request.META.get('HTTP_RANGE', '').strip()
-
-        if range_header:
-            # Range 요청 파싱 (예: bytes=0-1023)
-            range_match = re.match(r'bytes=(\d+)-(\d*)', range_header)
-            if range_match:
-                start = int(range_match.group(1))
-                end = int(range_match.group(2)) if range_match.group(2) else file_size - 1
-                length = end - start + 1
-
-                # 범위 유효성 검사
-                if start >= file_size or end >= file_size or start > end:
-                    response = HttpResponse(status=416)  # Range Not Satisfiable
-                    response['Content-Range'] = f'bytes */{file_size}'
-                    return response
-
-                # Partial Content 응답 (206)
-                file = open(media.file.path, 'rb')
-                file.seek(start)
-                response = FileResponse(
-                    FileWrapper(file),
-                    status=206,
-                    content_type=media.mime_type or 'video/mp4'
+        # 시각 탐색: 직전 키프레임 위치부터의 구간 요청으로 변환
+        seek = None
+        if 't' in request.query_params and 'HTTP_RANGE' not in request.META:
+            try:
+                seconds = float(request.query_params['t'])
+            except ValueError:
+                seconds = -1
+            if not math.isfinite(seconds) or seconds < 0:
+                return Response(
+                    {'error': 't는 0 이상의 초 단위 숫자여야 합니다.'},
+                    status=status.HTTP_400_BAD_REQUEST
                 )
-                response['Content-Length'] = str(length)
-                response['Content-Range'] = f'bytes {start}-{end}/{file_size}'
-                response['Accept-Ranges'] = 'bytes'
+
+            seek = get_seek_table(pk).find(seconds)
+            if seek is not None:
+                request.META['HTTP_RANGE'] = f'bytes={seek[1]}-'
+                # 프록시는 원래 요청의 Range만 처리하므로 탐색 응답은 직접 전송
+                if isinstance(backend, ProxyDelivery):
+                    backend = SendfileDelivery()
+
+        # 직접 전송은 스케줄러가 동시 스트림 수와 대역폭을 제한 (sendfile은 스트림 수만, 프록시는 X-Accel-Limit-Rate로 위임)
+        scheduler = get_stream_scheduler()
+        slot = None
+        if scheduler.enabled and not isinstance(backend, ProxyDelivery):
+            slot = scheduler.open(stream_client_key(request, user_id))
+            if slot is None:
+                response = Response(
+                    {'error': '동시에 재생할 수 있는 스트림 수를 초과했습니다. 다른 재생을 종료한 뒤 다시 시도하세요.'},
+                    status=status.HTTP_429_TOO_MANY_REQUESTS
+                )
+                response['Retry-After'] = '1'
                 return response
 
-        # 일반 응답 (Range 요청 없음)
-        response = FileResponse(
-            open(media.file.path, 'rb'),
-            content_type=media.mime_type or 'video/mp4'
+        try:
+            response = conditional_response(
+                request, etag, last_modified,
+                lambda: backend.serve(
+                    request,
+                    media,
+                    media.mime_type or 'video/mp4',
+                    etag=etag,
+                    last_modified=last_modified
+                )
+            )
+        except BaseException:
+            if slot is not None:
+                slot.close()
+            raise
+
+        if slot is not None:
+            scheduler.attach(slot, response)
+        if seek is not None and response.status_code in (status.HTTP_200_OK, status.HTTP_206_PARTIAL_CONTENT):
+            response['X-Seek-Time'] = f'{seek[0]:.3f}'
+        return response
+
+    @extend_schema(
+        summary='스트리밍 스케줄러 상태',
+        description=(
+            '이 워커 프로세스의 활성 스트림 수, 거절된 스트림 수, 전송 바이트, '
+            '대역폭 제한으로 대기한 시간과 설정된 제한값을 조회합니다. (관리자만 가능)'
         )
-        response['Content-Length'] = str(file_size)
-        response['Accept-Ranges'] = 'bytes'
+    )
+    @action(detail=False, methods=['get'], url_path='stream-stats', permission_classes=[IsAdminUser])
+    def stream_stats(self, request):
+        return Response(get_stream_scheduler().get_stats())
+
+
+@extend_schema(tags=['미디어'])
+class UploadSessionViewSet(mixins.RetrieveModelMixin,
+                           mixins.DestroyModelMixin,
+                           viewsets.GenericViewSet):
+    """재개 가능한 분할 업로드 API (tus 방식)
+
+    1. POST   /uploads/              세션 생성 (파일명, 전체 크기 검증)
+    2. PATCH  /uploads/{id}/         Upload-Offset 위치부터 청크 전송 (application/offset+octet-stream)
+    3. HEAD   /uploads/{id}/         현재 Upload-Offset 확인 (끊긴 뒤 이어서 전송)
+    4. POST   /uploads/{id}/complete/ 완료 처리 및 MediaFile 생성
+    """
+
+    serializer_class = UploadSessionSerializer
+    permission_classes = [IsAuthenticated]
+    http_method_names = ['get', 'head', 'post', 'patch', 'delete']
+    chunk_content_type = 'application/offset+octet-stream'
+
+    def get_queryset(self):
+        """본인의 업로드 세션만 조회"""
+        return UploadSession.objects.filter(uploaded_by=self.request.user)
+
+    def progress_response(self, session, status_code=status.HTTP_200_OK):
+        """세션 정보와 업로드 진행 헤더"""
+        serializer = UploadSessionSerializer(session, context={'request': self.request})
+        response = Response(serializer.data, status=status_code)
+        response['Upload-Offset'] = str(session.offset)
+        response['Upload-Length'] = str(session.file_size)
+        response['Cache-Control'] = 'no-store'
+        return response
+
+    @extend_schema(
+        summary='분할 업로드 세션 생성',
+        description=(
+            '파일명과 전체 크기로 업로드 세션을 생성합니다. 확장자와 크기 제한을 미리 검증합니다. '
+            'content_hash(SHA-256)가 본인이 이전에 올린 파일과 일치하면 청크 전송 없이 완료되어 media_file이 채워집니다. (인증 필요)'
+        ),
+        request=UploadSessionCreateSerializer,
+        responses={
+            201: UploadSessionSerializer,
+            400: OpenApiResponse(description='파일 검증 실패')
+        }
+    )
+    def create(self, request, *args, **kwargs):
+        serializer = UploadSessionCreateSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        session = serializer.save()
+
+        # 같은 내용의 파일이 이미 있으면 전송 없이 바로 완료
+        content_hash = serializer.validated_data.get('content_hash')
+        if not (content_hash and instant_upload(session, content_hash)):
+            create_staging_file(session)
+
+        response = self.progress_response(session, status.HTTP_201_CREATED)
+        response['Location'] = response.data['upload_url']
         return response
 
+    @extend_schema(
+        summary='분할 업로드 진행 상황 조회',
+        description='업로드된 크기(offset)를 조회합니다. HEAD 요청 시 Upload-Offset 헤더로 반환합니다.'
+    )
+    def retrieve(self, request, *args, **kwargs):
+        return self.progress_response(self.get_object())
+
+    @extend_schema(
+        summary='청크 전송',
+        description=(
+            'Upload-Offset 헤더 위치부터 요청 본문(application/offset+octet-stream)을 이어 붙입니다. '
+            '서버의 offset과 다르면 409를 반환하므로 HEAD로 offset을 확인한 뒤 이어서 전송합니다.'
+        ),
+        request={'application/offset+octet-stream': bytes},
+        responses={
+            200: UploadSessionSerializer,
+            409: OpenApiResponse(description='Upload-Offset 불일치 또는 이미 완료된 업로드'),
+            415: OpenApiResponse(description='Content-Type 오류')
+        }
+    )
+    def partial_update(self, request, *args, **kwargs):
+        session = self.get_object()
+
+        if request.content_type != self.chunk_content_type:
+            return Response(
+                {'error': f'Content-Type은 {self.chunk_content_type}이어야 합니다.'},
+                status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+            )
+
+        offset = request.META.get('HTTP_UPLOAD_OFFSET', '')
+        if not offset.isdigit():
+            return Response(
+                {'error': 'Upload-Offset 헤더가 필요합니다.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # 요청 본문을 파싱하지 않고 스트림에서 바로 기록
+        session = append_chunk(session.pk, int(offset), request.stream or io.BytesIO())
+        return self.progress_response(session)
+
+    @extend_schema(
+        summary='분할 업로드 완료',
+        description='모든 청크가 전송된 세션을 완료하고 미디어 파일을 생성합니다.',
+        request=None,
+        responses={
+            201: MediaFileSerializer,
+            400: OpenApiResponse(description='업로드 미완료')
+        }
+    )
+    @action(detail=True, methods=['post'])
+    def complete(self, request, pk=None):
+        session = self.get_object()
+        media_file = complete_upload(session.pk)
+
+        serializer = MediaFileSerializer(media_file, context={'request': request})
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        summary='분할 업로드 취소',
+        description='업로드 세션과 임시 파일을 삭제합니다.'
+    )
+    def destroy(self, request, *args, **kwargs):
+        abort_upload(self.get_object())
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+def serve_media(request, path, document_root=None, show_indexes=False):
+    """개발 서버의 MEDIA_URL 파일 전송 (비디오는 서명된 스트리밍 URL로만 전송하므로 404)"""
+    if not is_public_media(path):
+        raise Http404
+    return serve(request, path, document_root=document_root, show_indexes=show_indexes)
@@ -1,15 +1,13 @@
 import VideoPlayer from './VideoPlayer';
 
 const LectureContent = ({ lecture, onVideoTimeUpdate, onVideoEnded }) => {
-  const { content_type, content_text, video_url, media_file } = lecture;
+  const { content_type, content_text, video_url, media_file, stream_url } = lecture;
 
   // Render based on content type
   switch (content_type) {
     case 'video':
-      // Video from uploaded media file or external URL
-      const videoSrc = media_file
-        ? `http://localhost:8000/api/media/${media_file}/stream/`
-        : video_url;
+      // Video from uploaded media file (signed stream URL) or external URL
+      const videoSrc = media_file ? stream_url : video_url;
 
       if (!videoSrc) {
         return (